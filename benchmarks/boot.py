@@ -0,0 +1,89 @@
+"""
+Measures boot-to-ready time of the problem cache: LeetCodeProblemManager.init_cache
+over a temporary SQLite database filled from the full GitHub problem dump, once
+loading every problem through the ORM (no snapshot) and once from the catalog
+snapshot written by that first boot. The catalog load alone (before the search
+and autocomplete indexes are built) is reported separately.
+
+Run from the repository root:
+    python -m benchmarks.boot [--dump leetcode_questions.json] [--runs 5]
+
+Without --dump the dump is downloaded from GitHub.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.problem_descriptions import fill_database
+from core.leetcode_problem import LeetCodeProblemManager
+from core.problem_catalog import ProblemRecord
+from db.base import Base
+from db.database_manager import DatabaseManager, create_database_engine
+
+
+async def boot(database_manager: DatabaseManager, snapshot_path: str | None) -> float:
+    manager = LeetCodeProblemManager(
+        None, database_manager, logging.getLogger("benchmark"), snapshot_path
+    )
+    start = time.perf_counter()
+    await manager.init_cache()
+    return time.perf_counter() - start
+
+
+async def load_catalog(manager: LeetCodeProblemManager) -> float:
+    start = time.perf_counter()
+    records = None
+    if manager.snapshot:
+        records = manager.snapshot.load(await manager._get_catalog_fingerprint())
+    if records is None:
+        records = [
+            ProblemRecord.from_orm(p) for p in await manager.get_problems_from_db()
+        ]
+    return time.perf_counter() - start
+
+
+def report(kind: str, timings: list[float]) -> None:
+    print(
+        f"{kind:<24} {statistics.mean(timings) * 1e3:>8.1f} "
+        f"{min(timings) * 1e3:>8.1f} (ms)"
+    )
+
+
+async def main(dump_path: str | None, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_database_engine(f"sqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        database_manager = DatabaseManager(None, engine, logging.getLogger("benchmark"))
+        await fill_database(database_manager, dump_path)
+        snapshot_path = os.path.join(tmp, "problem_catalog.snapshot")
+
+        await boot(database_manager, snapshot_path)
+        print(f"Snapshot size: {os.path.getsize(snapshot_path) / 2**10:.0f} KiB")
+        print(f"{'stage':<24} {'mean':>8} {'min':>8}")
+        for kind, path in (("database", None), ("snapshot", snapshot_path)):
+            manager = LeetCodeProblemManager(
+                None, database_manager, logging.getLogger("benchmark"), path
+            )
+            report(
+                f"catalog load ({kind})",
+                [await load_catalog(manager) for _ in range(runs)],
+            )
+            report(
+                f"init_cache ({kind})",
+                [await boot(database_manager, path) for _ in range(runs)],
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="Path to leetcode_questions.json")
+    parser.add_argument("--runs", type=int, default=5, help="Boots per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.dump, args.runs))
@@ -0,0 +1,88 @@
+"""
+Compares a fresh aiohttp.ClientSession per request (the old behaviour) against
+the pooled session owned by LeetCodeAPI, using a local stub server.
+
+Run from the repository root:
+    python -m benchmarks.http_session [--requests 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import aiohttp
+from aiohttp import web
+
+from core.leetcode_api import LeetCodeAPI
+
+
+async def _stub_user(request: web.Request) -> web.Response:
+    return web.json_response({"username": request.match_info["username"]})
+
+
+async def _start_stub_server() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/user/{username}", _stub_user)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def _per_request_session(base_url: str, username: str) -> dict:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url=f"{base_url}/user/{username}") as response:
+            return await response.json()
+
+
+async def _run(label: str, call, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call(f"user{i}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    total = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label:<24} total={total:.3f}s  p50={p50:.2f}ms  p99={p99:.2f}ms  "
+        f"rps={requests / total:.0f}"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    runner, base_url = await _start_stub_server()
+    api = LeetCodeAPI(logger=logging.getLogger("benchmark"))
+    api._base_url = base_url
+    await api.start()
+    try:
+        await _run(
+            "session per request",
+            lambda username: _per_request_session(base_url, username),
+            requests,
+            concurrency,
+        )
+        await _run(
+            "pooled LeetCodeAPI", lambda u: api.user_info(u), requests, concurrency
+        )
+    finally:
+        await api.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
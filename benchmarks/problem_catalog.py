@@ -0,0 +1,89 @@
+"""
+Compares the memory held by the problem caches when they store ORM Problem objects
+(with their tags loaded) against the slotted ProblemRecord catalog, over the full
+GitHub problem dump, and times cached lookups through each.
+Descriptions are left empty so that only per-object overhead is measured.
+
+Run from the repository root:
+    python -m benchmarks.problem_catalog [--dump leetcode_questions.json]
+
+Without --dump the dump is downloaded from GitHub.
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.search_index import load_problems
+from core.problem_catalog import ProblemCatalog, ProblemRecord
+from db.base import Base
+
+
+def retained(build) -> tuple[object, int]:
+    """Runs build and returns its result with the bytes it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def orm_caches(dump_path: str | None):
+    problems = load_problems(dump_path)
+    all_cache = {p.problem_frontend_id: p for p in problems}
+    free_cache = {p.problem_frontend_id: p for p in problems if not p.premium}
+    return all_cache, free_cache
+
+
+def record_catalog(dump_path: str | None) -> ProblemCatalog:
+    catalog = ProblemCatalog()
+    catalog.replace_all(ProblemRecord.from_orm(p) for p in load_problems(dump_path))
+    return catalog
+
+
+def measure(lookup, keys: list[int]) -> list[float]:
+    timings = []
+    for key in keys:
+        start = time.perf_counter()
+        lookup(key)
+        timings.append((time.perf_counter() - start) * 1e9)
+    return timings
+
+
+def report(kind: str, timings: list[float]) -> None:
+    print(
+        f"{kind:<24} {statistics.mean(timings):>8.0f} "
+        f"{statistics.median(timings):>8.0f} (ns)"
+    )
+
+
+def main(dump_path: str | None) -> None:
+    Base.registry.configure()
+    (all_cache, _), orm_bytes = retained(lambda: orm_caches(dump_path))
+    catalog, record_bytes = retained(lambda: record_catalog(dump_path))
+    print(f"Loaded {len(catalog)} problems ({len(catalog.free)} free)")
+    print(f"{'ORM caches':<24} {orm_bytes / 2**20:>8.2f} MiB")
+    print(f"{'record catalog':<24} {record_bytes / 2**20:>8.2f} MiB")
+    print(f"{'reduction':<24} {1 - record_bytes / orm_bytes:>8.1%}")
+
+    keys = random.Random(0).choices(list(catalog), k=10000)
+    report(
+        "ORM lookup",
+        measure(lambda k: {"problem": (p := all_cache[k]), "tags": set(p.tags)}, keys),
+    )
+    report(
+        "record lookup",
+        measure(lambda k: {"problem": (r := catalog[k]), "tags": r.tags}, keys),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="Path to leetcode_questions.json")
+    args = parser.parse_args()
+    main(args.dump)
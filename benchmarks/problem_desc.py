@@ -0,0 +1,102 @@
+"""
+Compares the old BeautifulSoup description parser with the single-pass tokenizer
+(in-process and fanned out over a process pool) on the full GitHub problem dump,
+and checks that both produce identical output.
+
+Run from the repository root:
+    python -m benchmarks.problem_desc [--dump leetcode_questions.json] [--workers 4]
+
+Without --dump the dump is downloaded from GitHub.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+import urllib.request
+
+from bs4 import BeautifulSoup
+
+from config.constants import preview_len
+from core.problem_desc import ProblemDescRenderer, render_problem_desc
+
+DUMP_URL = "https://raw.githubusercontent.com/noworneverev/leetcode-api/refs/heads/main/data/leetcode_questions.json"
+
+
+def bs4_problem_desc(content: str, max_len: int) -> str:
+    if not content:
+        return "No description available."
+    soup = BeautifulSoup(content, "html.parser")
+    for tag in soup.find_all("sup"):
+        tag.string = f"^{tag.get_text()}"
+    for tag in soup.find_all("code"):
+        tag.string = f"`{tag.get_text()}`"
+    for tag in soup.find_all("em"):
+        tag.string = f"*{tag.get_text()}*"
+    for tag in soup.find_all("strong"):
+        tag.string = f"**{tag.get_text()}**"
+    text_only = soup.get_text()
+    problem_md = re.sub(r"\n\s*\n", "\n\n", text_only.strip())[:max_len]
+    if len(text_only.strip()) > max_len:
+        problem_md += "..."
+    return problem_md
+
+
+def load_contents(dump_path: str | None) -> list[str]:
+    if dump_path:
+        with open(dump_path, "rb") as f:
+            raw = f.read()
+    else:
+        with urllib.request.urlopen(DUMP_URL) as response:
+            raw = response.read()
+    contents = []
+    for item in json.loads(raw):
+        question = (item.get("data") or {}).get("question") or {}
+        if question:
+            contents.append(question.get("content") or "")
+    return contents
+
+
+def timed(label: str, fn) -> list[str]:
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {time.perf_counter() - start:.3f}s")
+    return result
+
+
+async def render_with_pool(contents: list[str], workers: int | None) -> list[str]:
+    renderer = ProblemDescRenderer(max_len=preview_len, max_workers=workers)
+    renderer.start_pool()
+    try:
+        return await renderer.render_many(contents)
+    finally:
+        renderer.shutdown_pool()
+
+
+def main(dump_path: str | None, workers: int | None) -> None:
+    contents = load_contents(dump_path)
+    print(f"Loaded {len(contents)} problem descriptions")
+    expected = timed(
+        "BeautifulSoup",
+        lambda: [bs4_problem_desc(c, preview_len) for c in contents],
+    )
+    single = timed(
+        "tokenizer (1 process)",
+        lambda: [render_problem_desc(c, preview_len) for c in contents],
+    )
+    pooled = timed(
+        f"tokenizer (pool={workers or 'cpu'})",
+        lambda: asyncio.run(render_with_pool(contents, workers)),
+    )
+    mismatches = sum(a != b for a, b in zip(expected, single))
+    mismatches += sum(a != b for a, b in zip(expected, pooled))
+    print(f"Output mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="Path to leetcode_questions.json")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    main(args.dump, args.workers)
@@ -0,0 +1,129 @@
+"""
+Loads the full GitHub problem dump (with rendered descriptions) into a temporary
+SQLite database and compares loading the problem records with their descriptions
+against the deferred load init_cache uses, which leaves descriptions in the
+database: time and memory kept alive by each, then the latency of fetching a
+description cold (from the database) and from the description LRU.
+
+Run from the repository root:
+    python -m benchmarks.problem_descriptions [--dump leetcode_questions.json]
+
+Without --dump the dump is downloaded from GitHub.
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from benchmarks.search_index import load_problems
+from core.leetcode_problem import LeetCodeProblemManager
+from core.problem_catalog import ProblemRecord
+from db.base import Base
+from db.database_manager import DatabaseManager, create_database_engine
+from db.problem import Problem, TopicTags
+
+
+async def fill_database(database_manager: DatabaseManager, dump_path: str | None):
+    problems = load_problems(dump_path, descriptions=True)
+    tags: dict[str, TopicTags] = {}
+    for problem in problems:
+        problem.tags = [
+            tags.setdefault(tag.tag_name, TopicTags(tag_name=tag.tag_name))
+            for tag in problem.tags
+        ]
+    async with database_manager.session() as db:
+        db.add_all(problems)
+
+
+async def eager_records(database_manager: DatabaseManager):
+    """Every record with its description in memory, as the cache used to be."""
+    async with database_manager.session() as db:
+        stmt = select(Problem).options(selectinload(Problem.tags))
+        problems = (await db.execute(stmt)).scalars().all()
+    records = {p.problem_frontend_id: ProblemRecord.from_orm(p) for p in problems}
+    descriptions = {p.problem_frontend_id: p.description for p in problems}
+    return records, descriptions
+
+
+async def deferred_records(manager: LeetCodeProblemManager):
+    problems = await manager.get_problems_from_db()
+    return {p.problem_frontend_id: ProblemRecord.from_orm(p) for p in problems}
+
+
+async def retained(build) -> tuple[object, int, float]:
+    """Awaits build and returns its result, the bytes it keeps alive and seconds taken."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = await build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+async def measure(manager: LeetCodeProblemManager, keys: list[int]) -> list[float]:
+    timings = []
+    for key in keys:
+        problem = manager.all_problem_cache[key]
+        start = time.perf_counter()
+        await manager.get_problem_description(problem)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def report(kind: str, timings: list[float]) -> None:
+    print(
+        f"{kind:<24} {statistics.mean(timings):>8.1f} "
+        f"{statistics.median(timings):>8.1f} (us)"
+    )
+
+
+async def main(dump_path: str | None) -> None:
+    logger = logging.getLogger("benchmark")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_database_engine(f"sqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        database_manager = DatabaseManager(None, engine, logger)
+        await fill_database(database_manager, dump_path)
+
+        manager = LeetCodeProblemManager(None, database_manager, logger)
+        _, eager_bytes, eager_time = await retained(
+            lambda: eager_records(database_manager)
+        )
+        _, lazy_bytes, lazy_time = await retained(lambda: deferred_records(manager))
+        await manager.init_cache()
+        print(f"Loaded {len(manager.all_problem_cache)} problems")
+        print(
+            f"{'with descriptions':<24} {eager_time:>6.2f}s "
+            f"{eager_bytes / 2**20:>8.2f} MiB"
+        )
+        print(
+            f"{'deferred descriptions':<24} {lazy_time:>6.2f}s "
+            f"{lazy_bytes / 2**20:>8.2f} MiB"
+        )
+
+        keys = random.Random(0).sample(
+            list(manager.all_problem_cache), min(200, len(manager.all_problem_cache))
+        )
+        report("description (database)", await measure(manager, keys))
+        report("description (LRU)", await measure(manager, keys))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="Path to leetcode_questions.json")
+    args = parser.parse_args()
+    asyncio.run(main(args.dump))
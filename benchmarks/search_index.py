@@ -0,0 +1,127 @@
+"""
+Builds the problem search index and the autocomplete tries over the full GitHub
+problem dump and measures query latency for id, slug, title prefix, tag and
+misspelled queries, plus every prefix of each title as typed into Discord
+autocomplete, through the search index and through the tries (cold and cached).
+
+Run from the repository root:
+    python -m benchmarks.search_index [--dump leetcode_questions.json] [--limit 25]
+
+Without --dump the dump is downloaded from GitHub.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import urllib.request
+
+from config.constants import preview_len
+from core.autocomplete import ProblemAutocomplete
+from core.problem_desc import render_problem_desc
+from core.search_index import ProblemSearchIndex, slug_from_url
+from db.problem import Problem, TopicTags
+
+DUMP_URL = "https://raw.githubusercontent.com/noworneverev/leetcode-api/refs/heads/main/data/leetcode_questions.json"
+
+
+def load_problems(dump_path: str | None, descriptions: bool = False) -> list[Problem]:
+    if dump_path:
+        with open(dump_path, "rb") as f:
+            raw = f.read()
+    else:
+        with urllib.request.urlopen(DUMP_URL) as response:
+            raw = response.read()
+    problems = []
+    for item in json.loads(raw):
+        question = (item.get("data") or {}).get("question") or {}
+        if not question:
+            continue
+        problem = Problem(
+            title=question.get("title", ""),
+            problem_id=int(question.get("questionId", 0)),
+            problem_frontend_id=int(question.get("questionFrontendId", 0)),
+            url=question.get("url", ""),
+            difficulty=0,
+            description=render_problem_desc(question.get("content", ""), preview_len)
+            if descriptions
+            else "",
+            premium=question.get("isPaidOnly", False),
+        )
+        problem.tags = [
+            TopicTags(tag_name=tag.get("name", ""))
+            for tag in question.get("topicTags") or []
+        ]
+        problems.append(problem)
+    return problems
+
+
+def misspell(text: str, rng: random.Random) -> str:
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+
+
+def build_queries(problems: list[Problem], rng: random.Random) -> dict[str, list[str]]:
+    sample = rng.sample(problems, min(200, len(problems)))
+    tags = sorted({tag.tag_name for problem in problems for tag in problem.tags})
+    return {
+        "frontend id": [str(p.problem_frontend_id) for p in sample],
+        "slug": [slug_from_url(p.url) for p in sample],
+        "title prefix": [p.title[: max(3, len(p.title) // 2)] for p in sample],
+        "tag": tags,
+        "misspelled title": [misspell(p.title, rng) for p in sample],
+        "autocomplete keystrokes": [
+            p.title[:i] for p in sample[:50] for i in range(1, len(p.title) + 1)
+        ],
+    }
+
+
+def measure(lookup, queries: list[str]) -> list[float]:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        lookup(query)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def report(kind: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(
+        f"{kind:<32} {len(timings):>6} {statistics.mean(timings):>8.1f} "
+        f"{statistics.median(timings):>8.1f} {p99:>8.1f}"
+    )
+
+
+def main(dump_path: str | None, limit: int) -> None:
+    problems = load_problems(dump_path)
+    print(f"Loaded {len(problems)} problems")
+    index = ProblemSearchIndex()
+    start = time.perf_counter()
+    index.rebuild(problems)
+    print(f"{'search index build':<32} {time.perf_counter() - start:.3f}s")
+    autocomplete = ProblemAutocomplete(limit=limit)
+    start = time.perf_counter()
+    autocomplete.rebuild(problems)
+    print(f"{'autocomplete tries build':<32} {time.perf_counter() - start:.3f}s")
+
+    print(f"{'query kind':<32} {'count':>6} {'mean':>8} {'p50':>8} {'p99':>8} (us)")
+    queries = build_queries(problems, random.Random(0))
+    for kind, kind_queries in queries.items():
+        report(kind, measure(lambda q: index.search(q, limit), kind_queries))
+    keystrokes = queries["autocomplete keystrokes"]
+    report("trie keystrokes (cold)", measure(autocomplete.problem_ids, keystrokes))
+    report("trie keystrokes (cached)", measure(autocomplete.problem_ids, keystrokes))
+    report("trie tag keystrokes", measure(autocomplete.tag_names, queries["tag"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="Path to leetcode_questions.json")
+    parser.add_argument("--limit", type=int, default=25, help="Results per query")
+    args = parser.parse_args()
+    main(args.dump, args.limit)
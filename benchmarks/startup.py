@@ -0,0 +1,117 @@
+"""
+Measures process start to ready: spawns a fresh interpreter that imports main,
+creates LeetCodeBot, creates the schema and runs setup_hook (cogs, caches, job
+recovery) against a temporary SQLite database filled from the full GitHub problem
+dump. Logging in to Discord is skipped. Each run reports the wall time until
+setup_hook returned and the bot's startup phases.
+
+Run from the repository root:
+    python -m benchmarks.startup [--dump leetcode_questions.json] [--runs 5]
+
+Without --dump the dump is downloaded from GitHub.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.problem_descriptions import fill_database
+from db.base import Base
+from db.database_manager import DatabaseManager, create_database_engine
+
+BOOT = """
+import asyncio, logging, sys
+import main
+
+main.problem_snapshot_path = sys.argv[1]
+
+
+async def boot():
+    main.startup_profile.mark("imports")
+    bot = main.LeetCodeBot()
+    main.startup_profile.mark("bot init")
+    async with bot.engine.begin() as conn:
+        await conn.run_sync(main.Base.metadata.create_all)
+    main.startup_profile.mark("database schema")
+    await bot.setup_hook()
+    print("READY", flush=True)
+    main.startup_profile.report(logging.getLogger("startup"))
+    await bot.close()
+
+
+logging.basicConfig(level=logging.WARNING, format="%(message)s")
+logging.getLogger("startup").setLevel(logging.INFO)
+asyncio.run(boot())
+"""
+
+
+async def prepare(database_path: str, dump_path: str | None) -> None:
+    engine = create_database_engine(f"sqlite:///{database_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await fill_database(
+        DatabaseManager(None, engine, logging.getLogger("benchmark")), dump_path
+    )
+    await engine.dispose()
+
+
+def boot(env: dict[str, str], snapshot_path: str) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", BOOT, snapshot_path],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    ready = None
+    output = []
+    for line in process.stdout:
+        if ready is None and line.startswith("READY"):
+            ready = time.perf_counter() - start
+        else:
+            output.append(line.rstrip())
+    if process.wait() or ready is None:
+        raise RuntimeError("\n".join(output))
+    return ready, output
+
+
+def main(dump_path: str | None, runs: int, profile_imports: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "bench.db")
+        asyncio.run(prepare(database_path, dump_path))
+        env = {
+            **os.environ,
+            "BOT_TOKEN": "benchmark",
+            "DATABASE_URL": f"sqlite+aiosqlite:///{database_path}",
+            "DEBUG": "False",
+            "PROFILE_STARTUP": str(profile_imports),
+        }
+        snapshot_path = os.path.join(tmp, "problem_catalog.snapshot")
+        boot(env, snapshot_path)  # writes the snapshot and warms the OS file cache
+        timings = []
+        for _ in range(runs):
+            ready, output = boot(env, snapshot_path)
+            timings.append(ready)
+        print("\n".join(output))
+        print(
+            f"start to ready over {runs} runs: mean {statistics.mean(timings):.3f}s, "
+            f"min {min(timings):.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="Path to leetcode_questions.json")
+    parser.add_argument("--runs", type=int, default=5, help="Boots to time")
+    parser.add_argument(
+        "--profile-imports", action="store_true", help="Also time imports per package"
+    )
+    args = parser.parse_args()
+    main(args.dump, args.runs, args.profile_imports)
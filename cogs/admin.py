@@ -78,7 +78,7 @@ class admin(Cog):
     async def sync_app_commands(self, ctx: Context):
         assert ctx.guild is not None
         self.bot.tree.copy_global_to(guild=discord.Object(id=ctx.guild.id))
-        synced = await self.bot.tree.sync(guild=ctx.guild)
+        synced = await self.bot.command_syncer.sync(guild=ctx.guild, force=True) or []
         await ctx.send(f"Synced {len(synced)} app commands globally.")
 
     @commands.command(name="purge_msg", hidden=True, aliases=["purge"])
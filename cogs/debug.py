@@ -1,15 +1,19 @@
+import logging
+from typing import TYPE_CHECKING
 from discord.ext import commands
 import discord
 from discord import app_commands
 from utils.checks import is_me_app_command
-from main import LeetCodeBot
 from db.problem import Problem
 
-from main import logger
+if TYPE_CHECKING:
+    from main import LeetCodeBot
+
+logger = logging.getLogger("LeetCodeBot")
 
 
 class Debug(commands.Cog):
-    def __init__(self, bot: LeetCodeBot) -> None:
+    def __init__(self, bot: "LeetCodeBot") -> None:
         self.bot = bot
         self.database_manager = bot.database_manager
 
@@ -33,6 +37,29 @@ class Debug(commands.Cog):
         )
         logger.debug("Problems Cache:")
 
+    @debug.command(
+        name="cache_stats", description="Show hit/miss counters of the lookup caches"
+    )
+    @is_me_app_command()
+    async def cache_stats(self, interaction: discord.Interaction) -> None:
+        """Shows the hit/miss counters of the thread, forum channel, user, description and autocomplete caches."""
+        lines = [
+            f"{name}: {stats['hits']} hits, {stats['negative_hits']} negative hits, "
+            f"{stats['misses']} misses, {stats['invalidations']} invalidations "
+            f"(hit rate {stats['hit_rate']:.1%})"
+            for name, stats in self.bot.problem_threads_manager.cache_stats().items()
+        ]
+        lines += [
+            f"{name}: {stats['hits']} hits, {stats['stale_hits']} stale hits, "
+            f"{stats['misses']} misses, {stats['evictions']} evictions "
+            f"(hit rate {stats['hit_rate']:.1%})"
+            for name, stats in (
+                self.bot.user_profile_manager.cache_stats()
+                | self.bot.leetcode_problem_manger.cache_stats()
+            ).items()
+        ]
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
     @debug.command(
         name="fetch_problem",
         description="Fetch a problem by its ID from LeetCode",
@@ -69,5 +96,5 @@ class Debug(commands.Cog):
             )
 
 
-async def setup(bot: LeetCodeBot) -> None:
+async def setup(bot: "LeetCodeBot") -> None:
     await bot.add_cog(Debug(bot))
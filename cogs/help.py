@@ -1,11 +1,14 @@
+from typing import TYPE_CHECKING
 from discord.ext import commands
 import discord
 from discord import app_commands
-from main import LeetCodeBot
+
+if TYPE_CHECKING:
+    from main import LeetCodeBot
 
 
 class HelpCog(commands.Cog):
-    def __init__(self, bot: LeetCodeBot):
+    def __init__(self, bot: "LeetCodeBot"):
         self.bot = bot
         self.database_manager = bot.database_manager
         self.logger = bot.logger
@@ -51,5 +54,5 @@ class HelpCog(commands.Cog):
         await interaction.response.send_message(embed=help_embed)
 
 
-async def setup(bot: LeetCodeBot) -> None:
+async def setup(bot: "LeetCodeBot") -> None:
     await bot.add_cog(HelpCog(bot))
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from typing import TYPE_CHECKING, Optional
+
+from discord.ext import commands
+import discord
+from discord import app_commands
+from config.constants import DEV_ID, job_error_preview_len
+from core.jobs import Job
+from models.jobs import JobStatus
+from utils.checks import UserNotAdministrator, is_administrator
+from utils.embed_utils import join_field_lines
+
+if TYPE_CHECKING:
+    from main import LeetCodeBot
+
+
+def format_duration(duration: Optional[timedelta]) -> str:
+    if duration is None:
+        return "-"
+    seconds = int(duration.total_seconds())
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m {seconds}s"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def format_job(job: Job) -> str:
+    line = f"#{job.id} {job.name}: {job.status.value}"
+    if job.status is JobStatus.QUEUED:
+        line += f", waiting {format_duration(job.queued_for)}"
+    else:
+        line += f", ran {format_duration(job.duration)}"
+    if job.progress and not job.done():
+        line += f" ({job.progress})"
+    if job.error:
+        error = " ".join(job.error.split())
+        if len(error) > job_error_preview_len:
+            error = error[: job_error_preview_len - 1] + "…"
+        line += f" - {error}"
+    return line
+
+
+class Jobs(commands.Cog):
+    def __init__(self, bot: "LeetCodeBot"):
+        self.bot = bot
+        self.job_scheduler = bot.job_scheduler
+
+    @app_commands.command(name="jobs", description="Show background jobs")
+    @app_commands.guild_only()
+    async def jobs(self, interaction: discord.Interaction) -> None:
+        # Only this server's jobs and global ones are shown.
+        active = self.job_scheduler.active_jobs(interaction.guild_id)
+        queued = sum(job.status is JobStatus.QUEUED for job in active)
+        embed = discord.Embed(
+            title="Background Jobs",
+            description=f"{len(active)} active, {queued} queued",
+            color=discord.Color.blue(),
+        )
+        embed.add_field(
+            name="Active",
+            value=join_field_lines([format_job(job) for job in active]),
+            inline=False,
+        )
+        embed.add_field(
+            name="Recent",
+            value=join_field_lines(
+                [
+                    format_job(job)
+                    for job in self.job_scheduler.recent_jobs(interaction.guild_id)
+                ]
+            ),
+            inline=False,
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="cancel_job", description="<Admin> Cancel a job")
+    @app_commands.describe(job_id="The ID of the job, as shown by /jobs")
+    @is_administrator()
+    @app_commands.guild_only()
+    async def cancel_job(self, interaction: discord.Interaction, job_id: int) -> None:
+        # Administrators can cancel their own server's jobs; global jobs such as
+        # refresh, and other servers' jobs, only by the bot owner.
+        guild_id = None if interaction.user.id == DEV_ID else interaction.guild_id
+        if self.job_scheduler.cancel(job_id, guild_id=guild_id):
+            await interaction.response.send_message(
+                f"Cancelling job #{job_id}.", ephemeral=True
+            )
+        else:
+            await interaction.response.send_message(
+                f"Job #{job_id} is not running, or belongs to another server.",
+                ephemeral=True,
+            )
+
+    @cancel_job.error
+    async def on_cancel_job_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ) -> None:
+        if isinstance(error, UserNotAdministrator):
+            await interaction.response.send_message(error.message, ephemeral=True)
+        else:
+            await interaction.response.send_message(
+                f"An error occurred: {error}", ephemeral=True
+            )
+
+
+async def setup(bot: "LeetCodeBot") -> None:
+    await bot.add_cog(Jobs(bot))
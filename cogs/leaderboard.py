@@ -0,0 +1,112 @@
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from discord.ext import commands
+import discord
+from discord import app_commands
+from config.constants import leaderboard_size
+from core.leaderboard import active_streak
+from utils.custom_exceptions import LeetCodeUnavailable, LeetCodeUserNotFound
+
+if TYPE_CHECKING:
+    from main import LeetCodeBot
+
+logger = logging.getLogger("LeetCodeBot")
+
+
+class Leaderboard(commands.Cog):
+    def __init__(self, bot: "LeetCodeBot"):
+        self.bot = bot
+        self.leaderboard_manager = bot.leaderboard_manager
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        if not self.leaderboard_manager.poll_task.is_running():
+            logger.info("Starting leaderboard polling task...")
+            self.leaderboard_manager.poll_task.start()
+
+    @app_commands.command(
+        name="link", description="Link your LeetCode account for the leaderboard"
+    )
+    @app_commands.describe(username="Your LeetCode username")
+    @app_commands.guild_only()
+    async def link(self, interaction: discord.Interaction, username: str) -> None:
+        assert interaction.guild is not None
+        await interaction.response.defer(ephemeral=True)
+        try:
+            stats = await self.leaderboard_manager.link(
+                interaction.guild.id, interaction.user.id, username
+            )
+        except (LeetCodeUserNotFound, LeetCodeUnavailable) as e:
+            await interaction.followup.send(str(e))
+            return
+        except Exception as e:
+            logger.error("Error linking LeetCode account", exc_info=e)
+            await interaction.followup.send(
+                f"Something went wrong when linking the account! Error : {e}"
+            )
+            return
+        await interaction.followup.send(
+            f"Linked to LeetCode user {stats.username} ({stats.total} solved)."
+        )
+
+    @app_commands.command(
+        name="unlink", description="Unlink your LeetCode account from the leaderboard"
+    )
+    @app_commands.guild_only()
+    async def unlink(self, interaction: discord.Interaction) -> None:
+        assert interaction.guild is not None
+        if await self.leaderboard_manager.unlink(
+            interaction.guild.id, interaction.user.id
+        ):
+            await interaction.response.send_message(
+                "Your LeetCode account was unlinked.", ephemeral=True
+            )
+        else:
+            await interaction.response.send_message(
+                "You have no linked LeetCode account.", ephemeral=True
+            )
+
+    @app_commands.command(
+        name="leaderboard", description="Show the server's LeetCode leaderboard"
+    )
+    @app_commands.describe(size="Number of members to show, default is 10")
+    @app_commands.guild_only()
+    async def leaderboard(
+        self,
+        interaction: discord.Interaction,
+        size: app_commands.Range[int, 1, 25] = leaderboard_size,
+    ) -> None:
+        assert interaction.guild is not None
+        ranking = self.leaderboard_manager.get_leaderboard(interaction.guild.id, size)
+        if not ranking:
+            await interaction.response.send_message(
+                "Nobody is on the leaderboard yet. Use /link to join!", ephemeral=True
+            )
+            return
+        today = datetime.now(timezone.utc).date()
+        lines = [
+            f"**{rank}.** <@{user_id}> ({stats.username}): {stats.total} solved "
+            f"(E {stats.easy} / M {stats.medium} / H {stats.hard}), "
+            f"streak {active_streak(stats, today)}"
+            for rank, (user_id, stats) in enumerate(ranking, 1)
+        ]
+        embed = discord.Embed(
+            title=f"LeetCode Leaderboard - {interaction.guild.name}",
+            description="\n".join(lines),
+            color=discord.Color.gold(),
+        )
+        if (
+            rank := self.leaderboard_manager.get_rank(
+                interaction.guild.id, interaction.user.id
+            )
+        ) and rank > size:
+            embed.set_footer(text=f"Your rank: {rank}")
+        await interaction.response.send_message(
+            embed=embed, allowed_mentions=discord.AllowedMentions.none()
+        )
+
+
+async def setup(bot: "LeetCodeBot") -> None:
+    await bot.add_cog(Leaderboard(bot))
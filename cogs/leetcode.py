@@ -1,20 +1,27 @@
-from typing import Literal, Optional
+import logging
+from typing import TYPE_CHECKING, List, Literal, Optional
 
 from discord import Interaction, app_commands, Thread
 from discord.channel import ForumChannel
 from discord.ext import commands
 
-from config.constants import preview_len
+from config.constants import autocomplete_limit, preview_len, search_result_limit
 from config.secrets import debug
-from main import LeetCodeBot, logger
 from utils.embed_presenters import (
+    get_problem_search_embed,
     get_user_info_embed,
 )
 from utils.handle_leetcode_interation import handle_leetcode_interaction
+from utils.job_followup import follow_job
+
+if TYPE_CHECKING:
+    from main import LeetCodeBot
+
+logger = logging.getLogger("LeetCodeBot")
 
 
 class LeetCode(commands.Cog):
-    def __init__(self, bot: LeetCodeBot) -> None:
+    def __init__(self, bot: "LeetCodeBot") -> None:
         self.bot = bot
         self.database_manager = bot.database_manager
         self.leetcode_problem_manager = bot.leetcode_problem_manger
@@ -29,6 +36,9 @@ class LeetCode(commands.Cog):
         ):
             logger.info("Starting weekly LeetCode cache refresh task...")
             self.leetcode_problem_manager.weekly_cache_refresh.start()
+        if not self.leetcode_problem_manager.daily_prefetch.is_running():
+            logger.info("Starting daily problem prefetch task...")
+            self.leetcode_problem_manager.daily_prefetch.start()
 
     async def parse_problem_desc(self, content: str) -> str:
         """
@@ -62,12 +72,55 @@ class LeetCode(commands.Cog):
         logger.debug(f"Problem fetched: {problem}")
         return problem
 
+    async def problem_id_choices(self, current: str) -> List[app_commands.Choice[int]]:
+        """
+        Autocomplete choices for a problem id option, matching the typed text against
+        problem ids and titles.
+        """
+        return [
+            app_commands.Choice(
+                name=f"{problem.problem_frontend_id}. {problem.title}"[:100],
+                value=problem.problem_frontend_id,
+            )
+            for problem in await self.leetcode_problem_manager.autocomplete_problems(
+                current, autocomplete_limit
+            )
+        ]
+
+    @leetcode_problem.autocomplete("id")
+    async def leetcode_problem_id_autocomplete(
+        self, interaction: Interaction, current: str
+    ) -> List[app_commands.Choice[int]]:
+        return await self.problem_id_choices(current)
+
+    @app_commands.command(
+        name="search", description="Search LeetCode problems by title, slug or tag"
+    )
+    @app_commands.describe(
+        query="Words from the title, a title slug like two-sum, a tag or a problem ID"
+    )
+    @app_commands.guild_only()
+    async def search_problems(self, interaction: Interaction, query: str) -> None:
+        problems = await self.leetcode_problem_manager.search_problems(
+            query, search_result_limit
+        )
+        if not problems:
+            await interaction.response.send_message(
+                f"No problems found for {query}.", ephemeral=True
+            )
+            return
+        await interaction.response.send_message(
+            embed=get_problem_search_embed(query, problems, self.bot)
+        )
+
     @app_commands.command(
         name="random", description="Returns a random leetcode problem"
     )
     @app_commands.describe(
         difficulty="The problem difficulty",
         premium="Whether to include premium problems, default is False",
+        tag="Only pick problems with this topic tag, e.g. Dynamic Programming",
+        unseen="Only pick problems without a thread in this server, default is False",
     )
     @app_commands.guild_only()
     @handle_leetcode_interaction(is_daily=False)
@@ -76,17 +129,40 @@ class LeetCode(commands.Cog):
         interaction: Interaction,
         difficulty: Optional[Literal["Easy", "Medium", "Hard"]],
         premium: bool = False,
+        tag: Optional[str] = None,
+        unseen: bool = False,
     ):
         assert interaction.guild
         logger.info(
-            f"Fetching random problem (Difficulty: {difficulty}) for guild {interaction.guild.id}"
+            f"Fetching random problem (Difficulty: {difficulty}, Tag: {tag}, Unseen: {unseen}) for guild {interaction.guild.id}"
+        )
+        threaded_problem_ids = (
+            await self.problem_threads_manager.get_threaded_problem_ids(
+                interaction.guild.id
+            )
+            if unseen
+            else None
         )
         problem = await self.leetcode_problem_manager.get_random_problem(
-            difficulty=difficulty, premium=premium
+            difficulty=difficulty,
+            premium=premium,
+            tag=tag,
+            exclude_problem_db_ids=threaded_problem_ids,
         )
         logger.debug(f"Problem fetched: {problem}")
         return problem
 
+    @random_problem.autocomplete("tag")
+    async def random_problem_tag_autocomplete(
+        self, interaction: Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        return [
+            app_commands.Choice(name=tag_name, value=tag_name)
+            for tag_name in await self.leetcode_problem_manager.autocomplete_tags(
+                current, autocomplete_limit
+            )
+        ]
+
     @app_commands.command(
         name="desc", description="Get LeetCode Problem description with problem ID"
     )
@@ -136,24 +212,38 @@ class LeetCode(commands.Cog):
             )
             return
 
+    @leetcode_desc.autocomplete("id")
+    async def leetcode_desc_id_autocomplete(
+        self, interaction: Interaction, current: str
+    ) -> List[app_commands.Choice[int]]:
+        return await self.problem_id_choices(current)
+
     @app_commands.command(
         name="refresh", description="<Admin> Refresh LeetCode problems cache"
     )
+    @app_commands.describe(
+        force="Re-process the problem list even if it has not changed, default is False"
+    )
     @app_commands.checks.has_permissions(administrator=True)
     @app_commands.guild_only()
-    async def refresh_cache(self, interaction: Interaction) -> None:
+    async def refresh_cache(
+        self, interaction: Interaction, force: bool = False
+    ) -> None:
         await interaction.response.defer(thinking=True)
         logger.info(
             f"Refreshing LeetCode problems cache for guild {interaction.guild_id}"
         )
-        try:
-            await self.leetcode_problem_manager.refresh_cache()
-        except Exception as e:
-            await interaction.followup.send(
-                f"An error occurred while refreshing the cache: {e}"
-            )
-            return
-        await interaction.followup.send("LeetCode problems cache refreshed.")
+        # A refresh already in progress is joined; its force flag applies.
+        job, created = self.bot.job_scheduler.submit(
+            "refresh",
+            lambda job: self.leetcode_problem_manager.refresh_cache(force=force),
+        )
+        await follow_job(
+            interaction,
+            job,
+            created,
+            on_success=lambda _: "LeetCode problems cache refreshed.",
+        )
 
     @app_commands.command(
         name="check_leetcode_api", description="Check LeetCode API status"
@@ -219,9 +309,14 @@ class LeetCode(commands.Cog):
     @app_commands.command(name="statistics", description="Get user statistics")
     @app_commands.describe(username="The LeetCode username")
     async def user_statistics(self, interaction: Interaction, username: str) -> None:
+        # Repeated lookups are answered from the cache without deferring.
+        if info := self.bot.user_profile_manager.peek_user_info(username):
+            embed = get_user_info_embed(username=username, info=info, bot=self.bot)
+            await interaction.response.send_message(embed=embed)
+            return
         await interaction.response.defer(thinking=True, ephemeral=False)
         try:
-            info = await self.leetcode_api.user_info(username=username)
+            info = await self.bot.user_profile_manager.get_user_info(username)
             embed = get_user_info_embed(username=username, info=info, bot=self.bot)
             await interaction.followup.send(embed=embed)
         except Exception as e:
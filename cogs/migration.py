@@ -1,92 +1,64 @@
+import logging
+from typing import TYPE_CHECKING
 from discord.ext import commands
 import discord
 from discord import ForumChannel, app_commands
-import re
-from db.problem_threads import ProblemThreads
-from main import LeetCodeBot
-from typing import Dict
-from main import logger
+from core.jobs import Job
+from core.thread_migration import MigrationProgress
+from utils.job_followup import follow_job
+
+if TYPE_CHECKING:
+    from main import LeetCodeBot
+
+logger = logging.getLogger("LeetCodeBot")
 
 
 class Migration(commands.Cog):
-    def __init__(self, bot: LeetCodeBot):
+    def __init__(self, bot: "LeetCodeBot"):
         self.bot = bot
         self.database_manager = bot.database_manager
 
     @app_commands.command(name="migrate", description="Migrate from the old threads")
+    @app_commands.describe(
+        restart="Start over instead of resuming an unfinished migration"
+    )
     @app_commands.guild_only()
     async def migrate(
-        self, interaction: discord.Interaction, channel: ForumChannel
+        self,
+        interaction: discord.Interaction,
+        channel: ForumChannel,
+        restart: bool = False,
     ) -> None:
         await interaction.response.defer(ephemeral=True)
         logger.info(
             f"User {interaction.user} initiated migration in guild {interaction.guild} for channel {channel.id}"
         )
-        try:
-            assert isinstance(channel, ForumChannel) and interaction.guild is not None
-            if (
-                await self.bot.problem_threads_manager.get_forum_channel(
-                    interaction.guild.id
-                )
-                is None
-            ):
-                await interaction.followup.send(
-                    "Forum channel not set up in the database. Please set it up first."
-                )
-                return
-            leetcode_tag = None
-            for tag in channel.available_tags:
-                if tag.name.lower() == "leetcode":
-                    leetcode_tag = tag
-                    break
-            if not leetcode_tag:
-                await interaction.followup.send("No tag named LeetCode found!")
-                return
 
-            problem_threads: Dict[int, ProblemThreads] = dict()
-            all_leetcode_threads = []
-            # Example thread name: "1. Two Sum"
-            all_leetcode_threads += list(
-                filter(lambda thd: leetcode_tag in thd.applied_tags, channel.threads)
-            )
-            async for thd in channel.archived_threads(limit=None):
-                if leetcode_tag in thd.applied_tags:
-                    all_leetcode_threads.append(thd)
-            logger.info(
-                f"Found {len(all_leetcode_threads)} LeetCode threads in channel {channel.id} for migration."
-            )
-            logger.debug(
-                f"LeetCode Threads: {[thread.name for thread in all_leetcode_threads]}"
-            )
-            problem_name_regex = re.compile(r"^(\d+)\.\s")
-            for thread in all_leetcode_threads:
-                match = problem_name_regex.match(thread.name)
-                if not match:
-                    continue
-                problem_frontend_id = int(match.group(1))
-                problem_thread_instance = (
-                    await self.bot.problem_threads_manager.create_thread_instance(
-                        problem_frontend_id, interaction.guild.id, thread.id
+        async def run(job: Job) -> MigrationProgress:
+            async def report(progress: MigrationProgress) -> None:
+                job.progress = str(progress)
+                try:
+                    await interaction.edit_original_response(
+                        content=f"Migrating... {progress}"
                     )
-                )
-                logger.debug(
-                    f"Processed thread ID {thread.id} for problem frontend ID {problem_frontend_id}."
-                )
-                if problem_thread_instance:
-                    problem_threads[thread.id] = problem_thread_instance
-            await self.bot.problem_threads_manager.bulk_upsert_thread_to_db(
-                problem_threads
-            )
-            await interaction.followup.send(
-                f"Migration complete! Migrated {len(problem_threads)} threads."
-            )
+                except discord.HTTPException as e:
+                    logger.warning(f"Failed to report migration progress: {e}")
 
-        except Exception as e:
-            logger.error(f"Error during migration: {e}", exc_info=e)
-            await interaction.followup.send(
-                f"Something went wrong when migrating! Error : {e}"
+            return await self.bot.thread_migrator.migrate(
+                channel, on_progress=report, restart=restart
             )
 
+        assert isinstance(channel, ForumChannel) and interaction.guild is not None
+        job, created = self.bot.job_scheduler.submit(
+            "migrate", run, key=f"migrate:{channel.id}", guild_id=interaction.guild.id
+        )
+        await follow_job(
+            interaction,
+            job,
+            created,
+            on_success=lambda progress: f"Migration complete! {progress}",
+        )
+
 
-async def setup(bot: LeetCodeBot) -> None:
+async def setup(bot: "LeetCodeBot") -> None:
     await bot.add_cog(Migration(bot))
@@ -13,3 +13,75 @@ bot_name = "LeetCodeBot"
 
 version = "0.0"
 default_footer = f"LeetCodeBot version:{version}"
+
+# HTTP connection pool used by LeetCodeAPI
+http_connection_limit = 100
+http_connection_limit_per_host = 20
+http_keepalive_timeout = 30  # seconds
+http_dns_cache_ttl = 300  # seconds
+
+# Streaming parser for the full problem dump
+problem_stream_chunk_size = 64 * 1024  # bytes read from the response per chunk
+problem_stream_batch_size = 200  # problems parsed per executor job
+desc_render_workers = (
+    None  # worker processes for descriptions, None = CPU count, 0 = no pool
+)
+
+# On-disk copy of the problem dump, used for conditional (ETag) refreshes
+problem_dump_cache_dir = "cache"  # None disables the disk cache
+problem_dump_cache_compress = True
+
+# Binary snapshot of the problem catalog, rewritten after each refresh and read at boot
+problem_snapshot_path = "cache/problem_catalog.snapshot"  # None disables the snapshot
+
+# Database connection pool
+db_pool_size = 5
+db_max_overflow = 10
+db_busy_timeout = 30  # seconds a writer waits for the SQLite lock
+
+# Daily problem prefetch after the 00:00 UTC rollover
+daily_prefetch_retries = 5
+daily_prefetch_retry_delay = 60  # seconds
+
+# Seconds a "not found" result is remembered by the thread/forum channel caches
+lookup_negative_ttl = 600
+
+# /migrate: threads upserted and checkpointed per chunk, concurrent problem fetches
+thread_migration_chunk_size = 100
+thread_migration_fetch_concurrency = 5
+
+# Background jobs (/refresh, /migrate): concurrently running jobs, finished jobs kept in memory
+job_max_concurrency = 2
+job_history_size = 20
+job_error_preview_len = 100  # characters of a job's error shown by /jobs
+job_followup_timeout = 14 * 60  # seconds, interaction followups expire after 15 minutes
+
+# leetcode-api-pied.vercel.app: request rate, per-request timeout, retries and circuit breaker
+api_rate_limit = 5  # requests per second
+api_rate_burst = 10
+api_request_timeout = 10  # seconds
+api_retries = 2  # extra attempts for failed GETs
+api_retry_base_delay = 0.5  # seconds, doubled per attempt before jitter
+api_retry_max_delay = 5
+api_breaker_failure_threshold = 5  # consecutive failed calls before failing fast
+api_breaker_reset_timeout = 30  # seconds before a probe call is let through
+
+# /statistics user info and submissions: LRU size, seconds fresh, extra seconds served stale
+user_cache_max_size = 500
+user_cache_ttl = 10 * 60
+user_cache_stale_ttl = 60 * 60
+user_cache_persist = True  # keep entries in the database across restarts
+
+# Leaderboards: every linked LeetCode user is polled once per interval, spread over ticks
+leaderboard_poll_interval = 30 * 60  # seconds
+leaderboard_poll_tick = 60  # seconds
+leaderboard_poll_concurrency = 3
+leaderboard_size = 10
+
+# Problem search: results shown by /search, choices offered by autocomplete (max 25)
+search_result_limit = 10
+autocomplete_limit = 25
+autocomplete_cache_size = 1024  # answered prefixes kept per autocomplete kind
+
+# Problem descriptions are loaded on demand; this many are kept in memory (LRU)
+problem_desc_cache_size = 256
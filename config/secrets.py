@@ -1,11 +1,11 @@
 from dotenv import load_dotenv
 import os
 
-load_dotenv()
+_env_loaded = False
 
 
 def get_required_secret(key: str) -> str:
-    value = os.getenv(key)
+    value = get_secret(key)
     if value is None:
         raise EnvironmentError(
             f"Required secret '{key}' is not set in environment variables."
@@ -13,6 +13,25 @@ def get_required_secret(key: str) -> str:
     return value
 
 
-bot_token = get_required_secret("BOT_TOKEN")
-DATABASE_URL = get_required_secret("DATABASE_URL")
-debug = True if os.getenv("DEBUG", "True").lower() == "true" else False
+def get_secret(key: str, default: str | None = None) -> str | None:
+    """Reads a secret, loading .env on first use instead of at import."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+    return os.getenv(key, default)
+
+
+def __getattr__(name: str) -> str | bool:
+    # bot_token, DATABASE_URL and debug are resolved on first access, so importing
+    # this module neither reads .env nor fails when a secret is missing.
+    if name == "bot_token":
+        value: str | bool = get_required_secret("BOT_TOKEN")
+    elif name == "DATABASE_URL":
+        value = get_required_secret("DATABASE_URL")
+    elif name == "debug":
+        value = (get_secret("DEBUG", "True") or "").lower() == "true"
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
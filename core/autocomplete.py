@@ -0,0 +1,100 @@
+import math
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from config.constants import autocomplete_cache_size, autocomplete_limit
+from core.problem_catalog import ProblemRecord
+from core.search_index import normalize
+from utils.prefix_trie import PrefixTrie
+from utils.ttl_cache import TTLCache
+
+
+def _word_suffixes(text: str) -> List[str]:
+    """The text from each word on, so "two sum" is found by "two" and "sum"."""
+    words = normalize(text).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class ProblemAutocomplete:
+    """
+    Prefix tries over problem frontend ids, titles and tag names for slash-command
+    autocomplete. Problems complete in frontend id order and tags alphabetically.
+    Answers are cached per prefix; the caches are cleared whenever a problem changes.
+    """
+
+    def __init__(
+        self, limit: int = autocomplete_limit, cache_size: int = autocomplete_cache_size
+    ) -> None:
+        self._problems: PrefixTrie[int] = PrefixTrie(limit)
+        self._tags: PrefixTrie[str] = PrefixTrie(limit)
+        self._problem_keys: Dict[int, List[str]] = {}
+        self._problem_tags: Dict[int, List[str]] = {}
+        self._tag_counts: Counter[str] = Counter()
+        self.caches: Dict[str, TTLCache[str, list]] = {
+            kind: TTLCache(f"autocomplete_{kind}", cache_size, ttl=math.inf)
+            for kind in ("problems", "tags")
+        }
+
+    def rebuild(self, problems: Iterable[ProblemRecord]) -> None:
+        self._problems.clear()
+        self._tags.clear()
+        self._problem_keys.clear()
+        self._problem_tags.clear()
+        self._tag_counts.clear()
+        for problem in problems:
+            self.add(problem)
+
+    def add(self, problem: ProblemRecord) -> None:
+        """Indexes a problem, replacing any previous entry for the same frontend id."""
+        frontend_id = problem.problem_frontend_id
+        self.remove(frontend_id)
+        keys = [str(frontend_id), *_word_suffixes(problem.title or "")]
+        for key in keys:
+            self._problems.add(key, frontend_id)
+        self._problem_keys[frontend_id] = keys
+        tag_names = sorted({tag.tag_name for tag in problem.tags})
+        for tag_name in tag_names:
+            if self._tag_counts[tag_name] == 0:
+                for key in _word_suffixes(tag_name):
+                    self._tags.add(key, tag_name)
+            self._tag_counts[tag_name] += 1
+        self._problem_tags[frontend_id] = tag_names
+        self._invalidate()
+
+    def remove(self, problem_frontend_id: int) -> None:
+        keys = self._problem_keys.pop(problem_frontend_id, None)
+        if keys is None:
+            return
+        for key in keys:
+            self._problems.remove(key, problem_frontend_id)
+        for tag_name in self._problem_tags.pop(problem_frontend_id):
+            self._tag_counts[tag_name] -= 1
+            if self._tag_counts[tag_name] == 0:
+                del self._tag_counts[tag_name]
+                for key in _word_suffixes(tag_name):
+                    self._tags.remove(key, tag_name)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+
+    def problem_ids(self, prefix: str) -> List[int]:
+        """Frontend ids whose id, title or a title word starts with prefix."""
+        return self._complete("problems", self._problems, prefix)
+
+    def tag_names(self, prefix: str) -> List[str]:
+        """Tag names of indexed problems with a word starting with prefix."""
+        return self._complete("tags", self._tags, prefix)
+
+    def _complete(self, kind: str, trie: PrefixTrie, prefix: str) -> list:
+        key = normalize(prefix)
+        cache = self.caches[kind]
+        result, _ = cache.lookup(key)
+        if result is None:
+            result = trie.complete(key)
+            cache.set(key, result)
+        return result
+
+    def cache_stats(self) -> Dict[str, dict]:
+        return {cache.name: cache.stats.to_dict() for cache in self.caches.values()}
@@ -0,0 +1,179 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.problem_catalog import TAGS, ProblemRecord
+
+SNAPSHOT_MAGIC = b"LCBCATLG"
+SNAPSHOT_VERSION = 1
+
+# magic, format version, byte order (0 little, 1 big), problem count, fingerprint
+_HEADER = struct.Struct("<8sHBxI20s")
+_ARRAY_SECTIONS = (
+    ("id", "q"),
+    ("problem_id", "q"),
+    ("problem_frontend_id", "q"),
+    ("difficulty", "b"),
+    ("premium", "B"),
+    # tag_ids of problem i are tag_ids[tag_offsets[i] : tag_offsets[i + 1]]
+    ("tag_offsets", "I"),
+    ("tag_ids", "I"),
+)
+# NUL terminated utf-8; content hashes are "" when unset
+_STRING_SECTIONS = ("title", "url", "content_hash", "tag_names")
+_SECTIONS = len(_ARRAY_SECTIONS) + len(_STRING_SECTIONS)
+_LENGTHS = struct.Struct(f"<{_SECTIONS}Q")
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+
+def catalog_fingerprint(rows: Iterable[Tuple[int, Optional[str]]]) -> bytes:
+    """
+    Digest of (database id, content hash) pairs. Content hashes cover every field
+    and tag a record holds, so equal fingerprints mean equal catalogs.
+    """
+    digest = hashlib.sha1()
+    for problem_db_id, content_hash in sorted(rows):
+        digest.update(f"{problem_db_id}:{content_hash or ''}\n".encode())
+    return digest.digest()
+
+
+def _padded(length: int) -> int:
+    return -length % 8
+
+
+class CatalogSnapshot:
+    """
+    Versioned binary copy of the problem catalog, written after each refresh so the
+    bot can boot without loading every problem through the ORM.
+    Columns are stored as typed arrays and string tables and read back through a
+    read-only memory map. A snapshot is only used if its fingerprint matches the
+    database's.
+    """
+
+    def __init__(self, path: str, logger: logging.Logger) -> None:
+        self.path = path
+        self.logger = logger
+
+    def save(self, records: Sequence[ProblemRecord]) -> None:
+        """Writes the records to a temporary file and swaps it in."""
+        local_ids: Dict[int, int] = {}
+        columns = {name: array(typecode) for name, typecode in _ARRAY_SECTIONS}
+        columns["tag_offsets"].append(0)
+        for record in records:
+            for name in ("id", "problem_id", "problem_frontend_id", "difficulty"):
+                columns[name].append(getattr(record, name))
+            columns["premium"].append(record.premium)
+            columns["tag_ids"].extend(
+                local_ids.setdefault(tag_id, len(local_ids))
+                for tag_id in record.tag_ids
+            )
+            columns["tag_offsets"].append(len(columns["tag_ids"]))
+        strings = {
+            name: [getattr(record, name) or "" for record in records]
+            for name in ("title", "url", "content_hash")
+        }
+        strings["tag_names"] = [TAGS[tag_id].tag_name for tag_id in local_ids]
+        sections = [columns[name].tobytes() for name, _ in _ARRAY_SECTIONS]
+        sections += [
+            "".join(f"{value}\0" for value in strings[name]).encode()
+            for name in _STRING_SECTIONS
+        ]
+        fingerprint = catalog_fingerprint((r.id, r.content_hash) for r in records)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    SNAPSHOT_MAGIC,
+                    SNAPSHOT_VERSION,
+                    _BYTE_ORDER,
+                    len(records),
+                    fingerprint,
+                )
+            )
+            f.write(_LENGTHS.pack(*map(len, sections)))
+            f.write(bytes(_padded(_HEADER.size + _LENGTHS.size)))
+            for section in sections:
+                f.write(section)
+                f.write(bytes(_padded(len(section))))
+        os.replace(tmp_path, self.path)
+        self.logger.info(f"Wrote snapshot of {len(records)} problems to {self.path}.")
+
+    def load(self, fingerprint: bytes) -> Optional[List[ProblemRecord]]:
+        """
+        Returns the snapshot's records, or None if it is missing, from another
+        format version, or stale (its fingerprint differs from the given one).
+        """
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < _HEADER.size + _LENGTHS.size:
+                    self.logger.info("Problem snapshot is truncated, ignoring it.")
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self._read(mapped, fingerprint)
+        except FileNotFoundError:
+            self.logger.info(f"No problem snapshot at {self.path}.")
+            return None
+        except (OSError, ValueError, IndexError) as e:
+            self.logger.warning("Unreadable problem snapshot, ignoring it.", exc_info=e)
+            return None
+
+    def _read(
+        self, mapped: mmap.mmap, fingerprint: bytes
+    ) -> Optional[List[ProblemRecord]]:
+        magic, version, byte_order, count, snapshot_fingerprint = _HEADER.unpack_from(
+            mapped
+        )
+        if magic != SNAPSHOT_MAGIC or (version, byte_order) != (
+            SNAPSHOT_VERSION,
+            _BYTE_ORDER,
+        ):
+            self.logger.info("Problem snapshot has another format, ignoring it.")
+            return None
+        if snapshot_fingerprint != fingerprint:
+            self.logger.info("Problem snapshot is stale, ignoring it.")
+            return None
+
+        lengths = _LENGTHS.unpack_from(mapped, _HEADER.size)
+        offset = _HEADER.size + _LENGTHS.size
+        offset += _padded(offset)
+        columns: Dict[str, list] = {}
+        with memoryview(mapped) as view:
+            for (name, typecode), length in zip(_ARRAY_SECTIONS, lengths):
+                with view[offset : offset + length] as raw, raw.cast(typecode) as data:
+                    columns[name] = data.tolist()
+                offset += length + _padded(length)
+            for name, length in zip(_STRING_SECTIONS, lengths[len(_ARRAY_SECTIONS) :]):
+                with view[offset : offset + length] as raw:
+                    columns[name] = str(raw, "utf-8").split("\0")[:-1]
+                offset += length + _padded(length)
+
+        if any(len(columns[name]) != count for name in ("id", "title", "url")):
+            raise ValueError("Problem snapshot columns do not match its header")
+        tag_ids = [TAGS.intern(tag_name) for tag_name in columns["tag_names"]]
+        local_tags, tag_offsets = columns["tag_ids"], columns["tag_offsets"]
+        return [
+            ProblemRecord(
+                tag_ids=tuple(
+                    sorted(
+                        tag_ids[local]
+                        for local in local_tags[tag_offsets[i] : tag_offsets[i + 1]]
+                    )
+                ),
+                id=columns["id"][i],
+                problem_id=columns["problem_id"][i],
+                problem_frontend_id=columns["problem_frontend_id"][i],
+                title=columns["title"][i],
+                url=columns["url"][i],
+                difficulty=columns["difficulty"][i],
+                premium=columns["premium"][i],
+                content_hash=columns["content_hash"][i] or None,
+            )
+            for i in range(count)
+        ]
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from discord import app_commands
+from discord.abc import Snowflake
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
+
+from db.command_sync import CommandTreeSync
+from db.database_manager import DatabaseManager
+
+
+class CommandSyncStats:
+    __slots__ = ("syncs", "skips", "last_sync_seconds")
+
+    def __init__(self) -> None:
+        self.syncs = 0
+        self.skips = 0
+        self.last_sync_seconds: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "syncs": self.syncs,
+            "skips": self.skips,
+            "last_sync_seconds": self.last_sync_seconds,
+        }
+
+
+class CommandTreeSyncer:
+    """
+    Syncs the application command tree to Discord only when its payload differs from
+    the one last synced, whose hash is kept in the database. READY fires again after
+    every gateway reconnect, and each sync is a rate-limited HTTP round trip.
+    """
+
+    def __init__(
+        self,
+        tree: app_commands.CommandTree,
+        database_manager: DatabaseManager,
+        logger: logging.Logger,
+    ) -> None:
+        self.tree = tree
+        self.database_manager = database_manager
+        self.logger = logger
+        self.stats = CommandSyncStats()
+        # (application id, guild id or 0) -> hash of the last synced payload
+        self._synced: Dict[Tuple[int, int], str] = {}
+
+    def tree_hash(self, guild: Optional[Snowflake] = None) -> str:
+        """Stable hash of the payload tree.sync would send for the guild."""
+        payload = sorted(
+            (
+                command.to_dict(self.tree)
+                for command in self.tree.get_commands(guild=guild)
+            ),
+            key=lambda command: (command.get("type", 1), command["name"]),
+        )
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    async def sync(
+        self, guild: Optional[Snowflake] = None, force: bool = False
+    ) -> Optional[List[app_commands.AppCommand]]:
+        """
+        Syncs the commands for the guild (or the global ones) unless the tree is
+        unchanged since the last sync. Returns the synced commands, or None if skipped.
+        """
+        application_id = self.tree.client.application_id or 0
+        key = (application_id, guild.id if guild else 0)
+        tree_hash = self.tree_hash(guild)
+        if not force and tree_hash == await self._last_synced_hash(key):
+            self.stats.skips += 1
+            self.logger.info(
+                f"Command tree for {self._scope(guild)} unchanged ({tree_hash[:12]}), "
+                f"skipping sync ({self.stats.skips} skipped so far)."
+            )
+            return None
+
+        start = time.perf_counter()
+        synced = await self.tree.sync(guild=guild)
+        self.stats.last_sync_seconds = time.perf_counter() - start
+        self.stats.syncs += 1
+        self.logger.info(
+            f"Synced {len(synced)} commands to {self._scope(guild)} "
+            f"in {self.stats.last_sync_seconds:.2f}s ({tree_hash[:12]})."
+        )
+        self._synced[key] = tree_hash
+        await self._store_hash(key, tree_hash)
+        return synced
+
+    @staticmethod
+    def _scope(guild: Optional[Snowflake]) -> str:
+        return f"guild {guild.id}" if guild else "global commands"
+
+    async def _last_synced_hash(self, key: Tuple[int, int]) -> Optional[str]:
+        if key in self._synced:
+            return self._synced[key]
+        try:
+            async with self.database_manager.session() as db:
+                stmt = select(CommandTreeSync.tree_hash).where(
+                    CommandTreeSync.application_id == key[0],
+                    CommandTreeSync.guild_id == key[1],
+                )
+                tree_hash = (await db.execute(stmt)).scalar_one_or_none()
+        except Exception as e:
+            # Without the stored hash the tree is synced, as it was before hashing.
+            self.logger.warning("Failed to read the command tree hash", exc_info=e)
+            return None
+        if tree_hash is not None:
+            self._synced[key] = tree_hash
+        return tree_hash
+
+    async def _store_hash(self, key: Tuple[int, int], tree_hash: str) -> None:
+        try:
+            async with self.database_manager.session() as db:
+                stmt = sqlite_upsert(CommandTreeSync).values(
+                    application_id=key[0],
+                    guild_id=key[1],
+                    tree_hash=tree_hash,
+                    synced_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                )
+                await db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["application_id", "guild_id"],
+                        set_={
+                            "tree_hash": stmt.excluded.tree_hash,
+                            "synced_at": stmt.excluded.synced_at,
+                        },
+                    )
+                )
+        except Exception as e:
+            # The next boot syncs again; nothing else depends on the stored hash.
+            self.logger.warning("Failed to store the command tree hash", exc_info=e)
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
+
+from config.constants import job_history_size, job_max_concurrency
+from db.database_manager import DatabaseManager
+from db.job import JobRecord
+from models.jobs import JobStatus
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Job:
+    __slots__ = (
+        "id",
+        "name",
+        "key",
+        "guild_id",
+        "status",
+        "created_at",
+        "started_at",
+        "finished_at",
+        "error",
+        "progress",
+        "result",
+        "_exception",
+        "_task",
+    )
+
+    def __init__(
+        self, job_id: int, name: str, key: str, guild_id: Optional[int] = None
+    ) -> None:
+        self.id = job_id
+        self.name = name
+        self.key = key
+        # The guild the job was submitted for, None for global jobs.
+        self.guild_id = guild_id
+        self.status = JobStatus.QUEUED
+        self.created_at = _utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        # Free-form progress line the job function may update, shown by /jobs.
+        self.progress: Optional[str] = None
+        self.result: Any = None
+        self._exception: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        """Time spent running so far, or in total once finished."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or _utcnow()) - self.started_at
+
+    @property
+    def queued_for(self) -> timedelta:
+        return (self.started_at or self.finished_at or _utcnow()) - self.created_at
+
+    def done(self) -> bool:
+        return not self.status.is_active
+
+    def visible_to(self, guild_id: Optional[int]) -> bool:
+        """Whether the guild may see the job: its own jobs and global ones."""
+        return guild_id is None or self.guild_id in (None, guild_id)
+
+    async def wait(self) -> Any:
+        """
+        Waits for the job and returns its result, raising what the job raised or
+        JobCancelled. Cancelling the waiter does not cancel the job.
+        """
+        assert self._task is not None
+        await asyncio.shield(self._task)
+        if self.status is JobStatus.CANCELLED:
+            raise JobCancelled(f"Job #{self.id} ({self.name}) was cancelled.")
+        if self._exception is not None:
+            raise self._exception
+        return self.result
+
+    def to_record(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "key": self.key,
+            "guild_id": self.guild_id,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"Job(id={self.id}, name={self.name}, key={self.key}, status={self.status.value})"
+
+
+JobFunc = Callable[[Job], Awaitable[Any]]
+
+
+class JobScheduler:
+    """
+    Runs slow work (cache refreshes, migrations) as named background jobs so it does
+    not live inside an interaction handler.
+    Jobs sharing a key are deduplicated: submitting while one is queued or running
+    returns the active job. At most max_concurrency jobs run at once, the rest wait
+    in submission order. Every status change is persisted to the jobs table.
+    """
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        logger: logging.Logger,
+        max_concurrency: int = job_max_concurrency,
+        history_size: int = job_history_size,
+    ) -> None:
+        self.database_manager = database_manager
+        self.logger = logger
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._active: Dict[str, Job] = {}
+        self.history: Deque[Job] = deque(maxlen=history_size)
+        self._next_id = 1
+
+    async def recover(self) -> int:
+        """
+        Marks jobs left active by a previous run as interrupted and continues the id
+        sequence after the persisted jobs. Call once before submitting jobs.
+        """
+        async with self.database_manager.session() as db:
+            stmt = (
+                update(JobRecord)
+                .where(
+                    JobRecord.status.in_(
+                        [JobStatus.QUEUED.value, JobStatus.RUNNING.value]
+                    )
+                )
+                .values(status=JobStatus.INTERRUPTED.value, finished_at=_utcnow())
+            )
+            interrupted = (await db.execute(stmt)).rowcount
+            max_id = (await db.execute(select(func.max(JobRecord.id)))).scalar()
+        self._next_id = max(self._next_id, (max_id or 0) + 1)
+        if interrupted:
+            self.logger.warning(f"Marked {interrupted} unfinished jobs as interrupted.")
+        return interrupted
+
+    def submit(
+        self,
+        name: str,
+        job_func: JobFunc,
+        key: Optional[str] = None,
+        guild_id: Optional[int] = None,
+    ) -> Tuple[Job, bool]:
+        """
+        Schedules job_func(job) unless a job with the same key is active.
+        Jobs that only concern one guild should pass its id, see cancel.
+        Returns the job and whether it was newly created.
+        """
+        key = key or name
+        if (job := self._active.get(key)) is not None:
+            return job, False
+        job = Job(self._next_id, name, key, guild_id)
+        self._next_id += 1
+        self._active[key] = job
+        job._task = asyncio.create_task(self._run(job, job_func), name=f"job-{name}")
+        self.logger.info(f"Submitted job #{job.id} ({name}).")
+        return job, True
+
+    async def _run(self, job: Job, job_func: JobFunc) -> None:
+        try:
+            await self._persist(job)
+            async with self._semaphore:
+                job.status = JobStatus.RUNNING
+                job.started_at = _utcnow()
+                await self._persist(job)
+                job.result = await job_func(job)
+            job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            # The job is the outermost task, so the cancellation stops here.
+            job.status = JobStatus.CANCELLED
+        except Exception as e:
+            self.logger.error(f"Job #{job.id} ({job.name}) failed", exc_info=e)
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            job._exception = e
+        finally:
+            job.finished_at = _utcnow()
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+            self.history.appendleft(job)
+            self.logger.info(f"Job #{job.id} ({job.name}) {job.status.value}.")
+        await self._persist(job)
+
+    async def _persist(self, job: Job) -> None:
+        """Status persistence is best effort; a failed write does not fail the job."""
+        values = job.to_record()
+        insert_stmt = sqlite_upsert(JobRecord).values(**values)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={key: insert_stmt.excluded[key] for key in values if key != "id"},
+        )
+        try:
+            async with self.database_manager.session() as db:
+                await db.execute(insert_stmt)
+        except Exception as e:
+            self.logger.warning(f"Failed to persist job #{job.id}", exc_info=e)
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        for job in self._active.values():
+            if job.id == job_id:
+                return job
+        return next((job for job in self.history if job.id == job_id), None)
+
+    def active_jobs(self, guild_id: Optional[int] = None) -> List[Job]:
+        """Active jobs by id; with a guild id, only its jobs and global ones."""
+        return sorted(
+            (job for job in self._active.values() if job.visible_to(guild_id)),
+            key=lambda job: job.id,
+        )
+
+    def recent_jobs(self, guild_id: Optional[int] = None, limit: int = 5) -> List[Job]:
+        """Finished jobs, newest first; with a guild id, only its jobs and global ones."""
+        return [job for job in self.history if job.visible_to(guild_id)][:limit]
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(job.status is JobStatus.QUEUED for job in self._active.values())
+
+    def cancel(self, job_id: int, guild_id: Optional[int] = None) -> bool:
+        """
+        Requests cancellation of an active job. With a guild id, only jobs submitted
+        for that guild are cancelled, not other guilds' or global ones.
+        Returns False if the job is not active or not the guild's.
+        """
+        job = self.get_job(job_id)
+        if job is None or job.done() or job._task is None:
+            return False
+        if guild_id is not None and job.guild_id != guild_id:
+            return False
+        job._task.cancel()
+        return True
+
+    async def get_recent_jobs_from_db(self, limit: int = 10) -> List[JobRecord]:
+        async with self.database_manager.session() as db:
+            stmt = select(JobRecord).order_by(JobRecord.id.desc()).limit(limit)
+            return list((await db.execute(stmt)).scalars().all())
+
+    async def shutdown(self) -> None:
+        """Cancels all active jobs and waits for them to record their status."""
+        tasks = [job._task for job in self._active.values() if job._task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
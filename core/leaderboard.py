@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import math
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from discord.ext import tasks
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
+
+from config.constants import (
+    leaderboard_poll_concurrency,
+    leaderboard_poll_interval,
+    leaderboard_poll_tick,
+)
+from core.leetcode_api import FetchError
+from core.user_profiles import UserProfileManager
+from db.database_manager import DatabaseManager
+from db.leaderboard import LeetCodeAccount, LeetCodeUserStats
+from utils.custom_exceptions import LeetCodeUnavailable, LeetCodeUserNotFound
+from utils.resilience import CircuitOpenError
+
+# Guild member id and their stats, best first
+Ranking = List[Tuple[int, LeetCodeUserStats]]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def parse_solved_counts(info: dict) -> Dict[str, int]:
+    """Reads the accepted problem count per difficulty from a user info response."""
+    counts = {"easy": 0, "medium": 0, "hard": 0}
+    submit_stats = info.get("submitStats") or {}
+    for entry in submit_stats.get("acSubmissionNum") or []:
+        difficulty = str(entry.get("difficulty", "")).lower()
+        if difficulty in counts:
+            counts[difficulty] = int(entry.get("count") or 0)
+    return counts
+
+
+def parse_accepted_timestamps(payload: Any) -> List[int]:
+    """Returns the sorted timestamps of accepted submissions in a submissions response."""
+    if isinstance(payload, dict):
+        payload = next(
+            (
+                payload[key]
+                for key in ("submission", "recentSubmissionList", "submissions")
+                if isinstance(payload.get(key), list)
+            ),
+            [],
+        )
+    timestamps = []
+    for submission in payload or []:
+        if not isinstance(submission, dict):
+            continue
+        if submission.get("statusDisplay", "Accepted") != "Accepted":
+            continue
+        try:
+            timestamps.append(int(submission["timestamp"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return sorted(timestamps)
+
+
+def apply_accepted_submissions(stats: LeetCodeUserStats, timestamps: List[int]) -> None:
+    """Advances the streaks with accepted submissions newer than the last counted one."""
+    new_timestamps = [ts for ts in timestamps if ts > stats.last_submission_at]
+    for timestamp in new_timestamps:
+        day = datetime.fromtimestamp(timestamp, timezone.utc).date()
+        last_day = stats.last_solved_on
+        if last_day is not None and day <= last_day:
+            continue
+        if last_day is not None and day == last_day + timedelta(days=1):
+            stats.current_streak += 1
+        else:
+            stats.current_streak = 1
+        stats.last_solved_on = day
+        stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+    if new_timestamps:
+        stats.last_submission_at = new_timestamps[-1]
+
+
+def active_streak(stats: LeetCodeUserStats, today: date) -> int:
+    """The current streak, or 0 if it was broken by a day without an accepted submission."""
+    if stats.last_solved_on is None or stats.last_solved_on < today - timedelta(days=1):
+        return 0
+    return stats.current_streak
+
+
+def _rank_key(stats: LeetCodeUserStats) -> Tuple[int, int, int, str]:
+    return (-stats.total, -stats.hard, -stats.medium, stats.username)
+
+
+class LeaderboardManager:
+    """
+    Keeps per-guild leaderboards of linked LeetCode accounts.
+    Each linked username is polled once per poll_interval, spread over the interval's
+    ticks so requests are not bursty, with at most poll_concurrency polls at a time.
+    A poll updates that user's stats and re-ranks only the guilds linking it, so
+    /leaderboard reads a precomputed ranking.
+    """
+
+    def __init__(
+        self,
+        user_profile_manager: UserProfileManager,
+        database_manager: DatabaseManager,
+        logger: logging.Logger,
+        poll_interval: float = leaderboard_poll_interval,
+        poll_tick: float = leaderboard_poll_tick,
+        poll_concurrency: int = leaderboard_poll_concurrency,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.user_profile_manager = user_profile_manager
+        self.database_manager = database_manager
+        self.logger = logger
+        self.poll_interval = poll_interval
+        self.poll_tick = poll_tick
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(poll_concurrency)
+        # guild id -> member id -> username
+        self.accounts: Dict[int, Dict[int, str]] = {}
+        self.guilds_by_username: Dict[str, Set[int]] = {}
+        self.stats: Dict[str, LeetCodeUserStats] = {}
+        self.rankings: Dict[int, Ranking] = {}
+        self._last_polled: Dict[str, float] = {}
+        self.poll_task.change_interval(seconds=poll_tick)
+
+    @tasks.loop(seconds=leaderboard_poll_tick, name="leaderboard_poll")
+    async def poll_task(self) -> None:
+        await self.poll_due_users()
+
+    async def init_cache(self) -> None:
+        async with self.database_manager.session() as db:
+            accounts = (await db.execute(select(LeetCodeAccount))).scalars().all()
+            stats = (await db.execute(select(LeetCodeUserStats))).scalars().all()
+        self.accounts = {}
+        self.guilds_by_username = {}
+        self.stats = {row.username: row for row in stats}
+        for account in accounts:
+            self._add_account(account.guild_id, account.user_id, account.username)
+        # Stagger the first polls across one interval.
+        usernames = sorted(self.guilds_by_username)
+        now = self._clock()
+        self._last_polled = {
+            username: now - self.poll_interval * (i + 1) / len(usernames)
+            for i, username in enumerate(usernames)
+        }
+        self.rankings = {}
+        for guild_id in self.accounts:
+            self._rerank(guild_id)
+        self.logger.info(
+            f"Loaded {len(accounts)} linked LeetCode accounts "
+            f"in {len(self.accounts)} guilds."
+        )
+
+    def _add_account(self, guild_id: int, user_id: int, username: str) -> None:
+        self.accounts.setdefault(guild_id, {})[user_id] = username
+        self.guilds_by_username.setdefault(username, set()).add(guild_id)
+
+    def _remove_account(self, guild_id: int, user_id: int) -> Optional[str]:
+        members = self.accounts.get(guild_id, {})
+        username = members.pop(user_id, None)
+        if username is None:
+            return None
+        if username not in members.values():
+            guilds = self.guilds_by_username[username]
+            guilds.discard(guild_id)
+            if not guilds:
+                del self.guilds_by_username[username]
+                self._last_polled.pop(username, None)
+        return username
+
+    def _rerank(self, guild_id: int) -> None:
+        ranking = [
+            (user_id, self.stats[username])
+            for user_id, username in self.accounts.get(guild_id, {}).items()
+            if username in self.stats
+        ]
+        ranking.sort(key=lambda entry: _rank_key(entry[1]))
+        self.rankings[guild_id] = ranking
+
+    async def link(
+        self, guild_id: int, user_id: int, username: str
+    ) -> LeetCodeUserStats:
+        """
+        Links a member to a LeetCode username, replacing an earlier link, and polls it.
+        Raises LeetCodeUserNotFound if LeetCode does not know the username, and
+        LeetCodeUnavailable if LeetCode could not be asked.
+        """
+        username = username.casefold()
+        try:
+            info = await self.user_profile_manager.fetch_user_info(username)
+        except (FetchError, CircuitOpenError, asyncio.TimeoutError) as e:
+            if isinstance(e, FetchError) and e.status == 404:
+                raise LeetCodeUserNotFound(
+                    f"LeetCode user {username} not found."
+                ) from e
+            raise LeetCodeUnavailable(
+                "LeetCode is not responding, please try again later."
+            ) from e
+        if not info or not (info.get("profile") or info.get("submitStats")):
+            raise LeetCodeUserNotFound(f"LeetCode user {username} not found.")
+
+        values = {
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "username": username,
+            "linked_at": _utcnow(),
+        }
+        insert_stmt = sqlite_upsert(LeetCodeAccount).values(**values)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["guild_id", "user_id"],
+            set_={
+                "username": insert_stmt.excluded.username,
+                "linked_at": insert_stmt.excluded.linked_at,
+            },
+        )
+        async with self.database_manager.session() as db:
+            await db.execute(insert_stmt)
+        self._remove_account(guild_id, user_id)
+        self._add_account(guild_id, user_id, username)
+        await self.poll_user(username, info=info)
+        self._rerank(guild_id)
+        return self.stats[username]
+
+    async def unlink(self, guild_id: int, user_id: int) -> bool:
+        async with self.database_manager.session() as db:
+            await db.execute(
+                delete(LeetCodeAccount).where(
+                    LeetCodeAccount.guild_id == guild_id,
+                    LeetCodeAccount.user_id == user_id,
+                )
+            )
+        if self._remove_account(guild_id, user_id) is None:
+            return False
+        self._rerank(guild_id)
+        return True
+
+    def due_usernames(self) -> List[str]:
+        """
+        Usernames not polled within poll_interval, oldest first, capped so that a full
+        cycle is spread evenly over the interval's ticks.
+        """
+        if not self.guilds_by_username:
+            return []
+        now = self._clock()
+        due = sorted(
+            (
+                username
+                for username in self.guilds_by_username
+                if now - self._last_polled.get(username, -math.inf)
+                >= self.poll_interval
+            ),
+            key=lambda username: self._last_polled.get(username, -math.inf),
+        )
+        ticks = max(1, int(self.poll_interval // self.poll_tick))
+        return due[: math.ceil(len(self.guilds_by_username) / ticks)]
+
+    async def poll_due_users(self) -> None:
+        usernames = self.due_usernames()
+        results = await asyncio.gather(
+            *(self.poll_user(username) for username in usernames),
+            return_exceptions=True,
+        )
+        for username, result in zip(usernames, results):
+            if isinstance(result, Exception):
+                self.logger.warning(
+                    f"Failed to poll LeetCode user {username}", exc_info=result
+                )
+
+    async def poll_user(self, username: str, info: Optional[dict] = None) -> None:
+        """Fetches a user's solved counts and submissions and updates their rankings."""
+        async with self._semaphore:
+            self._last_polled[username] = self._clock()
+            if info is None:
+                info = await self.user_profile_manager.fetch_user_info(username)
+            submissions = await self.user_profile_manager.fetch_user_submissions(
+                username
+            )
+        stats = self.stats.get(username) or LeetCodeUserStats(
+            username=username,
+            easy=0,
+            medium=0,
+            hard=0,
+            current_streak=0,
+            longest_streak=0,
+            last_submission_at=0,
+        )
+        for difficulty, count in parse_solved_counts(info).items():
+            setattr(stats, difficulty, count)
+        apply_accepted_submissions(stats, parse_accepted_timestamps(submissions))
+        stats.updated_at = _utcnow()
+        await self._save_stats(stats)
+        self.stats[username] = stats
+        for guild_id in self.guilds_by_username.get(username, ()):
+            self._rerank(guild_id)
+
+    async def _save_stats(self, stats: LeetCodeUserStats) -> None:
+        values = stats.to_dict()
+        values.pop("id")
+        insert_stmt = sqlite_upsert(LeetCodeUserStats).values(**values)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["username"],
+            set_={key: insert_stmt.excluded[key] for key in values},
+        )
+        async with self.database_manager.session() as db:
+            await db.execute(insert_stmt)
+
+    def get_leaderboard(self, guild_id: int, limit: int) -> Ranking:
+        return self.rankings.get(guild_id, [])[:limit]
+
+    def get_rank(self, guild_id: int, user_id: int) -> Optional[int]:
+        """1-based rank of a member in the guild, or None if they are not ranked."""
+        for rank, (ranked_user_id, _) in enumerate(self.rankings.get(guild_id, []), 1):
+            if ranked_user_id == user_id:
+                return rank
+        return None
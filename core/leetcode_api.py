@@ -1,60 +1,207 @@
-import re
-from typing import Dict, List, Set, Literal, Any
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Set, Literal, Any, Tuple
 
 import aiohttp
-from bs4 import BeautifulSoup
 
-from config.constants import preview_len
+from config.constants import (
+    preview_len,
+    http_connection_limit,
+    http_connection_limit_per_host,
+    http_keepalive_timeout,
+    http_dns_cache_ttl,
+    problem_stream_chunk_size,
+    problem_stream_batch_size,
+    desc_render_workers,
+    problem_dump_cache_dir,
+    problem_dump_cache_compress,
+    api_rate_limit,
+    api_rate_burst,
+    api_request_timeout,
+    api_retries,
+    api_retry_base_delay,
+    api_retry_max_delay,
+    api_breaker_failure_threshold,
+    api_breaker_reset_timeout,
+)
+from core.problem_desc import ProblemDescRenderer
+from core.problem_dump_cache import ProblemDumpCache, ProblemDumpWriter
 from db.problem import Problem, TopicTags
 from models.leetcode import ProblemDifficulity
+from utils.json_stream import JSONArrayStreamDecoder
+from utils.resilience import CircuitBreaker, TokenBucket, jittered_backoff
+from utils.single_flight import SingleFlight
 import logging
 
 
 class FetchError(Exception):
-    pass
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        # HTTP status of the failed response, None if no response was received.
+        self.status = status
+
+
+class ProblemDumpNotModified(Exception):
+    """Raised when the GitHub problem dump has not changed since it was cached."""
+
+
+# Upstream statuses worth retrying; other errors are returned to the caller at once.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 
 class LeetCodeAPI:
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        connection_limit: int = http_connection_limit,
+        connection_limit_per_host: int = http_connection_limit_per_host,
+        keepalive_timeout: float = http_keepalive_timeout,
+        dns_cache_ttl: int = http_dns_cache_ttl,
+        render_workers: int | None = desc_render_workers,
+        cache_dir: str | None = problem_dump_cache_dir,
+        compress_cache: bool = problem_dump_cache_compress,
+        rate_limit: float = api_rate_limit,
+        rate_burst: int = api_rate_burst,
+        request_timeout: float = api_request_timeout,
+        retries: int = api_retries,
+    ) -> None:
         self._base_url = "https://leetcode-api-pied.vercel.app"
         self._github_url = "https://raw.githubusercontent.com/noworneverev/leetcode-api/refs/heads/main/data/leetcode_questions.json"
         self._github_headers = {
             "content-type": "application/json",
         }
+        self._connection_limit = connection_limit
+        self._connection_limit_per_host = connection_limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._session: aiohttp.ClientSession | None = None
+        self._request_timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self._retries = retries
+        self.rate_limiter = TokenBucket(rate=rate_limit, capacity=rate_burst)
+        self.breaker = CircuitBreaker(
+            "LeetCode API",
+            failure_threshold=api_breaker_failure_threshold,
+            reset_timeout=api_breaker_reset_timeout,
+        )
+        self.desc_renderer = ProblemDescRenderer(
+            max_len=preview_len, max_workers=render_workers
+        )
+        self.dump_cache = (
+            ProblemDumpCache(cache_dir, logger=logger, compress=compress_cache)
+            if cache_dir
+            else None
+        )
         self.logger = logger
+        # Concurrent identical requests share one HTTP call and parse.
+        self._inflight: SingleFlight[Tuple[str, int | str], Any] = SingleFlight()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self._connection_limit,
+            limit_per_host=self._connection_limit_per_host,
+            keepalive_timeout=self._keepalive_timeout,
+            ttl_dns_cache=self._dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    async def start(self) -> None:
+        """
+        Creates the pooled HTTP session shared by every request.
+        Call it once from the bot's setup_hook, and pair it with close().
+        """
+        if self._session is not None and not self._session.closed:
+            return
+        self.logger.info("Starting LeetCodeAPI HTTP session...")
+        self._session = self._create_session()
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        self.logger.info("Closing LeetCodeAPI HTTP session...")
+        await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared session, creating it on first use if start() was not called.
+        """
+        if self._session is None or self._session.closed:
+            self.logger.debug("LeetCodeAPI HTTP session not started, creating one.")
+            self._session = self._create_session()
+        return self._session
 
     async def health_check(self) -> str:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=self._base_url) as response:
+        """Pings the API directly, bypassing the breaker, and reports the breaker state."""
+        session = self._get_session()
+        try:
+            async with session.get(
+                url=self._base_url, timeout=self._request_timeout
+            ) as response:
                 self.logger.info(f"LeetCode API Health Check Status: {response.status}")
-                if response.status == 200:
-                    return "LeetCode API is healthy."
-                else:
-                    return "LeetCode API is down."
+                healthy = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"LeetCode API Health Check failed: {e!r}")
+            healthy = False
+        status = "LeetCode API is healthy." if healthy else "LeetCode API is down."
+        return f"{status}\nCircuit breaker: {self.breaker.describe()}."
+
+    async def _get_json(self, url: str, error_message: str) -> Any:
+        """
+        GETs JSON from the API. Requests are rate limited and time out after
+        request_timeout; timeouts, connection errors and RETRYABLE_STATUSES are retried
+        with jittered backoff. A call that still fails counts against the circuit
+        breaker, and while it is open this raises CircuitOpenError without a request.
+        """
+        self.breaker.before_call()
+        try:
+            return await self._get_json_with_retries(url, error_message)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+
+    async def _get_json_with_retries(self, url: str, error_message: str) -> Any:
+        delays = jittered_backoff(api_retry_base_delay, api_retry_max_delay)
+        last_error: Exception | None = None
+        for attempt in range(self._retries + 1):
+            if attempt:
+                await asyncio.sleep(next(delays))
+            await self.rate_limiter.acquire()
+            try:
+                session = self._get_session()
+                async with session.get(
+                    url=url, timeout=self._request_timeout
+                ) as response:
+                    if response.status in RETRYABLE_STATUSES:
+                        last_error = FetchError(
+                            f"{error_message}: {response.status}", response.status
+                        )
+                    else:
+                        try:
+                            data = await self._validate_response(
+                                response, error_message
+                            )
+                        finally:
+                            # Any non-retryable answer means the upstream is up.
+                            self.breaker.record_success()
+                        return data
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+            self.logger.warning(
+                f"{error_message} (attempt {attempt + 1}/{self._retries + 1}): "
+                f"{last_error!r}"
+            )
+        self.breaker.record_failure()
+        raise FetchError(
+            f"{error_message}: {last_error!r}", getattr(last_error, "status", None)
+        ) from last_error
 
     def _parse_problem_desc(self, content: str) -> str:
         """
         Parses the problem description from the LeetCode API response.
         """
         self.logger.debug("Parsing problem description")
-        if not content:
-            return "No description available."
-        soup = BeautifulSoup(content, "html.parser")
-
-        for tag in soup.find_all("sup"):
-            tag.string = f"^{tag.get_text()}"
-        for tag in soup.find_all("code"):
-            tag.string = f"`{tag.get_text()}`"
-        for tag in soup.find_all("em"):
-            tag.string = f"*{tag.get_text()}*"
-        for tag in soup.find_all("strong"):
-            tag.string = f"**{tag.get_text()}**"
-
-        text_only = soup.get_text()
-        problem_md = re.sub(r"\n\s*\n", "\n\n", text_only.strip())[:preview_len]
-        if len(text_only.strip()) > preview_len:
-            problem_md += "..."
-        return problem_md
+        return self.desc_renderer.render(content)
 
     async def parse_daily_problem_response(
         self, response_json: dict
@@ -124,166 +271,297 @@ class LeetCodeAPI:
             self.logger.error("Error parsing single problem response: %s", e)
             raise Exception("Error parsing single problem response") from e
 
+    def _extract_question(self, item: dict) -> dict | None:
+        """
+        Returns the question payload of a GitHub problem dump entry, if any.
+        """
+        problem_data = item.get("data", {})
+        problem_data_question = problem_data.get("question", {})
+        if not problem_data or not problem_data_question:
+            return None
+        return problem_data_question
+
+    def _build_problem(
+        self, problem_data_question: dict, description: str
+    ) -> Tuple[Problem, Set[TopicTags]]:
+        """
+        Builds the Problem and its tags from a dump question with an already rendered description.
+        """
+        try:
+            problem = Problem(
+                title=problem_data_question.get("title", ""),
+                problem_id=int(problem_data_question.get("questionId", 0)),
+                problem_frontend_id=int(
+                    problem_data_question.get("questionFrontendId", 0)
+                ),
+                url=problem_data_question.get("url", ""),
+                difficulty=ProblemDifficulity.from_str_repr(
+                    problem_data_question.get("difficulty", "")
+                ).db_repr,
+                description=description,
+                premium=problem_data_question.get("isPaidOnly", False),
+            )
+            problem_tags: List[dict] = problem_data_question.get("topicTags", [])
+            cur_tags: Set[TopicTags] = set()
+            for tag in problem_tags:
+                cur_tags.add(TopicTags(tag_name=tag.get("name", "")))
+            return problem, cur_tags
+
+        except ValueError:
+            self.logger.error(
+                "Invalid difficulty value for problem ID %s",
+                problem_data_question.get("questionId", 0),
+            )
+            raise Exception("Invalid difficulty value")
+        except Exception as e:
+            self.logger.error(
+                "Error parsing problem ID %s: %s",
+                problem_data_question.get("questionId", 0),
+                e,
+            )
+            raise Exception("Error parsing all problem response") from e
+
+    async def _parse_problem_batch(
+        self, items: List[dict]
+    ) -> List[Tuple[Problem, Set[TopicTags]]]:
+        """
+        Parses a batch of dump entries. The HTML descriptions, which dominate the cost,
+        are rendered by the description renderer off the event loop.
+        """
+        questions = [q for q in map(self._extract_question, items) if q]
+        descriptions = await self.desc_renderer.render_many(
+            [q.get("content", "") for q in questions]
+        )
+        return [
+            self._build_problem(question, description)
+            for question, description in zip(questions, descriptions)
+        ]
+
     async def parse_all_problem_response(
-        self, response_json: dict
+        self, response_json: List[dict]
     ) -> Dict[int, Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]]:
         """
         Parses the problem response from the LeetCode API and returns a mapping of problem IDs to a dictionary.
         The dictionary contains the Problem object and its set of TopicTags, with key being the problem_id.
-        Very Expensive!
+        Very Expensive! Prefer iter_all_problems for the full dump.
         """
+        self.logger.info("Parsing all problem responses")
         result: Dict[
             int, Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]
         ] = {}
-        tags: Set[TopicTags] = set()
-        # self.logger.debug("All Problems Response: %s", response_json)
-        self.logger.info("Parsing all problem responses")
-        for item in response_json:
-            problem_data = item.get("data", {})
-            problem_data_question = problem_data.get("question", {})
-            if not problem_data or not problem_data_question:
-                continue
-            try:
-                problem = Problem(
-                    title=problem_data_question.get("title", ""),
-                    problem_id=int(problem_data_question.get("questionId", 0)),
-                    problem_frontend_id=int(
-                        problem_data_question.get("questionFrontendId", 0)
-                    ),
-                    url=problem_data_question.get("url", ""),
-                    difficulty=ProblemDifficulity.from_str_repr(
-                        problem_data_question.get("difficulty", "")
-                    ).db_repr,
-                    description=self._parse_problem_desc(
-                        problem_data_question.get("content", "")
-                    ),
-                    premium=problem_data_question.get("isPaidOnly", False),
-                )
-                if problem_data_question.get("isPaidOnly"):
-                    self.logger.debug(problem_data_question.get("isPaidOnly", False))
-                    self.logger.debug(f"Problem is paid only? {problem.premium}")
-                problem_tags: List[dict] = problem_data_question.get("topicTags", [])
-                cur_tags: Set[TopicTags] = set()
-                for tag in problem_tags:
-                    tag_obj = TopicTags(tag_name=tag.get("name", ""))
-                    tags.add(tag_obj)
-                    cur_tags.add(tag_obj)
-                result[problem.problem_frontend_id] = {
-                    "problem": problem,
-                    "tags": cur_tags,
-                }
-
-            except ValueError:
-                self.logger.error(
-                    "Invalid difficulty value for problem ID %s",
-                    problem_data_question.get("questionId", 0),
-                )
-                raise Exception("Invalid difficulty value")
-            except Exception as e:
-                self.logger.error(
-                    "Error parsing problem ID %s: %s",
-                    problem_data_question.get("questionId", 0),
-                    e,
-                )
-                raise Exception("Error parsing all problem response") from e
+        for problem, tags in await self._parse_problem_batch(response_json):
+            result[problem.problem_frontend_id] = {"problem": problem, "tags": tags}
         self.logger.debug("Parsed All Problems: %s", result)
         return result
 
-    async def _validate_response(
+    def _check_status(
         self, response: aiohttp.ClientResponse, error_message: str
-    ) -> dict:
-        if response.status == 200:
-            self.logger.debug("Response validated successfully")
-            return await response.json(content_type=None)
-        else:
+    ) -> None:
+        if response.status != 200:
             self.logger.error(
                 "%s: Received status code %s", error_message, response.status
             )
-            raise FetchError(f"{error_message}: {response.status}")
+            raise FetchError(f"{error_message}: {response.status}", response.status)
 
-    async def fetch_all_problems(
+    async def _validate_response(
+        self, response: aiohttp.ClientResponse, error_message: str
+    ) -> dict:
+        self._check_status(response, error_message)
+        self.logger.debug("Response validated successfully")
+        return await response.json(content_type=None)
+
+    async def _iter_dump_chunks(
+        self, force: bool, pending_dumps: List[ProblemDumpWriter]
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the raw bytes of the problem dump.
+        With a disk cache, the request is conditional: a 304 raises ProblemDumpNotModified,
+        unless force is set, in which case the cached copy is read back instead.
+        A 200 response is written through to a temporary file while it is being streamed;
+        its writer is appended to pending_dumps, uncommitted.
+        """
+        headers = dict(self._github_headers)
+        if self.dump_cache:
+            headers.update(self.dump_cache.conditional_headers())
+        session = self._get_session()
+        async with session.get(headers=headers, url=self._github_url) as response:
+            if response.status == 304 and self.dump_cache:
+                if not force:
+                    self.logger.info("Problem dump not modified since last refresh.")
+                    raise ProblemDumpNotModified()
+                self.logger.info("Problem dump not modified, reading cached copy.")
+                async for chunk in self.dump_cache.iter_chunks(
+                    problem_stream_chunk_size
+                ):
+                    yield chunk
+                return
+            self._check_status(response, "Failed to fetch all problems")
+            writer = self.dump_cache.open_writer() if self.dump_cache else None
+            try:
+                async for chunk in response.content.iter_chunked(
+                    problem_stream_chunk_size
+                ):
+                    if writer:
+                        await writer.write(chunk)
+                    yield chunk
+            except BaseException:
+                if writer:
+                    await writer.abort()
+                raise
+            if writer:
+                await writer.finish(
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+                pending_dumps.append(writer)
+
+    async def iter_all_problems(
         self,
+        batch_size: int = problem_stream_batch_size,
+        force: bool = False,
+        pending_dumps: List[ProblemDumpWriter] | None = None,
+    ) -> AsyncIterator[List[Tuple[Problem, Set[TopicTags]]]]:
+        """
+        Streams the full problem dump from GitHub and yields parsed (Problem, tags) batches.
+        Items are decoded as bytes arrive, and the HTML-to-markdown conversion runs in
+        worker processes so the event loop (and the gateway heartbeat) keeps running.
+        Raises ProblemDumpNotModified if the dump did not change since it was last cached,
+        unless force is set.
+        A downloaded dump is cached once every batch was consumed. If pending_dumps is
+        given, its writer is appended there instead, and the caller commits it once the
+        problems were applied (or aborts it), so a failed refresh is not skipped as
+        unmodified the next time.
+        """
+        self.logger.info("Streaming all problems from GitHub")
+        decoder = JSONArrayStreamDecoder()
+        pending: List[dict] = []
+        total = 0
+        owned = pending_dumps is None
+        writers: List[ProblemDumpWriter] = (
+            [] if pending_dumps is None else pending_dumps
+        )
+        self.desc_renderer.start_pool()
+        try:
+            async for chunk in self._iter_dump_chunks(force, writers):
+                pending.extend(decoder.feed(chunk))
+                while len(pending) >= batch_size:
+                    items, pending = pending[:batch_size], pending[batch_size:]
+                    batch = await self._parse_problem_batch(items)
+                    total += len(batch)
+                    yield batch
+            pending.extend(decoder.close())
+            if pending:
+                batch = await self._parse_problem_batch(pending)
+                total += len(batch)
+                yield batch
+            if owned:
+                for writer in writers:
+                    await writer.commit()
+        except BaseException:
+            if owned:
+                for writer in writers:
+                    await writer.abort()
+            raise
+        finally:
+            self.desc_renderer.shutdown_pool()
+        self.logger.info(f"Streamed {total} problems successfully")
+
+    async def fetch_all_problems(
+        self, force: bool = True
     ) -> Dict[int, Dict[Literal["problem", "tags"], Any]]:
         self.logger.info("Fetching all problems from GitHub")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                headers=self._github_headers, url=self._github_url
-            ) as response:
-                validated_response_json = await self._validate_response(
-                    response, "Failed to fetch all problems"
-                )
-                self.logger.info("Fetched all problems successfully")
-                self.logger.debug("All Problems JSON: %s", validated_response_json)
-                return await self.parse_all_problem_response(validated_response_json)
+        result: Dict[int, Dict[Literal["problem", "tags"], Any]] = {}
+        async for batch in self.iter_all_problems(force=force):
+            for problem, tags in batch:
+                result[problem.problem_frontend_id] = {
+                    "problem": problem,
+                    "tags": tags,
+                }
+        self.logger.info("Fetched all problems successfully")
+        return result
 
     async def fetch_problem_by_id(
         self, id: int
+    ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]:
+        return await self._inflight.do(
+            ("problem", id), lambda: self._fetch_problem_by_id(id)
+        )
+
+    async def _fetch_problem_by_id(
+        self, id: int
     ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]:
         self.logger.info(f"Fetching problem with ID {id}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=f"{self._base_url}/problem/{id}") as response:
-                validated_response_json = await self._validate_response(
-                    response, f"Failed to fetch problem with ID {id}"
-                )
-                self.logger.info(f"Fetched problem with ID {id} successfully")
-                self.logger.debug(
-                    f"Problem with ID {id} JSON: %s", validated_response_json
-                )
-                return await self.parse_single_problem_response(validated_response_json)
+        validated_response_json = await self._get_json(
+            f"{self._base_url}/problem/{id}", f"Failed to fetch problem with ID {id}"
+        )
+        self.logger.info(f"Fetched problem with ID {id} successfully")
+        self.logger.debug(f"Problem with ID {id} JSON: %s", validated_response_json)
+        return await self.parse_single_problem_response(validated_response_json)
 
     async def fetch_problem_by_slug(
         self, slug: str
+    ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]:
+        return await self._inflight.do(
+            ("slug", slug), lambda: self._fetch_problem_by_slug(slug)
+        )
+
+    async def _fetch_problem_by_slug(
+        self, slug: str
     ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]:
         self.logger.info(f"Fetching problem with slug {slug}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=f"{self._base_url}/problem/{slug}") as response:
-                validated_response_json = await self._validate_response(
-                    response, f"Failed to fetch problem with slug {slug}"
-                )
-                self.logger.info(f"Fetched problem with slug {slug} successfully")
-                self.logger.debug(
-                    f"Problem with slug {slug} JSON: %s", validated_response_json
-                )
-                return await self.parse_single_problem_response(validated_response_json)
+        validated_response_json = await self._get_json(
+            f"{self._base_url}/problem/{slug}",
+            f"Failed to fetch problem with slug {slug}",
+        )
+        self.logger.info(f"Fetched problem with slug {slug} successfully")
+        self.logger.debug(f"Problem with slug {slug} JSON: %s", validated_response_json)
+        return await self.parse_single_problem_response(validated_response_json)
 
     async def fetch_daily(
         self,
     ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]:
-        self.logger.info("Fetching daily problem")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=f"{self._base_url}/daily") as response:
-                validated_response_json = await self._validate_response(
-                    response, "Failed to fetch daily problem"
-                )
-                self.logger.info("Fetched daily problem successfully")
-                self.logger.debug("Daily Problem JSON: %s", validated_response_json)
-                return await self.parse_daily_problem_response(validated_response_json)
+        return await self._inflight.do(
+            ("daily", datetime.now(timezone.utc).date().isoformat()), self._fetch_daily
+        )
 
-    async def search_problem(self, qry: str):
-        pass
+    async def _fetch_daily(
+        self,
+    ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]:
+        self.logger.info("Fetching daily problem")
+        validated_response_json = await self._get_json(
+            f"{self._base_url}/daily", "Failed to fetch daily problem"
+        )
+        self.logger.info("Fetched daily problem successfully")
+        self.logger.debug("Daily Problem JSON: %s", validated_response_json)
+        return await self.parse_daily_problem_response(validated_response_json)
 
     async def user_info(self, username: str) -> dict:
+        return await self._inflight.do(
+            ("user", username.casefold()), lambda: self._user_info(username)
+        )
+
+    async def _user_info(self, username: str) -> dict:
         self.logger.info(f"Fetching user info for username {username}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=f"{self._base_url}/user/{username}") as response:
-                self.logger.info(
-                    f"Fetched user info for username {username} successfully"
-                )
-                return await self._validate_response(
-                    response,
-                    f"Failed to fetch user info with username {username}",
-                )
+        user_info = await self._get_json(
+            f"{self._base_url}/user/{username}",
+            f"Failed to fetch user info with username {username}",
+        )
+        self.logger.info(f"Fetched user info for username {username} successfully")
+        return user_info
 
     async def user_submission(self, username: str) -> dict:
+        return await self._inflight.do(
+            ("submissions", username.casefold()),
+            lambda: self._user_submission(username),
+        )
+
+    async def _user_submission(self, username: str) -> dict:
         self.logger.info(f"Fetching user submissions for username {username}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url=f"{self._base_url}/user/{username}/submissions"
-            ) as response:
-                self.logger.info(
-                    f"Fetched user submissions for username {username} successfully"
-                )
-                return await self._validate_response(
-                    response,
-                    f"Failed to fetch user submissions with username {username}",
-                )
+        submissions = await self._get_json(
+            f"{self._base_url}/user/{username}/submissions",
+            f"Failed to fetch user submissions with username {username}",
+        )
+        self.logger.info(
+            f"Fetched user submissions for username {username} successfully"
+        )
+        return submissions
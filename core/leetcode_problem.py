@@ -1,19 +1,56 @@
+import asyncio
 import logging
-import random
+import math
+from datetime import date, datetime, time, timezone
 
 from discord import Client, Embed
 from discord.ext.commands import Bot
-from core.leetcode_api import LeetCodeAPI
+from core.autocomplete import ProblemAutocomplete
+from core.catalog_snapshot import CatalogSnapshot, catalog_fingerprint
+from core.leetcode_api import LeetCodeAPI, ProblemDumpNotModified
+from core.problem_catalog import ProblemCatalog, ProblemRecord, TagRecord
+from core.problem_dump_cache import ProblemDumpWriter
+from core.problem_index import ProblemSamplingIndex
+from core.search_index import ProblemSearchIndex
 from db.database_manager import DatabaseManager
 from db.problem import Problem, TopicTags, problem_tags_association
-from typing import Dict, Literal, Optional, Set, Sequence
-from sqlalchemy import select
+from typing import (
+    AbstractSet,
+    Container,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Set,
+    Sequence,
+    Tuple,
+)
+from sqlalchemy import bindparam, inspect, select
 from discord.ext import tasks
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
 
+from config.constants import (
+    daily_prefetch_retries,
+    daily_prefetch_retry_delay,
+    problem_desc_cache_size,
+)
 from models.leetcode import ProblemDifficulity
 from utils.embed_presenters import get_problem_desc_embed
+from utils.single_flight import SingleFlight
+from utils.ttl_cache import TTLCache
+
+
+def _build_text_indexes(
+    records: Sequence[ProblemRecord],
+) -> Tuple[ProblemSearchIndex, ProblemAutocomplete]:
+    """Builds fresh search and autocomplete indexes; runs in a worker thread."""
+    search_index = ProblemSearchIndex()
+    search_index.rebuild(records)
+    autocomplete = ProblemAutocomplete()
+    autocomplete.rebuild(records)
+    return search_index, autocomplete
 
 
 class ProblemNotFound(Exception):
@@ -26,12 +63,47 @@ class LeetCodeProblemManager:
         leetcode_api: LeetCodeAPI,
         database_manager: DatabaseManager,
         logger: logging.Logger,
+        snapshot_path: str | None = None,
     ) -> None:
-        self.all_problem_cache: Dict[int, Problem] = dict()
-        self.free_problem_cache: Dict[int, Problem] = dict()
+        # Read-only records; ORM objects are only used to write problems.
+        self.catalog = ProblemCatalog()
+        self.problem_index = ProblemSamplingIndex()
+        self.search_index = ProblemSearchIndex()
+        self.autocomplete = ProblemAutocomplete()
+        # The search and autocomplete indexes are built on first use, not at boot.
+        self._text_indexes_built = False
+        self._index_build: Optional[asyncio.Future] = None
+        # Bumped whenever the whole catalog is replaced.
+        self._catalog_generation = 0
+        # Frontend ids cached or uncached while the indexes are being built.
+        self._index_changes: Optional[Set[int]] = None
+        # Descriptions stay in the database; recently shown ones are kept here.
+        self.descriptions: TTLCache[int, str] = TTLCache(
+            "problem_descriptions", problem_desc_cache_size, ttl=math.inf
+        )
+        # Only the latest entry is kept; it is served as a fallback when LeetCode is down.
+        self.daily_problem_cache: Dict[date, ProblemRecord] = dict()
         self.leetcode_api: LeetCodeAPI = leetcode_api
         self.database_manager: DatabaseManager = database_manager
         self.logger: logging.Logger = logger
+        self.snapshot = (
+            CatalogSnapshot(snapshot_path, logger) if snapshot_path else None
+        )
+        # Refreshes diff against the database, so overlapping runs must not interleave.
+        self._refresh_lock = asyncio.Lock()
+        # Concurrent misses for the same problem (or daily date) share one load.
+        self._inflight: SingleFlight[Tuple[str, int | date], ProblemRecord] = (
+            SingleFlight()
+        )
+        self._inflight_descriptions: SingleFlight[int, str] = SingleFlight()
+
+    @property
+    def all_problem_cache(self) -> Mapping[int, ProblemRecord]:
+        return self.catalog
+
+    @property
+    def free_problem_cache(self) -> Mapping[int, ProblemRecord]:
+        return self.catalog.free
 
     @tasks.loop(hours=24 * 7, name="weekly_cache_refresh")
     async def weekly_cache_refresh(self) -> None:
@@ -39,8 +111,51 @@ class LeetCodeProblemManager:
         await self.refresh_cache()
         self.logger.info("LeetCode problems cache refreshed.")
 
+    @tasks.loop(time=time(hour=0, minute=1, tzinfo=timezone.utc), name="daily_prefetch")
+    async def daily_prefetch(self) -> None:
+        """
+        Resolves the new daily problem right after the 00:00 UTC rollover, so /daily is
+        answered from memory. Retries while LeetCode still serves the previous day's problem.
+        """
+        for attempt in range(1, daily_prefetch_retries + 1):
+            previous = self._latest_daily_problem()
+            try:
+                today = self._utc_today()
+                problem = await self._resolve_daily_problem(today)
+                if (
+                    previous is None
+                    or previous[0] == today
+                    or problem.problem_id != previous[1].problem_id
+                ):
+                    self.logger.info(
+                        f"Prefetched daily problem {problem.problem_frontend_id} for {today}."
+                    )
+                    return
+                self.logger.info("LeetCode still serves yesterday's daily problem.")
+                self.daily_problem_cache = {previous[0]: previous[1]}
+            except Exception as e:
+                self.logger.warning(
+                    f"Daily problem prefetch attempt {attempt} failed", exc_info=e
+                )
+            await asyncio.sleep(daily_prefetch_retry_delay)
+        self.logger.error("Giving up prefetching the daily problem.")
+
+    @staticmethod
+    def _utc_today() -> date:
+        return datetime.now(timezone.utc).date()
+
+    def _latest_daily_problem(self) -> Tuple[date, ProblemRecord] | None:
+        if not self.daily_problem_cache:
+            return None
+        day = max(self.daily_problem_cache)
+        problem = self.daily_problem_cache[day]
+        # Prefer the cached instance, which refresh_cache keeps up to date.
+        return day, self.all_problem_cache.get(problem.problem_frontend_id, problem)
+
     async def _bulk_upsert_problems(self, api_problems: Dict[int, Problem]) -> None:
-        with self.database_manager as db:
+        if not api_problems:
+            return
+        async with self.database_manager.session() as db:
             self.logger.info(
                 f"Upserting {len(api_problems)} problems into the database."
             )
@@ -56,149 +171,325 @@ class LeetCodeProblemManager:
                     "description": insert_stmt.excluded.description,
                     "problem_frontend_id": insert_stmt.excluded.problem_frontend_id,
                     "premium": insert_stmt.excluded.premium,
+                    "content_hash": insert_stmt.excluded.content_hash,
                 },
             )
-            db.execute(insert_stmt, mappings)
+            await db.execute(insert_stmt, mappings)
             self.logger.info("Bulk upsert of problems completed.")
 
     async def _bulk_upsert_topic_tags(self, topic_tags: Set[TopicTags]) -> None:
-        with self.database_manager as db:
+        if not topic_tags:
+            return
+        async with self.database_manager.session() as db:
             self.logger.info(
                 f"Upserting {len(topic_tags)} topic tags into the database."
             )
             insert_stmt = sqlite_upsert(TopicTags)
-            mappings = [tag.to_dict() for tag in topic_tags]
+            mappings = [
+                tag.to_dict() for tag in sorted(topic_tags, key=lambda t: t.tag_name)
+            ]
             self.logger.debug(f"Topic tag mappings: {mappings[:2]} ...")
             insert_stmt = insert_stmt.on_conflict_do_nothing(
                 index_elements=["tag_name"],
             )
-            db.execute(insert_stmt, mappings)
+            await db.execute(insert_stmt, mappings)
             self.logger.info("Bulk upsert of topic tags completed.")
 
-    async def _create_problem_tag_associations(
-        self,
-        all_api_problems_data: Dict[
-            int, Dict[Literal["problem", "tags"], Problem | Set[TopicTags]]
-        ],
-    ) -> None:
-        """Correctly creates associations based on the API data."""
-        with self.database_manager as db:
-            self.logger.info("Creating problem-tag associations.")
-            db_problems = {p.problem_frontend_id: p.id for p in db.query(Problem).all()}
-            db_tags = {t.tag_name: t.id for t in db.query(TopicTags).all()}
-            self.logger.debug(f"DB Problems: {list(db_problems.items())[:2]} ...")
-            self.logger.debug(f"DB Tags: {list(db_tags.items())[:2]} ...")
-            associations = []
-            for data in all_api_problems_data.values():
-                assert isinstance(data["problem"], Problem)
-                problem_db_id = db_problems[int(data["problem"].problem_frontend_id)]
+    async def _get_problem_hashes_from_db(self) -> Dict[int, Tuple[int, str | None]]:
+        """
+        Returns a mapping of LeetCode problem_id to (database id, content hash).
+        Only reads the narrow columns needed for change detection.
+        """
+        async with self.database_manager.session() as db:
+            stmt = select(Problem.problem_id, Problem.id, Problem.content_hash)
+            return {
+                problem_id: (db_id, content_hash)
+                for problem_id, db_id, content_hash in (await db.execute(stmt)).all()
+            }
+
+    async def _sync_problem_tag_associations(
+        self, all_problem_tags: Dict[int, Set[TopicTags]]
+    ) -> Set[int]:
+        """
+        Brings problem-tag associations in line with the API data, keyed by problem_id.
+        Only missing links are inserted and stale links deleted; problems that are not
+        in the API data keep their links. Returns the database ids of touched problems.
+        """
+        async with self.database_manager.session() as db:
+            db_problems = dict(
+                (await db.execute(select(Problem.problem_id, Problem.id))).all()
+            )
+            db_tags = dict(
+                (await db.execute(select(TopicTags.tag_name, TopicTags.id))).all()
+            )
+            desired: Set[Tuple[int, int]] = set()
+            for problem_id, tags in all_problem_tags.items():
+                problem_db_id = db_problems.get(problem_id)
                 if not problem_db_id:
-                    raise Exception(
-                        f"Problem ID {data['problem'].problem_frontend_id} not found in DB."
-                    )
-                assert isinstance(data["tags"], set)
-                for tag in data["tags"]:
+                    raise Exception(f"Problem ID {problem_id} not found in DB.")
+                for tag in tags:
                     tag_db_id = db_tags.get(tag.tag_name)
                     if not tag_db_id:
                         raise Exception(f"Tag {tag.tag_name} not found in DB.")
-
-                    associations.append(
-                        {"problem_id": problem_db_id, "tag_id": tag_db_id}
+                    desired.add((problem_db_id, tag_db_id))
+
+            synced_problem_db_ids = {db_problems[pid] for pid in all_problem_tags}
+            existing: Set[Tuple[int, int]] = {
+                (problem_db_id, tag_db_id)
+                for problem_db_id, tag_db_id in (
+                    await db.execute(
+                        select(
+                            problem_tags_association.c.problem_id,
+                            problem_tags_association.c.tag_id,
+                        )
                     )
-            self.logger.debug(f"Problem-Tag Associations: {associations[:2]} ...")
-            if associations:
-                # First, clear all existing associations to ensure a clean slate
-                db.execute(problem_tags_association.delete())
-
-                # Use the imported problem_tags_association Table object
+                ).all()
+                if problem_db_id in synced_problem_db_ids
+            }
+            to_insert = sorted(desired - existing)
+            to_delete = sorted(existing - desired)
+            self.logger.info(
+                f"Problem-tag associations: {len(to_insert)} to add, {len(to_delete)} to remove."
+            )
+            if to_delete:
+                await db.execute(
+                    problem_tags_association.delete().where(
+                        problem_tags_association.c.problem_id
+                        == bindparam("b_problem_id"),
+                        problem_tags_association.c.tag_id == bindparam("b_tag_id"),
+                    ),
+                    [
+                        {"b_problem_id": problem_db_id, "b_tag_id": tag_db_id}
+                        for problem_db_id, tag_db_id in to_delete
+                    ],
+                )
+            if to_insert:
                 insert_stmt = sqlite_upsert(
                     problem_tags_association
                 ).on_conflict_do_nothing(index_elements=["problem_id", "tag_id"])
-                db.execute(insert_stmt, associations)
-            self.logger.info("Problem-tag associations created.")
-            db.commit()
+                await db.execute(
+                    insert_stmt,
+                    [
+                        {"problem_id": problem_db_id, "tag_id": tag_db_id}
+                        for problem_db_id, tag_db_id in to_insert
+                    ],
+                )
+            return {problem_db_id for problem_db_id, _ in to_insert + to_delete}
+
+    def _cache_problem(self, problem: Problem) -> ProblemRecord:
+        """Stores a read-only record of a problem in the caches and indexes."""
+        record = ProblemRecord.from_orm(problem)
+        previous = self.catalog.get(record.problem_frontend_id)
+        self.catalog.put(record)
+        if "description" not in inspect(problem).unloaded:
+            self.descriptions.set(record.problem_frontend_id, problem.description or "")
+        elif (
+            previous is None
+            or record.content_hash is None
+            or previous.content_hash != record.content_hash
+        ):
+            # The content hash covers the description, so an unchanged one stays.
+            self.descriptions.invalidate(record.problem_frontend_id)
+        self.problem_index.add(record)
+        if self._text_indexes_built:
+            self.search_index.add(record)
+            self.autocomplete.add(record)
+        elif self._index_changes is not None:
+            self._index_changes.add(record.problem_frontend_id)
+        return record
+
+    def _uncache_problem(self, problem_frontend_id: int) -> None:
+        self.catalog.remove(problem_frontend_id)
+        self.descriptions.invalidate(problem_frontend_id)
+        self.problem_index.remove(problem_frontend_id)
+        if self._text_indexes_built:
+            self.search_index.remove(problem_frontend_id)
+            self.autocomplete.remove(problem_frontend_id)
+        elif self._index_changes is not None:
+            self._index_changes.add(problem_frontend_id)
+
+    async def _patch_cache(self, problem_db_ids: Set[int]) -> None:
+        """
+        Reloads only the given problems from the database into the caches.
+        """
+        if not problem_db_ids:
+            return
+        stale_frontend_ids = {
+            frontend_id
+            for frontend_id, problem in self.all_problem_cache.items()
+            if problem.id in problem_db_ids
+        }
+        ids = sorted(problem_db_ids)
+        async with self.database_manager.session() as db:
+            for i in range(0, len(ids), 500):
+                stmt = (
+                    select(Problem)
+                    .where(Problem.id.in_(ids[i : i + 500]))
+                    .options(selectinload(Problem.tags), defer(Problem.description))
+                )
+                for problem in (await db.execute(stmt)).scalars().all():
+                    stale_frontend_ids.discard(problem.problem_frontend_id)
+                    self._cache_problem(problem)
+        # A problem whose frontend id changed leaves its old key behind.
+        for frontend_id in stale_frontend_ids:
+            self._uncache_problem(frontend_id)
 
     async def init_cache(self):
         """
-        Initializes the problem cache from the local database.
-        Very Expensive! Use it only once at startup.
+        Initializes the problem cache from the snapshot, or from the local database
+        if the snapshot is missing or stale.
+        Expensive without a snapshot! Use it only once at startup.
         """
         try:
-            problems = await self.get_problems_from_db()
-            self.logger.info(
-                "Initializing problem cache with %d problems.", len(problems)
-            )
-            self.all_problem_cache = {
-                problem.problem_frontend_id: problem for problem in problems
-            }
-            self.free_problem_cache = {
-                problem.problem_frontend_id: problem
-                for problem in problems
-                if not problem.premium
-            }
+            records = None
+            if self.snapshot:
+                records = self.snapshot.load(await self._get_catalog_fingerprint())
+            if records is None:
+                problems = await self.get_problems_from_db()
+                self.logger.info(
+                    "Initializing problem cache with %d problems.", len(problems)
+                )
+                records = [ProblemRecord.from_orm(problem) for problem in problems]
+                self._save_snapshot(records)
+            else:
+                self.logger.info(
+                    "Initializing problem cache with %d problems from the snapshot.",
+                    len(records),
+                )
+            self.catalog.replace_all(records)
+            self.problem_index.rebuild(records)
+            self._catalog_generation += 1
+            self._text_indexes_built = False
         except Exception as e:
             self.logger.error("Error initializing cache", exc_info=e)
             raise Exception(f"Failed to initialize cache: {e}")
 
-    async def refresh_cache(self):
+    async def _get_catalog_fingerprint(self) -> bytes:
+        async with self.database_manager.session() as db:
+            rows = (await db.execute(select(Problem.id, Problem.content_hash))).all()
+        return catalog_fingerprint((row[0], row[1]) for row in rows)
+
+    def _save_snapshot(self, records: Sequence[ProblemRecord]) -> None:
+        if not self.snapshot:
+            return
+        try:
+            self.snapshot.save(records)
+        except OSError as e:
+            self.logger.warning("Failed to write the problem snapshot", exc_info=e)
+
+    async def refresh_cache(self, force: bool = False):
         """
-        Fetches all problems from LeetCode and updates the local database and cache.
-        Expensive! Use it once a day or less frequently.
+        Fetches all problems from LeetCode and applies the changes to the local database and cache.
+        Problems are compared by content hash, so only added or changed problems and tag links are
+        written and reloaded. Problems missing from the dump are kept, as they may have been fetched
+        individually and may already have threads.
+        Returns early if the dump did not change since the last refresh, unless force is set or
+        the cache is empty.
+        Expensive! Use it once a day or less frequently. Concurrent calls run one at a time.
         """
+        async with self._refresh_lock:
+            await self._refresh_cache(force)
+
+    async def _refresh_cache(self, force: bool) -> None:
         self.logger.info("Refreshing problem cache from LeetCode API.")
+        force = force or not self.all_problem_cache
+        # The downloaded dump, and with it the validators sent on the next refresh,
+        # is only cached once its changes are in the database.
+        pending_dumps: List[ProblemDumpWriter] = []
         try:
             self.logger.info("Fetching all problems from LeetCode API...")
-            api_problems = await self.leetcode_api.fetch_all_problems()
-            all_problems: Dict[int, Problem] = {
-                problem_frontend_id: problem["problem"]
-                for problem_frontend_id, problem in api_problems.items()
+            api_problems: Dict[int, Problem] = {}
+            all_problem_tags: Dict[int, Set[TopicTags]] = {}
+            async for batch in self.leetcode_api.iter_all_problems(
+                force=force, pending_dumps=pending_dumps
+            ):
+                for problem, tags in batch:
+                    problem.content_hash = problem.compute_content_hash(
+                        tag.tag_name for tag in tags
+                    )
+                    api_problems[problem.problem_id] = problem
+                    all_problem_tags[problem.problem_id] = tags
+            self.logger.info(f"Fetched {len(api_problems)} problems from LeetCode API.")
+
+            db_hashes = await self._get_problem_hashes_from_db()
+            added = {
+                problem_id: problem
+                for problem_id, problem in api_problems.items()
+                if problem_id not in db_hashes
             }
-            all_problem_tags: Dict[int, Set[TopicTags]] = {
-                problem_frontend_id: problem["tags"]
-                for problem_frontend_id, problem in api_problems.items()
+            changed = {
+                problem_id: problem
+                for problem_id, problem in api_problems.items()
+                if problem_id in db_hashes
+                and db_hashes[problem_id][1] != problem.content_hash
             }
-            self.logger.info(f"Fetched {len(all_problems)} problems from LeetCode API.")
-            await self._bulk_upsert_problems(all_problems)
-            all_topic_tags: Set[TopicTags] = set()
-            for tags in all_problem_tags.values():
-                all_topic_tags.update(tags)
-            self.logger.debug(
-                f"All Topic Tags: {[tag.tag_name for tag in list(all_topic_tags)[:5]]} ..."
+            removed = set(db_hashes) - set(api_problems)
+            self.logger.info(
+                f"Refresh diff: {len(added)} added, {len(changed)} changed, "
+                f"{len(removed)} not in the dump (kept)."
             )
-            await self._bulk_upsert_topic_tags(all_topic_tags)
-            await self._create_problem_tag_associations(api_problems)
-            problems = await self.get_problems_from_db()
-            self.logger.info("Rebuilding problem cache...")
-            for problem in problems:
-                self.all_problem_cache[problem.problem_frontend_id] = problem
-                if not problem.premium:
-                    self.free_problem_cache[problem.problem_frontend_id] = problem
+
+            await self._bulk_upsert_problems({**added, **changed})
+            known_tag_names = {
+                topic.tag_name
+                for topic in (await self.get_all_topics_from_db()).values()
+            }
+            new_topic_tags: Dict[str, TopicTags] = {}
+            for problem_id in {**added, **changed}:
+                for tag in all_problem_tags[problem_id]:
+                    if tag.tag_name not in known_tag_names:
+                        new_topic_tags.setdefault(tag.tag_name, tag)
+            await self._bulk_upsert_topic_tags(set(new_topic_tags.values()))
+            touched = await self._sync_problem_tag_associations(all_problem_tags)
+
+            db_hashes = await self._get_problem_hashes_from_db()
+            touched.update(db_hashes[problem_id][0] for problem_id in added)
+            touched.update(db_hashes[problem_id][0] for problem_id in changed)
+            cached_problem_ids = {
+                problem.problem_id for problem in self.all_problem_cache.values()
+            }
+            touched.update(
+                db_hashes[problem_id][0]
+                for problem_id in api_problems
+                if problem_id not in cached_problem_ids
+            )
+            self.logger.info(f"Patching {len(touched)} problems in the cache...")
+            await self._patch_cache(touched)
+            for writer in pending_dumps:
+                await writer.commit()
+            self._save_snapshot(list(self.catalog.values()))
             self.logger.info("Problem cache refresh completed.")
+        except ProblemDumpNotModified:
+            self.logger.info("Problem dump unchanged, skipping refresh.")
         except Exception as e:
+            for writer in pending_dumps:
+                await writer.abort()
             self.logger.error("Error refreshing cache", exc_info=e)
             raise Exception(e)
 
     async def get_problems_from_db(self) -> Sequence[Problem]:
-        with self.database_manager as db:
+        async with self.database_manager.session() as db:
             self.logger.info("Fetching all problems from the database.")
-            stmt = select(Problem).options(selectinload(Problem.tags))
-            results = db.execute(stmt).scalars().all()
+            stmt = select(Problem).options(
+                selectinload(Problem.tags), defer(Problem.description)
+            )
+            results = (await db.execute(stmt)).scalars().all()
             return results
 
     async def get_all_topics_from_db(self) -> Dict[int, TopicTags]:
-        with self.database_manager as db:
+        async with self.database_manager.session() as db:
             stmt = select(TopicTags)
             self.logger.info("Fetching all topic tags from the database.")
-            all_topics = db.execute(stmt).scalars().all()
+            all_topics = (await db.execute(stmt)).scalars().all()
             return {topic.id: topic for topic in all_topics}
 
     async def get_problem_from_db(
         self,
         problem_frontend_id: Optional[int] = None,
         problem_db_id: Optional[int] = None,
-    ) -> Problem | None:
+    ) -> ProblemRecord | None:
         """
-        Retrieves problem from database. Provide exactly one of the front end id or the backend id for the problem.
+        Retrieves problem from database and caches it. Provide exactly one of the front end id or the backend id for the problem.
         """
         if problem_frontend_id and problem_db_id:
             raise Exception(
@@ -220,95 +511,154 @@ class LeetCodeProblemManager:
                 f"Fetching problem with database ID {problem_db_id} from the database."
             )
 
-        stmt = stmt.options(selectinload(Problem.tags))
-        with self.database_manager as db:
-            if problem := db.execute(stmt).scalars().first():
-                self.all_problem_cache[problem.problem_frontend_id] = problem
-                if not problem.premium:
-                    self.free_problem_cache[problem.problem_frontend_id] = problem
-
-                return problem
+        stmt = stmt.options(selectinload(Problem.tags), defer(Problem.description))
+        async with self.database_manager.session() as db:
+            problem = (await db.execute(stmt)).scalars().first()
+        if problem:
+            return self._cache_problem(problem)
         return None
 
+    async def get_problem_by_db_id(self, problem_db_id: int) -> ProblemRecord | None:
+        """Looks the problem up in the catalog, falling back to the database."""
+        record = self.catalog.get_by_db_id(problem_db_id)
+        if record is not None:
+            return record
+        return await self.get_problem_from_db(problem_db_id=problem_db_id)
+
     async def get_random_problem(
-        self, difficulty: Optional[Literal["Easy", "Medium", "Hard"]], premium: bool
-    ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]] | None:
-        if not difficulty:
-            problem_pool = list(
-                self.all_problem_cache.keys()
-                if premium
-                else self.free_problem_cache.keys()
-            )
-            problem_frontend_id = random.choice(problem_pool)
-            return await self.get_problem_with_frontend_id(
-                problem_frontend_id=problem_frontend_id
-            )
+        self,
+        difficulty: Optional[Literal["Easy", "Medium", "Hard"]],
+        premium: bool,
+        tag: Optional[str] = None,
+        exclude_problem_db_ids: Optional[Container[int]] = None,
+    ) -> (
+        Dict[Literal["problem", "tags"], ProblemRecord | AbstractSet[TagRecord]] | None
+    ):
+        """
+        Picks a random problem from the in-memory sampling index.
+        Problems whose database id is in exclude_problem_db_ids are never picked.
+        Returns None if no problem matches the filters.
+        """
+        self.logger.info(
+            f"Picking random problem (difficulty={difficulty}, premium={premium}, tag={tag})"
+        )
+        exclude = None
+        if exclude_problem_db_ids:
+            excluded = exclude_problem_db_ids
+
+            def exclude(problem_frontend_id: int) -> bool:
+                return self.all_problem_cache[problem_frontend_id].id in excluded
+
+        problem_frontend_id = self.problem_index.sample(
+            difficulty=(
+                ProblemDifficulity.from_str_repr(difficulty).db_repr
+                if difficulty
+                else None
+            ),
+            premium=premium,
+            tag=tag,
+            exclude=exclude,
+        )
+        if problem_frontend_id is None:
+            return None
+        return await self.get_problem_with_frontend_id(
+            problem_frontend_id=problem_frontend_id
+        )
 
-        with self.database_manager as db:
-            self.logger.info(
-                f"Fetching problem with difficulty {difficulty} from database"
-            )
+    async def build_search_indexes(self) -> None:
+        """
+        Builds the search and autocomplete indexes if they are not built yet.
+        They are built in a worker thread and swapped in once complete, so the event
+        loop (and the gateway heartbeat) keeps running. Concurrent callers share a build.
+        """
+        if self._text_indexes_built:
+            return
+        if self._index_build is None:
+            self._index_build = asyncio.ensure_future(self._build_search_indexes())
+        await asyncio.shield(self._index_build)
 
-            stmt = (
-                select(Problem)
-                .where(
-                    Problem.difficulty
-                    == ProblemDifficulity.from_str_repr(difficulty).db_repr,
+    async def _build_search_indexes(self) -> None:
+        try:
+            while not self._text_indexes_built:
+                generation = self._catalog_generation
+                self._index_changes = set()
+                records = list(self.catalog.values())
+                self.logger.info(
+                    "Building search indexes over %d problems.", len(records)
                 )
-                .options(selectinload(Problem.tags))
-            )
-            if not premium:
-                stmt = stmt.where(Problem.premium.is_(False))
-
-            problems = db.execute(stmt).scalars().all()
-            problem = random.choice(problems)
-            return {"problem": problem, "tags": set(problem.tags)}
+                search_index, autocomplete = await asyncio.to_thread(
+                    _build_text_indexes, records
+                )
+                if generation != self._catalog_generation:
+                    continue  # the catalog was reloaded meanwhile
+                # Problems cached or uncached during the build are applied before
+                # the swap; nothing awaits in between.
+                for problem_frontend_id in self._index_changes:
+                    record = self.catalog.get(problem_frontend_id)
+                    if record is None:
+                        search_index.remove(problem_frontend_id)
+                        autocomplete.remove(problem_frontend_id)
+                    else:
+                        search_index.add(record)
+                        autocomplete.add(record)
+                self.search_index, self.autocomplete = search_index, autocomplete
+                self._text_indexes_built = True
+        finally:
+            self._index_changes = None
+            self._index_build = None
+
+    async def search_problems(self, query: str, limit: int = 10) -> List[ProblemRecord]:
+        """
+        Finds cached problems by frontend id, title, title slug or topic tag, best match
+        first. Only reads memory, so it is cheap enough for autocomplete.
+        """
+        await self.build_search_indexes()
+        return [
+            self.all_problem_cache[problem_frontend_id]
+            for problem_frontend_id in self.search_index.search(query, limit)
+        ]
+
+    async def autocomplete_problems(
+        self, prefix: str, limit: int
+    ) -> List[ProblemRecord]:
+        """
+        Cached problems whose frontend id, title or a title word starts with prefix,
+        by frontend id. Falls back to search, so misspelled input still completes.
+        """
+        await self.build_search_indexes()
+        problem_frontend_ids = self.autocomplete.problem_ids(prefix)[:limit]
+        if not problem_frontend_ids:
+            return await self.search_problems(prefix, limit)
+        return [
+            self.all_problem_cache[problem_frontend_id]
+            for problem_frontend_id in problem_frontend_ids
+        ]
+
+    async def autocomplete_tags(self, prefix: str, limit: int) -> List[str]:
+        await self.build_search_indexes()
+        return self.autocomplete.tag_names(prefix)[:limit]
 
     async def get_problem_with_frontend_id(
         self, problem_frontend_id: int
-    ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]] | None:
+    ) -> (
+        Dict[Literal["problem", "tags"], ProblemRecord | AbstractSet[TagRecord]] | None
+    ):
         """
         Retrieves a problem by its ID from the cache or fetches it from LeetCode if not present.
         """
         if problem_in_cache := self.all_problem_cache.get(problem_frontend_id, None):
-            self.logger.debug(f"Problem with ID {problem_frontend_id} found in cache.")
             self.logger.debug(
-                f"Problem Tags: {[tag.tag_name for tag in problem_in_cache.tags]}"
+                "Problem with ID %d found in cache: %r",
+                problem_frontend_id,
+                problem_in_cache,
             )
-            self.logger.debug(f"Problem Details: {problem_in_cache}")
-            return {"problem": problem_in_cache, "tags": set(problem_in_cache.tags)}
+            return {"problem": problem_in_cache, "tags": problem_in_cache.tags}
         try:
-            self.logger.info(
-                f"Problem with ID {problem_frontend_id} not found in cache. Fetching from DB or LeetCode API."
-            )
-            problem = await self.get_problem_from_db(
-                problem_frontend_id=problem_frontend_id
-            )
-            self.logger.debug(f"DB Problem: {problem}")
-            if problem:
-                self.all_problem_cache[problem_frontend_id] = problem
-                return {"problem": problem, "tags": set(problem.tags)}
-
-            self.logger.info(
-                f"Problem with ID {problem_frontend_id} not found in DB. Fetching from LeetCode API."
-            )
-            problem_data = await self.leetcode_api.fetch_problem_by_id(
-                problem_frontend_id
+            problem = await self._inflight.do(
+                ("problem", problem_frontend_id),
+                lambda: self._load_problem(problem_frontend_id),
             )
-            self.logger.debug(f"API Problem Data: {problem_data}")
-            if not problem_data:
-                raise ProblemNotFound(
-                    f"Problem with ID {problem_frontend_id} not found."
-                )
-            problem = problem_data["problem"]
-            tags = problem_data["tags"]
-            assert isinstance(tags, set) and isinstance(problem, Problem)
-            problem = await self.add_problem_to_db(problem, tags)
-            self.all_problem_cache[problem_frontend_id] = problem
-            if not problem.premium:
-                self.free_problem_cache[problem_frontend_id] = problem
-            self.logger.debug(f"New Problem Added: {problem}")
-            return {"problem": problem, "tags": set(problem.tags)}
+            return {"problem": problem, "tags": problem.tags}
         except Exception as e:
             self.logger.error(
                 f"Error retrieving problem with ID {problem_frontend_id}",
@@ -316,89 +666,189 @@ class LeetCodeProblemManager:
             )
             raise Exception(e)
 
+    async def get_problem_description(self, problem: ProblemRecord) -> str:
+        """
+        Returns the rendered description of a cached problem, loading it from the
+        database on a miss.
+        """
+        description, _ = self.descriptions.lookup(problem.problem_frontend_id)
+        if description is None:
+            description = await self._inflight_descriptions.do(
+                problem.problem_frontend_id, lambda: self._load_description(problem)
+            )
+        return description
+
+    async def _load_description(self, problem: ProblemRecord) -> str:
+        self.logger.debug(
+            "Loading description of problem %d from the database.",
+            problem.problem_frontend_id,
+        )
+        async with self.database_manager.session() as db:
+            description = (
+                await db.execute(
+                    select(Problem.description).where(Problem.id == problem.id)
+                )
+            ).scalar_one_or_none()
+        # A refresh may have replaced the problem while the query ran.
+        if self.all_problem_cache.get(problem.problem_frontend_id) is problem:
+            self.descriptions.set(problem.problem_frontend_id, description or "")
+        return description or ""
+
+    def cache_stats(self) -> Dict[str, dict]:
+        return {
+            self.descriptions.name: self.descriptions.stats.to_dict(),
+            **self.autocomplete.cache_stats(),
+        }
+
+    async def _load_problem(self, problem_frontend_id: int) -> ProblemRecord:
+        """Loads an uncached problem from the DB, or fetches and stores it from LeetCode."""
+        self.logger.info(
+            f"Problem with ID {problem_frontend_id} not found in cache. Fetching from DB or LeetCode API."
+        )
+        problem = await self.get_problem_from_db(
+            problem_frontend_id=problem_frontend_id
+        )
+        self.logger.debug(f"DB Problem: {problem}")
+        if problem:
+            return problem
+
+        self.logger.info(
+            f"Problem with ID {problem_frontend_id} not found in DB. Fetching from LeetCode API."
+        )
+        problem_data = await self.leetcode_api.fetch_problem_by_id(problem_frontend_id)
+        self.logger.debug(f"API Problem Data: {problem_data}")
+        if not problem_data:
+            raise ProblemNotFound(f"Problem with ID {problem_frontend_id} not found.")
+        problem = problem_data["problem"]
+        tags = problem_data["tags"]
+        assert isinstance(tags, set) and isinstance(problem, Problem)
+        record = self._cache_problem(await self.add_problem_to_db(problem, tags))
+        self.logger.debug(f"New Problem Added: {record}")
+        return record
+
     async def get_daily_problem(
         self,
-    ) -> Dict[Literal["problem", "tags"], Problem | Set[TopicTags]] | None:
+    ) -> (
+        Dict[Literal["problem", "tags"], ProblemRecord | AbstractSet[TagRecord]] | None
+    ):
         """
-        Retrieves the daily problem from LeetCode.
+        Retrieves the daily problem, fetching it from LeetCode at most once per UTC day.
+        If LeetCode cannot be reached, the most recent daily problem is returned instead.
         """
+        today = self._utc_today()
+        latest = self._latest_daily_problem()
+        if latest and latest[0] == today:
+            self.logger.debug(f"Daily problem for {today} found in cache.")
+            return {"problem": latest[1], "tags": latest[1].tags}
         try:
-            self.logger.info("Fetching daily problem from LeetCode API.")
-            problem_data = await self.leetcode_api.fetch_daily()
-            if not problem_data:
-                raise ProblemNotFound("Daily problem not found.")
-            self.logger.debug(f"Daily Problem Data: {problem_data}")
-            problem = problem_data["problem"]
-            tags = problem_data["tags"]
-            assert isinstance(tags, set) and isinstance(problem, Problem)
-            self.logger.debug(f"Daily Problem: {problem}")
-            if problem.problem_frontend_id in self.all_problem_cache.keys():
-                return {
-                    "problem": self.all_problem_cache[problem.problem_frontend_id],
-                    "tags": set(
-                        self.all_problem_cache[problem.problem_frontend_id].tags
-                    ),
-                }
+            problem = await self._inflight.do(
+                ("daily", today), lambda: self._resolve_daily_problem(today)
+            )
+            return {"problem": problem, "tags": problem.tags}
+        except Exception as e:
+            if latest:
+                self.logger.warning(
+                    f"Error retrieving daily problem, serving the one from {latest[0]}",
+                    exc_info=e,
+                )
+                return {"problem": latest[1], "tags": latest[1].tags}
+            self.logger.error("Error retrieving daily problem", exc_info=e)
+            raise Exception(e)
+
+    async def _resolve_daily_problem(self, today: date) -> ProblemRecord:
+        """
+        Fetches the daily problem from LeetCode, resolves it against the cache and
+        database, and stores it as the daily problem for the given UTC date.
+        """
+        self.logger.info("Fetching daily problem from LeetCode API.")
+        problem_data = await self.leetcode_api.fetch_daily()
+        if not problem_data:
+            raise ProblemNotFound("Daily problem not found.")
+        self.logger.debug(f"Daily Problem Data: {problem_data}")
+        problem = problem_data["problem"]
+        tags = problem_data["tags"]
+        assert isinstance(tags, set) and isinstance(problem, Problem)
+        self.logger.debug(f"Daily Problem: {problem}")
+        if cached := self.all_problem_cache.get(problem.problem_frontend_id):
+            daily_problem = cached
+        else:
             self.logger.info(
                 f"Daily problem with ID {problem.problem_frontend_id} not found in cache. Checking DB."
             )
-            if db_problem := await self.get_problem_from_db(
-                problem.problem_frontend_id
-            ):
-                self.all_problem_cache[problem.problem_frontend_id] = db_problem
-                return {"problem": db_problem, "tags": set(db_problem.tags)}
-
+            daily_problem = await self.get_problem_from_db(problem.problem_frontend_id)
+        if not daily_problem:
             self.logger.info(
                 f"Daily problem with ID {problem.problem_frontend_id} not found in DB. Adding to DB."
             )
-            new_problem = await self.add_problem_to_db(problem, tags)
-
-            self.logger.debug(f"New Daily Problem Added: {new_problem}")
-            self.all_problem_cache[problem.problem_frontend_id] = new_problem
+            daily_problem = self._cache_problem(
+                await self.add_problem_to_db(problem, tags)
+            )
+            self.logger.debug(f"New Daily Problem Added: {daily_problem}")
             self.logger.debug(
-                f"Daily Problem Tags: {[tag.tag_name for tag in new_problem.tags]}"
+                f"Daily Problem Tags: {[tag.tag_name for tag in daily_problem.tags]}"
             )
-            return {
-                "problem": new_problem,
-                "tags": set(new_problem.tags),
-            }
-
-        except Exception as e:
-            self.logger.error("Error retrieving daily problem", exc_info=e)
-            raise Exception(e)
+        self.daily_problem_cache = {today: daily_problem}
+        return daily_problem
 
     async def add_problem_to_db(
         self, problem: Problem, tags: Set[TopicTags]
     ) -> Problem:
-        with self.database_manager as db:
+        """
+        Inserts a problem and its tags, returning the persisted problem.
+        Rows that already exist are kept, so concurrent calls for the same problem or
+        for problems sharing a new tag do not conflict with each other.
+        """
+        async with self.database_manager.session() as db:
             self.logger.info(
                 f"Adding problem with ID {problem.problem_id} to the database."
             )
-            # Check for existing problem
-            db_problem = (
-                db.query(Problem).filter_by(problem_id=problem.problem_id).first()
+            tag_names = sorted({tag.tag_name for tag in tags})
+            problem.content_hash = problem.compute_content_hash(tag_names)
+            mapping = problem.to_dict()
+            for key in ("id", "tags"):
+                mapping.pop(key)
+            await db.execute(
+                sqlite_upsert(Problem)
+                .values(**mapping)
+                .on_conflict_do_nothing(index_elements=["problem_id"])
             )
-            if not db_problem:
-                db.add(problem)
-                db.flush()  # Flush to get problem.id
-                db_problem = problem
+            db_problem_id = (
+                await db.execute(
+                    select(Problem.id).where(Problem.problem_id == problem.problem_id)
+                )
+            ).scalar_one()
 
             # Handle tags
-            self.logger.info(
-                f"Associating tags with problem ID {db_problem.problem_id}."
-            )
-            for tag in tags:
-                db_tag = db.query(TopicTags).filter_by(tag_name=tag.tag_name).first()
-                if not db_tag:
-                    db.add(tag)
-                    db.flush()  # Flush to get tag.id
-                    db_tag = tag
-
-                if db_tag not in db_problem.tags:
-                    db_problem.tags.append(db_tag)
-
-            db.commit()
-            db.refresh(db_problem, attribute_names=["tags"])
+            self.logger.info(f"Associating tags with problem ID {problem.problem_id}.")
+            if tag_names:
+                await db.execute(
+                    sqlite_upsert(TopicTags).on_conflict_do_nothing(
+                        index_elements=["tag_name"]
+                    ),
+                    [{"tag_name": tag_name} for tag_name in tag_names],
+                )
+                tag_db_ids = (
+                    await db.execute(
+                        select(TopicTags.id).where(TopicTags.tag_name.in_(tag_names))
+                    )
+                ).scalars()
+                await db.execute(
+                    sqlite_upsert(problem_tags_association).on_conflict_do_nothing(
+                        index_elements=["problem_id", "tag_id"]
+                    ),
+                    [
+                        {"problem_id": db_problem_id, "tag_id": tag_db_id}
+                        for tag_db_id in tag_db_ids
+                    ],
+                )
+
+            db_problem = (
+                await db.execute(
+                    select(Problem)
+                    .where(Problem.id == db_problem_id)
+                    .options(selectinload(Problem.tags))
+                )
+            ).scalar_one()
             self.logger.info(
                 f"Problem with ID {db_problem.problem_id} added/updated successfully."
             )
@@ -416,28 +866,32 @@ class LeetCodeProblemManager:
             return
 
         problem_obj = problem["problem"]
-        assert isinstance(problem_obj, Problem)
-        assert isinstance(problem["tags"], Set)
+        assert isinstance(problem_obj, ProblemRecord)
+        assert isinstance(problem["tags"], AbstractSet)
         self.logger.debug(f"Problem object: {problem_obj}")
         self.logger.info(
             f"Sending problem description for problem ID {problem_frontend_id}"
         )
         return get_problem_desc_embed(
-            problem=problem_obj, problem_tags=problem["tags"], bot=bot
+            problem=problem_obj,
+            problem_tags=problem["tags"],
+            description=await self.get_problem_description(problem_obj),
+            bot=bot,
         )
 
     async def delete_problem_from_db(self, problem_frontend_id: int) -> None:
         self.logger.info(
             f"Deleting problem with frontend ID {problem_frontend_id} from the database."
         )
-        with self.database_manager as db:
+        async with self.database_manager.session() as db:
             db_problem = (
-                db.query(Problem)
-                .filter_by(problem_frontend_id=problem_frontend_id)
-                .first()
-            )
+                await db.execute(
+                    select(Problem).where(
+                        Problem.problem_frontend_id == problem_frontend_id
+                    )
+                )
+            ).scalar_one_or_none()
             if db_problem:
-                db.delete(db_problem)
-                db.commit()
-                if problem_frontend_id in self.all_problem_cache:
-                    del self.all_problem_cache[problem_frontend_id]
+                await db.delete(db_problem)
+                await db.commit()
+                self._uncache_problem(problem_frontend_id)
@@ -0,0 +1,206 @@
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from db.problem import Problem
+
+
+class TagRecord:
+    """A topic tag name, interned so each name exists once in memory."""
+
+    __slots__ = ("tag_id", "tag_name")
+
+    def __init__(self, tag_id: int, tag_name: str) -> None:
+        object.__setattr__(self, "tag_id", tag_id)
+        object.__setattr__(self, "tag_name", tag_name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("TagRecord is read-only")
+
+    def __repr__(self) -> str:
+        return f"TagRecord(tag_id={self.tag_id}, tag_name={self.tag_name})"
+
+
+class TagTable:
+    """
+    Process-wide table interning tag names to small integer ids. Resolved tag sets
+    are interned too, since most problems share their combination of tags.
+    """
+
+    __slots__ = ("_records", "_ids", "_sets")
+
+    def __init__(self) -> None:
+        self._records: List[TagRecord] = []
+        self._ids: Dict[str, int] = {}
+        self._sets: Dict[Tuple[int, ...], FrozenSet[TagRecord]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, tag_id: int) -> TagRecord:
+        return self._records[tag_id]
+
+    def intern(self, tag_name: str) -> int:
+        tag_id = self._ids.get(tag_name)
+        if tag_id is None:
+            tag_id = self._ids[tag_name] = len(self._records)
+            self._records.append(TagRecord(tag_id, tag_name))
+        return tag_id
+
+    def resolve(self, tag_ids: Tuple[int, ...]) -> FrozenSet[TagRecord]:
+        tags = self._sets.get(tag_ids)
+        if tags is None:
+            tags = self._sets[tag_ids] = frozenset(self._records[i] for i in tag_ids)
+        return tags
+
+
+TAGS = TagTable()
+
+_FIELDS = (
+    "id",
+    "problem_id",
+    "problem_frontend_id",
+    "title",
+    "url",
+    "difficulty",
+    "premium",
+    "content_hash",
+)
+
+
+class ProblemRecord:
+    """
+    Read-only copy of a Problem row held by the problem caches.
+    It has the same attribute names as Problem, but tags are stored as ids into
+    TAGS and resolved on access, and the description is left out; it is loaded on
+    demand by LeetCodeProblemManager.get_problem_description. Writes go through
+    the ORM Problem instead.
+    """
+
+    __slots__ = (*_FIELDS, "tag_ids")
+
+    id: int
+    problem_id: int
+    problem_frontend_id: int
+    title: str
+    url: str
+    difficulty: int
+    premium: bool
+    content_hash: Optional[str]
+    tag_ids: Tuple[int, ...]
+
+    def __init__(self, tag_ids: Tuple[int, ...] = (), **fields: object) -> None:
+        for name in _FIELDS:
+            object.__setattr__(self, name, fields.get(name))
+        object.__setattr__(self, "premium", bool(self.premium))
+        object.__setattr__(self, "tag_ids", tag_ids)
+
+    @classmethod
+    def from_orm(cls, problem: Problem) -> "ProblemRecord":
+        return cls(
+            tag_ids=tuple(sorted(TAGS.intern(tag.tag_name) for tag in problem.tags)),
+            **{name: getattr(problem, name) for name in _FIELDS},
+        )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("ProblemRecord is read-only")
+
+    @property
+    def tags(self) -> FrozenSet[TagRecord]:
+        return TAGS.resolve(self.tag_ids)
+
+    def to_dict(self) -> dict:
+        return {
+            **{name: getattr(self, name) for name in _FIELDS},
+            "tags": [TAGS[tag_id].tag_name for tag_id in self.tag_ids],
+        }
+
+    def __repr__(self) -> str:
+        return f"ProblemRecord(id={self.id}, title={self.title}, problem_id={self.problem_id}, problem_frontend_id={self.problem_frontend_id}, url={self.url}, difficulty={self.difficulty}, premium={self.premium})"
+
+
+class _FreeProblems(Mapping[int, ProblemRecord]):
+    """View of the catalog without premium problems."""
+
+    __slots__ = ("_catalog",)
+
+    def __init__(self, catalog: "ProblemCatalog") -> None:
+        self._catalog = catalog
+
+    def __getitem__(self, problem_frontend_id: int) -> ProblemRecord:
+        record = self._catalog[problem_frontend_id]
+        if record.premium:
+            raise KeyError(problem_frontend_id)
+        return record
+
+    def __iter__(self) -> Iterator[int]:
+        return (
+            frontend_id
+            for frontend_id, record in self._catalog.items()
+            if not record.premium
+        )
+
+    def __len__(self) -> int:
+        return len(self._catalog) - self._catalog.premium_count
+
+
+class ProblemCatalog(Mapping[int, ProblemRecord]):
+    """
+    Problem records by frontend id. The free problem cache is a view over the same
+    store, so every problem is held exactly once.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[int, ProblemRecord] = {}
+        # database id -> frontend id
+        self._frontend_ids: Dict[int, int] = {}
+        self.premium_count = 0
+        self.free = _FreeProblems(self)
+
+    def __getitem__(self, problem_frontend_id: int) -> ProblemRecord:
+        return self._records[problem_frontend_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(
+        self, problem_frontend_id: int, default: Optional[ProblemRecord] = None
+    ) -> Optional[ProblemRecord]:
+        return self._records.get(problem_frontend_id, default)
+
+    def get_by_db_id(self, problem_db_id: int) -> Optional[ProblemRecord]:
+        problem_frontend_id = self._frontend_ids.get(problem_db_id)
+        if problem_frontend_id is None:
+            return None
+        return self._records.get(problem_frontend_id)
+
+    def put(self, record: ProblemRecord) -> None:
+        self.remove(record.problem_frontend_id)
+        self._records[record.problem_frontend_id] = record
+        self._frontend_ids[record.id] = record.problem_frontend_id
+        self.premium_count += record.premium
+
+    def remove(self, problem_frontend_id: int) -> Optional[ProblemRecord]:
+        record = self._records.pop(problem_frontend_id, None)
+        if record is not None:
+            self.premium_count -= record.premium
+            if self._frontend_ids.get(record.id) == problem_frontend_id:
+                del self._frontend_ids[record.id]
+        return record
+
+    def replace_all(self, records: Iterable[ProblemRecord]) -> None:
+        self._records = {record.problem_frontend_id: record for record in records}
+        self._frontend_ids = {
+            record.id: record.problem_frontend_id for record in self._records.values()
+        }
+        self.premium_count = sum(record.premium for record in self._records.values())
@@ -0,0 +1,299 @@
+import asyncio
+import os
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Inline tags converted to markdown, in the order the conversion is applied.
+# A tag nested inside an already converted tag of equal or lower rank is flattened
+# to its text, matching how the previous BeautifulSoup implementation behaved.
+_MARKUP: dict[str, Tuple[int, str, str]] = {
+    "sup": (0, "^", ""),
+    "code": (1, "`", "`"),
+    "em": (2, "*", "*"),
+    "strong": (3, "**", "**"),
+}
+_NO_LIMIT = len(_MARKUP)
+
+_VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "br",
+        "col",
+        "command",
+        "embed",
+        "frame",
+        "hr",
+        "image",
+        "img",
+        "input",
+        "isindex",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "nextid",
+        "param",
+        "source",
+        "spacer",
+        "track",
+        "wbr",
+    }
+)
+_PRESERVE_WHITESPACE = frozenset({"pre", "textarea"})
+_HIDDEN_TEXT = frozenset({"rp", "rt", "script", "style", "template"})
+_ASCII_SPACES = frozenset("\x20\x0a\x09\x0c\x0d")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_DECIMAL_PREFIX = re.compile(r"^([0-9]+)(.*)")
+_HEX_PREFIX = re.compile(r"^([0-9a-f]+)(.*)")
+
+
+class _Frame:
+    __slots__ = ("name", "active", "prev_limit", "start")
+
+    def __init__(self, name: str, active: bool, prev_limit: int, start: int):
+        self.name = name
+        self.active = active
+        self.prev_limit = prev_limit
+        self.start = start
+
+
+class _DescriptionTokenizer(HTMLParser):
+    """
+    Single pass HTML to markdown-ish text converter.
+    Text is written straight to an output list; open sup/code/em/strong tags remember
+    where their content starts and wrap it when they close.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.parts: List[str] = []
+        self._pending: List[str] = []
+        self._stack: List[_Frame] = []
+        self._limit = _NO_LIMIT
+        self._hidden_depth = 0
+        self._preserve_depth = 0
+        self._closed_void: List[str] = []
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        data = "".join(self._pending)
+        self._pending.clear()
+        if not self._preserve_depth and all(c in _ASCII_SPACES for c in data):
+            data = "\n" if "\n" in data else " "
+        if not self._hidden_depth:
+            self.parts.append(data)
+
+    def _push(self, tag: str) -> None:
+        markup = _MARKUP.get(tag)
+        active = markup is not None and markup[0] < self._limit
+        self._stack.append(_Frame(tag, active, self._limit, len(self.parts)))
+        if active:
+            self._limit = markup[0]  # type: ignore[index]
+        if tag in _HIDDEN_TEXT:
+            self._hidden_depth += 1
+        if tag in _PRESERVE_WHITESPACE:
+            self._preserve_depth += 1
+
+    def _pop(self) -> None:
+        frame = self._stack.pop()
+        if frame.active:
+            _, prefix, suffix = _MARKUP[frame.name]
+            content = "".join(self.parts[frame.start :])
+            del self.parts[frame.start :]
+            self.parts.append(f"{prefix}{content}{suffix}")
+            self._limit = frame.prev_limit
+        if frame.name in _HIDDEN_TEXT:
+            self._hidden_depth -= 1
+        if frame.name in _PRESERVE_WHITESPACE:
+            self._preserve_depth -= 1
+
+    def _pop_to(self, tag: str) -> None:
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i].name == tag:
+                while len(self._stack) > i:
+                    self._pop()
+                return
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self._flush()
+        self._push(tag)
+        if tag in _VOID_ELEMENTS:
+            self._pop_to(tag)
+            self._closed_void.append(tag)
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self._flush()
+        self._push(tag)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag) -> None:
+        if tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+        self._flush()
+        self._pop_to(tag)
+
+    def handle_data(self, data) -> None:
+        self._pending.append(data)
+
+    def handle_entityref(self, name) -> None:
+        self._pending.append(html5.get(f"{name};", f"&{name}"))
+
+    def handle_charref(self, name) -> None:
+        if name[:1] in ("x", "X"):
+            base, digits, prefix = 16, name[1:], _HEX_PREFIX
+        else:
+            base, digits, prefix = 10, name, _DECIMAL_PREFIX
+        try:
+            self._pending.append(_decode_codepoint(int(digits, base)))
+        except ValueError:
+            # Unterminated reference followed by regular text, e.g. "&#39abc".
+            if match := prefix.match(digits):
+                self._pending.append(_decode_codepoint(int(match.group(1), base)))
+                self._pending.append(match.group(2))
+            else:
+                self._pending.append(digits)
+
+    def _handle_ignored(self, data) -> None:
+        self._flush()
+
+    handle_comment = _handle_ignored
+    handle_decl = _handle_ignored
+    handle_pi = _handle_ignored
+
+    def unknown_decl(self, data) -> None:
+        self._flush()
+        if data.upper().startswith("CDATA[") and self._limit == _NO_LIMIT:
+            self.parts.append(data[len("CDATA[") :])
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+
+_WINDOWS_1252 = {
+    0x80: "€",
+    0x82: "‚",
+    0x83: "ƒ",
+    0x84: "„",
+    0x85: "…",
+    0x86: "†",
+    0x87: "‡",
+    0x88: "ˆ",
+    0x89: "‰",
+    0x8A: "Š",
+    0x8B: "‹",
+    0x8C: "Œ",
+    0x8E: "Ž",
+    0x91: "‘",
+    0x92: "’",
+    0x93: "“",
+    0x94: "”",
+    0x95: "•",
+    0x96: "–",
+    0x97: "—",
+    0x98: "˜",
+    0x99: "™",
+    0x9A: "š",
+    0x9B: "›",
+    0x9C: "œ",
+    0x9E: "ž",
+    0x9F: "Ÿ",
+}
+
+
+def _decode_codepoint(codepoint: int) -> str:
+    if codepoint == 0 or codepoint > 0x10FFFF or 0xD800 <= codepoint <= 0xDFFF:
+        return "\ufffd"
+    return _WINDOWS_1252.get(codepoint) or chr(codepoint)
+
+
+def render_problem_desc(content: str, max_len: int) -> str:
+    """
+    Converts a LeetCode HTML description to the markdown preview shown in embeds.
+    sup/code/em/strong become ^x, `x`, *x* and **x**; the result is cut at max_len.
+    """
+    if not content:
+        return "No description available."
+    tokenizer = _DescriptionTokenizer()
+    tokenizer.feed(content)
+    tokenizer.close()
+    text_only = "".join(tokenizer.parts).strip()
+    problem_md = _BLANK_LINES.sub("\n\n", text_only)[:max_len]
+    if len(text_only) > max_len:
+        problem_md += "..."
+    return problem_md
+
+
+def render_problem_descs(contents: Sequence[str], max_len: int) -> List[str]:
+    """Renders a chunk of descriptions. Module level so it can run in a worker process."""
+    return [render_problem_desc(content, max_len) for content in contents]
+
+
+class ProblemDescRenderer:
+    """
+    Renders problem descriptions, fanning bulk work out over a process pool.
+    Without a started pool, bulk rendering runs in the event loop's default executor.
+    """
+
+    def __init__(
+        self, max_len: int, max_workers: Optional[int] = None, chunk_size: int = 50
+    ) -> None:
+        self.max_len = max_len
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._pool: Optional["ProcessPoolExecutor"] = None
+
+    def render(self, content: str) -> str:
+        return render_problem_desc(content, self.max_len)
+
+    def start_pool(self) -> None:
+        if self._pool is not None or self.max_workers == 0:
+            return
+        if self.max_workers is None and (os.cpu_count() or 1) < 2:
+            return  # Worker processes only add overhead on a single core.
+        # Imported here: multiprocessing is only needed once a refresh renders in bulk.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def shutdown_pool(self) -> None:
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    async def render_many(self, contents: Sequence[str]) -> List[str]:
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            return await loop.run_in_executor(
+                None, render_problem_descs, contents, self.max_len
+            )
+        chunks = [
+            contents[i : i + self.chunk_size]
+            for i in range(0, len(contents), self.chunk_size)
+        ]
+        rendered = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._pool, render_problem_descs, chunk, self.max_len
+                )
+                for chunk in chunks
+            )
+        )
+        return [desc for chunk in rendered for desc in chunk]
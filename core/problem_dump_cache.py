@@ -0,0 +1,146 @@
+import asyncio
+import gzip
+import json
+import logging
+import mmap
+import os
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Optional
+
+
+class ProblemDumpCache:
+    """
+    On-disk copy of the GitHub problem dump together with its HTTP validators
+    (ETag / Last-Modified), so refreshes can use conditional requests.
+    The dump is optionally gzip compressed and is memory-mapped when read back.
+    Compression and decompression run in worker threads, off the event loop.
+    """
+
+    def __init__(
+        self, cache_dir: str, logger: logging.Logger, compress: bool = True
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.compress = compress
+        self.logger = logger
+        self._meta_path = os.path.join(cache_dir, "leetcode_questions.meta.json")
+
+    def _dump_path(self, compressed: bool) -> str:
+        name = "leetcode_questions.json" + (".gz" if compressed else "")
+        return os.path.join(self.cache_dir, name)
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._dump_path(meta.get("compressed", False))):
+            return None
+        return meta
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Returns If-None-Match / If-Modified-Since headers for the cached copy, if any."""
+        meta = self._read_meta()
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def has_dump(self) -> bool:
+        return self._read_meta() is not None
+
+    def open_writer(self) -> "ProblemDumpWriter":
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return ProblemDumpWriter(self, self._dump_path(self.compress))
+
+    def _commit(
+        self, tmp_path: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        os.replace(tmp_path, self._dump_path(self.compress))
+        stale = self._dump_path(not self.compress)
+        if os.path.exists(stale):
+            os.remove(stale)
+        meta = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "compressed": self.compress,
+        }
+        tmp_meta = self._meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self._meta_path)
+        self.logger.info(f"Cached problem dump to {self.cache_dir} (etag={etag}).")
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        """Reads the cached dump back through a read-only memory map."""
+        meta = self._read_meta()
+        if not meta:
+            raise FileNotFoundError("No cached problem dump available.")
+        path = self._dump_path(meta.get("compressed", False))
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                source: BinaryIO = mapped  # type: ignore[assignment]
+                if meta.get("compressed", False):
+                    source = gzip.GzipFile(fileobj=mapped, mode="rb")  # type: ignore[arg-type]
+                while chunk := await asyncio.to_thread(source.read, chunk_size):
+                    yield chunk
+
+
+class ProblemDumpWriter:
+    """
+    Writes a freshly downloaded dump to a temporary file. The cached copy and its
+    validators are only replaced on commit, once the dump was received and applied.
+    """
+
+    def __init__(self, cache: ProblemDumpCache, final_path: str) -> None:
+        self._cache = cache
+        self._tmp_path = final_path + ".tmp"
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        raw = open(self._tmp_path, "wb")
+        self._file: BinaryIO = (
+            gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)  # type: ignore[assignment]
+            if cache.compress
+            else raw
+        )
+        self._raw = raw
+        self._pending: Optional[asyncio.Future] = None
+
+    async def _in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        # Shielded, and awaited again before closing, so a cancelled caller never
+        # closes the file while a thread is still writing to it.
+        self._pending = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        return await asyncio.shield(self._pending)
+
+    async def write(self, chunk: bytes) -> None:
+        await self._in_thread(self._file.write, chunk)
+
+    async def finish(self, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Closes the temporary file once the whole body was received."""
+        await self._close()
+        self._etag = etag
+        self._last_modified = last_modified
+
+    async def commit(self) -> None:
+        await self._close()
+        self._cache._commit(self._tmp_path, self._etag, self._last_modified)
+
+    async def abort(self) -> None:
+        await self._close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    async def _close(self) -> None:
+        if self._pending is not None:
+            await asyncio.gather(self._pending, return_exceptions=True)
+        await self._in_thread(self._close_files)
+
+    def _close_files(self) -> None:
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.close()
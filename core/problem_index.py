@@ -0,0 +1,138 @@
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.problem_catalog import ProblemRecord
+from models.leetcode import ProblemDifficulity
+
+# (tag name or None for the untagged view, difficulty, premium)
+BucketKey = Tuple[Optional[str], int, bool]
+_DIFFICULTIES = tuple(difficulty.db_repr for difficulty in ProblemDifficulity)
+# Random draws tried before falling back to scanning the matching buckets.
+_MAX_REJECTIONS = 32
+
+
+class _Bucket:
+    """An array of ids with a position map, giving O(1) add, remove and sample."""
+
+    __slots__ = ("items", "positions")
+
+    def __init__(self) -> None:
+        self.items: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: int) -> None:
+        if item in self.positions:
+            return
+        self.positions[item] = len(self.items)
+        self.items.append(item)
+
+    def remove(self, item: int) -> None:
+        pos = self.positions.pop(item, None)
+        if pos is None:
+            return
+        last = self.items.pop()
+        if pos < len(self.items):
+            self.items[pos] = last
+            self.positions[last] = pos
+
+
+class ProblemSamplingIndex:
+    """
+    Buckets of problem frontend ids by (tag, difficulty, premium) for /random.
+    Any filter combination maps to at most six buckets, so sampling is constant time
+    regardless of how many problems are indexed.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[BucketKey, _Bucket] = {}
+        self._keys: Dict[int, List[BucketKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _normalize_tag(tag_name: str) -> str:
+        return tag_name.casefold()
+
+    def rebuild(self, problems: Iterable[ProblemRecord]) -> None:
+        self._buckets.clear()
+        self._keys.clear()
+        for problem in problems:
+            self.add(problem)
+
+    def add(self, problem: ProblemRecord) -> None:
+        """Indexes a problem, replacing any previous entry for the same frontend id."""
+        frontend_id = problem.problem_frontend_id
+        self.remove(frontend_id)
+        premium = bool(problem.premium)
+        keys: List[BucketKey] = [(None, problem.difficulty, premium)]
+        keys.extend(
+            (self._normalize_tag(tag.tag_name), problem.difficulty, premium)
+            for tag in problem.tags
+        )
+        for key in keys:
+            self._buckets.setdefault(key, _Bucket()).add(frontend_id)
+        self._keys[frontend_id] = keys
+
+    def remove(self, problem_frontend_id: int) -> None:
+        for key in self._keys.pop(problem_frontend_id, []):
+            bucket = self._buckets[key]
+            bucket.remove(problem_frontend_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def _matching_buckets(
+        self, difficulty: Optional[int], premium: bool, tag: Optional[str]
+    ) -> List[_Bucket]:
+        tag_key = self._normalize_tag(tag) if tag else None
+        difficulties = _DIFFICULTIES if difficulty is None else (difficulty,)
+        premiums = (False, True) if premium else (False,)
+        return [
+            bucket
+            for d in difficulties
+            for p in premiums
+            if (bucket := self._buckets.get((tag_key, d, p)))
+        ]
+
+    def count(
+        self, difficulty: Optional[int], premium: bool, tag: Optional[str] = None
+    ) -> int:
+        return sum(map(len, self._matching_buckets(difficulty, premium, tag)))
+
+    def sample(
+        self,
+        difficulty: Optional[int],
+        premium: bool,
+        tag: Optional[str] = None,
+        exclude: Optional[Callable[[int], bool]] = None,
+    ) -> int | None:
+        """
+        Returns a uniformly random frontend id matching the filters, or None.
+        premium=False restricts the pool to free problems. Ids for which exclude
+        returns True are skipped by rejection sampling, which stays constant time
+        unless nearly every matching problem is excluded; then the buckets are scanned.
+        """
+        buckets = self._matching_buckets(difficulty, premium, tag)
+        total = sum(map(len, buckets))
+        if not total:
+            return None
+        for _ in range(_MAX_REJECTIONS if exclude else 1):
+            pick = random.randrange(total)
+            for bucket in buckets:
+                if pick < len(bucket):
+                    break
+                pick -= len(bucket)
+            frontend_id = bucket.items[pick]
+            if exclude is None or not exclude(frontend_id):
+                return frontend_id
+        assert exclude is not None
+        remaining = [
+            frontend_id
+            for bucket in buckets
+            for frontend_id in bucket.items
+            if not exclude(frontend_id)
+        ]
+        return random.choice(remaining) if remaining else None
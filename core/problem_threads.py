@@ -1,17 +1,20 @@
-from typing import Dict, Literal, Set, Tuple
+from typing import AbstractSet, Dict, Literal, Tuple
 from discord import ForumChannel, Guild, Thread
 from discord.channel import ThreadWithMessage
 from discord.ext import commands
 from sqlalchemy.sql import select
 from db.database_manager import DatabaseManager
-from db.problem import Problem, TopicTags
+from core.problem_catalog import ProblemRecord, TagRecord
 from db.thread_channel import GuildForumChannel
 from db.problem_threads import ProblemThreads
 from core.leetcode_problem import LeetCodeProblemManager
 from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
 import logging
+from config.constants import lookup_negative_ttl
 from models.leetcode import ThreadCreationEnum
 
+from utils.bitset import IdBitset
+from utils.cache import LookupCache
 from utils.discord_utils import try_get_channel
 from utils.embed_presenters import (
     get_difficulty_str_repr,
@@ -29,37 +32,82 @@ class ProblemThreadsManager:
     ) -> None:
         self.database_manager: DatabaseManager = database_manager
         self.leetcode_problem_manager: LeetCodeProblemManager = leetcode_problem_manager
-        self.problem_threads: Dict[int, ProblemThreads] = {}
-        self.forum_channels: Dict[int, GuildForumChannel] = {}
+        self.problem_threads: LookupCache[int, ProblemThreads] = LookupCache(
+            "problem_threads", negative_ttl=lookup_negative_ttl
+        )
+        self.forum_channels: LookupCache[int, GuildForumChannel] = LookupCache(
+            "forum_channels", negative_ttl=lookup_negative_ttl
+        )
+        # Secondary index of problem_threads by (forum_channel_db_id, problem_db_id).
+        self.threads_by_problem: Dict[Tuple[int, int], ProblemThreads] = {}
+        # Problem database ids that already have a thread, keyed by forum channel db id.
+        self.threaded_problem_ids: Dict[int, IdBitset] = {}
         self.logger = logger
 
+    def _rebuild_thread_indexes(self) -> None:
+        problem_threads = list(self.problem_threads.values())
+        self.problem_threads.clear()
+        self.threads_by_problem = {}
+        self.threaded_problem_ids = {}
+        for problem_thread in problem_threads:
+            self._index_thread(problem_thread)
+
+    def _index_thread(self, problem_thread: ProblemThreads) -> None:
+        self.problem_threads.set(problem_thread.thread_id, problem_thread)
+        self.threads_by_problem[
+            (problem_thread.forum_channel_db_id, problem_thread.problem_db_id)
+        ] = problem_thread
+        self.threaded_problem_ids.setdefault(
+            problem_thread.forum_channel_db_id, IdBitset()
+        ).add(problem_thread.problem_db_id)
+
+    def _unindex_thread(self, problem_thread: ProblemThreads) -> None:
+        self.problem_threads.invalidate(problem_thread.thread_id)
+        key = (problem_thread.forum_channel_db_id, problem_thread.problem_db_id)
+        indexed = self.threads_by_problem.get(key)
+        if indexed is None or indexed.thread_id != problem_thread.thread_id:
+            return
+        del self.threads_by_problem[key]
+        if threaded := self.threaded_problem_ids.get(key[0]):
+            threaded.discard(key[1])
+
+    async def get_threaded_problem_ids(self, guild_id: int) -> IdBitset:
+        """Returns the database ids of problems that already have a thread in the guild."""
+        forum_channel = await self.get_forum_channel(guild_id)
+        if not forum_channel:
+            return IdBitset()
+        return self.threaded_problem_ids.get(forum_channel.id, IdBitset())
+
     async def init_cache(self):
-        with self.database_manager as db:
+        async with self.database_manager.session() as db:
             self.logger.info("Initializing ProblemThreadsManager Cache...")
             stmt = select(ProblemThreads)
-            result = db.execute(stmt).scalars().all()
+            result = (await db.execute(stmt)).scalars().all()
             self.logger.info(f"Loaded {len(result)} problem threads from the database.")
             self.logger.debug(result)
-            for problem_thread in result:
-                self.problem_threads[problem_thread.thread_id] = problem_thread
+            self.problem_threads.replace_all(
+                {problem_thread.thread_id: problem_thread for problem_thread in result}
+            )
             self.logger.info("ProblemThreadsManager Cache initialized.")
             self.logger.info("Initializing GuildForumChannels Cache...")
             stmt = select(GuildForumChannel)
-            result = db.execute(stmt).scalars().all()
+            result = (await db.execute(stmt)).scalars().all()
             self.logger.info(f"Loaded {len(result)} forum channels from the database.")
             self.logger.debug(result)
-            for forum_channel in result:
-                self.forum_channels[forum_channel.guild_id] = forum_channel
+            self.forum_channels.replace_all(
+                {forum_channel.guild_id: forum_channel for forum_channel in result}
+            )
+            self._rebuild_thread_indexes()
 
     async def add_forum_channel_to_db(self, guild_id: int, channel_id: int) -> None:
-        with self.database_manager as db:
+        async with self.database_manager.session() as db:
             self.logger.info(
                 f"Adding/Updating forum channel for guild {guild_id} with channel {channel_id}."
             )
             stmt = select(GuildForumChannel).where(
                 GuildForumChannel.guild_id == guild_id
             )
-            forum_channel = db.execute(stmt).scalars().first()
+            forum_channel = (await db.execute(stmt)).scalars().first()
             self.logger.debug(f"Existing forum channel: {forum_channel}")
             if forum_channel:
                 forum_channel.channel_id = channel_id
@@ -68,24 +116,23 @@ class ProblemThreadsManager:
                     guild_id=guild_id, channel_id=channel_id
                 )
             db.add(forum_channel)
-            db.commit()
-            self.forum_channels[guild_id] = forum_channel
+            await db.commit()
+            self.forum_channels.set(guild_id, forum_channel)
 
     async def get_forum_channel(self, guild_id: int) -> GuildForumChannel | None:
         self.logger.debug(
             f"Fetching forum channel for guild {guild_id} from cache/database."
         )
-        if res := self.forum_channels.get(guild_id, None):
-            return res
+        return await self.forum_channels.get_or_load(
+            guild_id, lambda: self._load_forum_channel(guild_id)
+        )
 
-        with self.database_manager as db:
+    async def _load_forum_channel(self, guild_id: int) -> GuildForumChannel | None:
+        async with self.database_manager.session() as db:
             stmt = select(GuildForumChannel).where(
                 GuildForumChannel.guild_id == guild_id
             )
-            forum_channel = db.execute(stmt).scalars().first()
-            if forum_channel:
-                return forum_channel
-        return None
+            return (await db.execute(stmt)).scalars().first()
 
     async def get_problem_frontend_id_by_thread_id(self, thread_id: int) -> int | None:
         problem_thread = await self.get_thread_by_thread_id(thread_id=thread_id)
@@ -93,8 +140,8 @@ class ProblemThreadsManager:
             return None
         self.logger.debug(problem_thread)
 
-        problem = await self.leetcode_problem_manager.get_problem_from_db(
-            problem_db_id=problem_thread.problem_db_id
+        problem = await self.leetcode_problem_manager.get_problem_by_db_id(
+            problem_thread.problem_db_id
         )
         if not problem:
             return None
@@ -104,48 +151,47 @@ class ProblemThreadsManager:
         self.logger.debug(
             f"Fetching problem thread for thread ID {thread_id} from cache."
         )
-        if res := self.problem_threads.get(thread_id, None):
-            return res
+        problem_thread = await self.problem_threads.get_or_load(
+            thread_id, lambda: self._load_thread(thread_id)
+        )
+        if not problem_thread:
+            self.logger.debug(f"Problem thread for thread ID {thread_id} not found.")
+        return problem_thread
 
-        with self.database_manager as db:
+    async def _load_thread(self, thread_id: int) -> ProblemThreads | None:
+        async with self.database_manager.session() as db:
             stmt = select(ProblemThreads).where(ProblemThreads.thread_id == thread_id)
-            problem_thread = db.execute(stmt).scalars().first()
-            if problem_thread:
-                return problem_thread
-        self.logger.debug(f"Problem thread for thread ID {thread_id} not found.")
-        return None
+            problem_thread = (await db.execute(stmt)).scalars().first()
+        if problem_thread:
+            self._index_thread(problem_thread)
+        return problem_thread
+
+    def cache_stats(self) -> Dict[str, dict]:
+        return {
+            cache.name: cache.stats.to_dict()
+            for cache in (self.problem_threads, self.forum_channels)
+        }
 
     async def get_thread_by_problem_id(
         self, problem_frontend_id: int, guild_id: int
     ) -> ProblemThreads | None:
         self.logger.debug(
-            f"Fetching problem thread for problem ID {problem_frontend_id} in guild {guild_id} from database."
+            f"Fetching problem thread for problem ID {problem_frontend_id} in guild {guild_id} from cache."
         )
-        with self.database_manager as db:
-            problem = await self.leetcode_problem_manager.get_problem_with_frontend_id(
-                problem_frontend_id
-            )
-            if not problem:
-                return None
-            problem = problem["problem"]
-            assert isinstance(problem, Problem)
-
-            stmt = select(GuildForumChannel).where(
-                GuildForumChannel.guild_id == guild_id
-            )
-            forum_channel = db.execute(stmt).scalars().first()
-            if not forum_channel:
-                return None
+        problem = await self.leetcode_problem_manager.get_problem_with_frontend_id(
+            problem_frontend_id
+        )
+        if not problem:
+            return None
+        problem = problem["problem"]
+        assert isinstance(problem, ProblemRecord)
 
-            stmt = select(ProblemThreads).where(
-                ProblemThreads.problem_db_id == problem.id,
-                ProblemThreads.forum_channel_db_id == forum_channel.id,
-            )
-            problem_thread = db.execute(stmt).scalars().first()
-            self.logger.debug(problem_thread)
-            if problem_thread:
-                return problem_thread
-        return None
+        forum_channel = await self.get_forum_channel(guild_id)
+        if not forum_channel:
+            return None
+        problem_thread = self.threads_by_problem.get((forum_channel.id, problem.id))
+        self.logger.debug(problem_thread)
+        return problem_thread
 
     async def create_thread_in_db(
         self, problem_frontend_id: int, guild_id: int, thread_id: int
@@ -153,20 +199,18 @@ class ProblemThreadsManager:
         self.logger.info(
             f"Creating problem thread in DB for problem ID {problem_frontend_id} in guild {guild_id} with thread ID {thread_id}."
         )
-        with self.database_manager as db:
-            problem_threads_instance = await self.create_thread_instance(
-                problem_frontend_id=problem_frontend_id,
-                guild_id=guild_id,
-                thread_id=thread_id,
+        problem_threads_instance = await self.create_thread_instance(
+            problem_frontend_id=problem_frontend_id,
+            guild_id=guild_id,
+            thread_id=thread_id,
+        )
+        if not problem_threads_instance:
+            raise ValueError(
+                f"Could not create ProblemThreads instance for problem ID {problem_frontend_id} in guild {guild_id} with thread ID {thread_id}."
             )
-            if not problem_threads_instance:
-                raise ValueError(
-                    f"Could not create ProblemThreads instance for problem ID {problem_frontend_id} in guild {guild_id} with thread ID {thread_id}."
-                )
+        async with self.database_manager.session() as db:
             db.add(problem_threads_instance)
-        problem_thread = await self.get_thread_by_thread_id(thread_id)
-        assert problem_thread is not None
-        self.problem_threads[thread_id] = problem_thread
+        self._index_thread(problem_threads_instance)
 
     async def create_thread_instance(
         self, problem_frontend_id: int, guild_id: int, thread_id: int
@@ -184,7 +228,7 @@ class ProblemThreadsManager:
             return None
         problem = problem["problem"]
         self.logger.debug(f"Fetched problem from LeetCodeProblemManager: {problem}")
-        assert isinstance(problem, Problem)
+        assert isinstance(problem, ProblemRecord)
         problem_thread = ProblemThreads(
             thread_id=thread_id,
             problem_db_id=problem.id,
@@ -194,16 +238,37 @@ class ProblemThreadsManager:
 
     async def bulk_upsert_thread_to_db(
         self, problem_threads: Dict[int, ProblemThreads]
-    ) -> None:
+    ) -> int:
+        """
+        Upserts threads keyed by thread id and merges them into the cache.
+        Returns the number of threads written after removing duplicates.
+        """
         if not problem_threads:
             self.logger.warning("No problem threads to upsert.")
             raise ValueError("No problem threads to upsert.")
         self.logger.info(
             f"Bulk upserting {len(problem_threads)} problem threads to DB."
         )
-        with self.database_manager as db:
+        # A problem can only have one thread per forum channel. Threads for a problem that
+        # already has a different thread are skipped; among new duplicates the newest wins.
+        deduped: Dict[Tuple[int, int], ProblemThreads] = {}
+        for problem_thread in sorted(
+            problem_threads.values(), key=lambda pt: pt.thread_id
+        ):
+            key = (problem_thread.forum_channel_db_id, problem_thread.problem_db_id)
+            existing = self.threads_by_problem.get(key)
+            if existing is not None and existing.thread_id != problem_thread.thread_id:
+                continue
+            deduped[key] = problem_thread
+        if len(deduped) < len(problem_threads):
+            self.logger.info(
+                f"Skipping {len(problem_threads) - len(deduped)} duplicate problem threads."
+            )
+        if not deduped:
+            return 0
+        async with self.database_manager.session() as db:
             self.logger.debug(
-                f"Problem threads to upsert: {[pt.to_dict() for pt in problem_threads.values()]}"
+                f"Problem threads to upsert: {[pt.to_dict() for pt in deduped.values()]}"
             )
             upsert_stmt = sqlite_upsert(ProblemThreads)
             upsert_stmt = upsert_stmt.on_conflict_do_update(
@@ -212,28 +277,45 @@ class ProblemThreadsManager:
                     "problem_db_id": upsert_stmt.excluded.problem_db_id,
                     "forum_channel_db_id": upsert_stmt.excluded.forum_channel_db_id,
                 },
-            )
-            db.execute(upsert_stmt, [pt.to_dict() for pt in problem_threads.values()])
+            ).returning(ProblemThreads)
+            upserted = (
+                await db.scalars(
+                    upsert_stmt,
+                    [
+                        {
+                            "thread_id": pt.thread_id,
+                            "problem_db_id": pt.problem_db_id,
+                            "forum_channel_db_id": pt.forum_channel_db_id,
+                        }
+                        for pt in deduped.values()
+                    ],
+                )
+            ).all()
 
-        await self.init_cache()
+        # Merge only the affected rows instead of reloading every guild's threads.
+        for problem_thread in upserted:
+            if previous := self.problem_threads.get(problem_thread.thread_id):
+                self._unindex_thread(previous)
+            self._index_thread(problem_thread)
+        self.logger.info(f"Merged {len(upserted)} upserted problem threads into cache.")
+        return len(upserted)
 
     async def delete_thread_from_db(self, thread_id: int) -> None:
         self.logger.info(f"Deleting problem thread with thread ID {thread_id} from DB.")
-        with self.database_manager as db:
+        async with self.database_manager.session() as db:
             stmt = select(ProblemThreads).where(ProblemThreads.thread_id == thread_id)
-            problem_thread = db.execute(stmt).scalars().first()
+            problem_thread = (await db.execute(stmt)).scalars().first()
             if problem_thread:
                 self.logger.debug(f"Deleting problem thread: {problem_thread}")
-                db.delete(problem_thread)
-                db.commit()
-                if thread_id in self.problem_threads:
-                    del self.problem_threads[thread_id]
+                await db.delete(problem_thread)
+                await db.commit()
+                self._unindex_thread(problem_thread)
 
     async def _create_thread(
         self,
         channel: ForumChannel,
-        problem: Problem,
-        problem_tags: Set[TopicTags],
+        problem: ProblemRecord,
+        problem_tags: AbstractSet[TagRecord],
         bot: commands.Bot,
     ) -> ThreadWithMessage:
         self.logger.info(
@@ -245,8 +327,11 @@ class ProblemThreadsManager:
             thread_content += (
                 "This problem is premium only, so there is no description available."
             )
+        description = await self.leetcode_problem_manager.get_problem_description(
+            problem
+        )
         thread_embed = get_problem_desc_embed(
-            problem=problem, problem_tags=problem_tags, bot=bot
+            problem=problem, problem_tags=problem_tags, description=description, bot=bot
         )
         available_tags = channel.available_tags
         available_tag_names = {tag.name for tag in channel.available_tags}
@@ -284,7 +369,9 @@ class ProblemThreadsManager:
 
     async def reopen_or_create_problem_thread(
         self,
-        problem: Dict[Literal["problem", "tags"], Problem | Set[TopicTags]],
+        problem: Dict[
+            Literal["problem", "tags"], ProblemRecord | AbstractSet[TagRecord]
+        ],
         guild: Guild,
         bot: commands.Bot,
         is_daily: bool,
@@ -299,8 +386,8 @@ class ProblemThreadsManager:
         """
 
         problem_obj = problem["problem"]
-        assert isinstance(problem_obj, Problem)
-        assert isinstance(problem["tags"], Set)
+        assert isinstance(problem_obj, ProblemRecord)
+        assert isinstance(problem["tags"], AbstractSet)
         channel = await self.get_forum_channel(guild_id=guild.id)
         self.logger.debug(f"Forum channel fetched: {channel}")
         if not channel:
@@ -0,0 +1,242 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Set, Tuple
+
+from core.problem_catalog import ProblemRecord
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Trigram similarity (shared / union) for an indexed word to stand in for a
+# misspelled query word, and the share of query words a fuzzy match must cover
+_MIN_SIMILARITY = 0.3
+_MIN_COVERAGE = 0.5
+# Match tiers, best first; fuzzy matches rank after all of them
+_TIER_ID = 0
+_TIER_EXACT = 1
+_TIER_TITLE_PREFIX = 2
+_TIER_WORDS = 3
+_TIER_TAGS = 4
+
+
+def normalize(text: str) -> str:
+    """Lowercases text and collapses everything but letters and digits to single spaces."""
+    return " ".join(_WORD_RE.findall(text.casefold()))
+
+
+def slug_from_url(url: str) -> str:
+    """Returns the title slug of a problem url like https://leetcode.com/problems/two-sum/."""
+    parts = [part for part in url.split("/") if part]
+    if "problems" in parts[:-1]:
+        return parts[parts.index("problems") + 1]
+    return ""
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded so that word starts weigh more (as in pg_trgm)."""
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _Entry:
+    __slots__ = ("title", "slug", "words", "tag_words")
+
+    def __init__(self, problem: ProblemRecord) -> None:
+        self.title = normalize(problem.title or "")
+        self.slug = slug_from_url(problem.url or "")
+        slug_words = self.slug.replace("-", " ")
+        self.words: Set[str] = set(
+            f"{self.title} {slug_words} {problem.problem_frontend_id}".split()
+        )
+        self.tag_words: Set[str] = set(
+            normalize(" ".join(tag.tag_name for tag in problem.tags)).split()
+        )
+
+
+class _WordIndex:
+    """
+    Words in sorted order with the ids containing them, for prefix lookups.
+    With fuzzy set, the words' trigrams are indexed as well, to find words similar
+    to a misspelled one.
+    """
+
+    __slots__ = ("words", "ids", "fuzzy", "grams", "gram_counts")
+
+    def __init__(self, fuzzy: bool = False) -> None:
+        self.words: List[str] = []
+        self.ids: Dict[str, Set[int]] = {}
+        self.fuzzy = fuzzy
+        # trigram -> words containing it
+        self.grams: Dict[str, Set[str]] = {}
+        self.gram_counts: Dict[str, int] = {}
+
+    def add(self, word: str, item: int) -> None:
+        ids = self.ids.get(word)
+        if ids is None:
+            ids = self.ids[word] = set()
+            insort(self.words, word)
+            if self.fuzzy:
+                word_grams = trigrams(word)
+                self.gram_counts[word] = len(word_grams)
+                for gram in word_grams:
+                    self.grams.setdefault(gram, set()).add(word)
+        ids.add(item)
+
+    def remove(self, word: str, item: int) -> None:
+        ids = self.ids.get(word)
+        if ids is None:
+            return
+        ids.discard(item)
+        if not ids:
+            del self.ids[word]
+            del self.words[bisect_left(self.words, word)]
+            if self.fuzzy:
+                del self.gram_counts[word]
+                for gram in trigrams(word):
+                    words = self.grams[gram]
+                    words.discard(word)
+                    if not words:
+                        del self.grams[gram]
+
+    def prefix_ids(self, prefix: str) -> Set[int]:
+        start = bisect_left(self.words, prefix)
+        end = bisect_left(self.words, prefix + "\uffff", start)
+        ids = self.ids
+        return set().union(*(ids[word] for word in self.words[start:end]))
+
+    def similar(self, word: str) -> List[Tuple[str, float]]:
+        """Indexed words with a trigram similarity of at least _MIN_SIMILARITY."""
+        word_grams = trigrams(word)
+        shared = Counter(
+            chain.from_iterable(self.grams.get(gram, ()) for gram in word_grams)
+        )
+        similar = []
+        for candidate, count in shared.items():
+            similarity = count / (len(word_grams) + self.gram_counts[candidate] - count)
+            if similarity >= _MIN_SIMILARITY:
+                similar.append((candidate, similarity))
+        return similar
+
+
+class ProblemSearchIndex:
+    """
+    In-memory search over problem titles, title slugs and topic tags.
+    Matches are ranked by tier: exact frontend id, exact title or slug, title prefix,
+    every query word prefixing a title/slug word, and the same with tags included.
+    Queries matching none of these are treated as misspelled: each query word is
+    replaced by the indexed words most similar to it by trigrams, and problems are
+    ranked by how well their words cover the query. Ties go to the lower id.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, _Entry] = {}
+        self._slugs: Dict[str, int] = {}
+        # (normalized title, frontend id), sorted
+        self._titles: List[Tuple[str, int]] = []
+        self._words = _WordIndex()
+        self._all_words = _WordIndex(fuzzy=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, problems: Iterable[ProblemRecord]) -> None:
+        self._entries.clear()
+        self._slugs.clear()
+        self._titles.clear()
+        self._words = _WordIndex()
+        self._all_words = _WordIndex(fuzzy=True)
+        for problem in problems:
+            self.add(problem)
+
+    def add(self, problem: ProblemRecord) -> None:
+        """Indexes a problem, replacing any previous entry for the same frontend id."""
+        frontend_id = problem.problem_frontend_id
+        self.remove(frontend_id)
+        entry = _Entry(problem)
+        self._entries[frontend_id] = entry
+        if entry.slug:
+            self._slugs[entry.slug] = frontend_id
+        insort(self._titles, (entry.title, frontend_id))
+        for word in entry.words:
+            self._words.add(word, frontend_id)
+        for word in entry.words | entry.tag_words:
+            self._all_words.add(word, frontend_id)
+
+    def remove(self, problem_frontend_id: int) -> None:
+        entry = self._entries.pop(problem_frontend_id, None)
+        if entry is None:
+            return
+        if self._slugs.get(entry.slug) == problem_frontend_id:
+            del self._slugs[entry.slug]
+        del self._titles[bisect_left(self._titles, (entry.title, problem_frontend_id))]
+        for word in entry.words:
+            self._words.remove(word, problem_frontend_id)
+        for word in entry.words | entry.tag_words:
+            self._all_words.remove(word, problem_frontend_id)
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Returns up to limit frontend ids matching the query, best first."""
+        text = normalize(query)
+        if not text or limit < 1:
+            return []
+        tiers: Dict[int, int] = {}
+
+        def rank(ids: Iterable[int], tier: int) -> None:
+            for frontend_id in ids:
+                tiers.setdefault(frontend_id, tier)
+
+        if text.isdigit() and int(text) in self._entries:
+            rank((int(text),), _TIER_ID)
+        if (frontend_id := self._slugs.get(query.strip().casefold())) is not None:
+            rank((frontend_id,), _TIER_EXACT)
+        start = bisect_left(self._titles, (text,))
+        for title, frontend_id in self._titles[start : start + limit]:
+            if not title.startswith(text):
+                break
+            rank((frontend_id,), _TIER_EXACT if title == text else _TIER_TITLE_PREFIX)
+
+        words = list(dict.fromkeys(text.split()))
+        for tier, index in ((_TIER_WORDS, self._words), (_TIER_TAGS, self._all_words)):
+            if len(tiers) >= limit:
+                break
+            matches = index.prefix_ids(words[0])
+            for word in words[1:]:
+                if not matches:
+                    break
+                matches &= index.prefix_ids(word)
+            rank(heapq.nsmallest(limit + len(tiers), matches), tier)
+
+        if not tiers:
+            return self._fuzzy(words, limit)
+        ranked = sorted(
+            tiers, key=lambda frontend_id: (tiers[frontend_id], frontend_id)
+        )
+        return ranked[:limit]
+
+    def _fuzzy(self, words: List[str], limit: int) -> List[int]:
+        scores: Dict[int, float] = {}
+        for word in words:
+            best = dict.fromkeys(self._all_words.prefix_ids(word), 1.0)
+            if not best:
+                for similar, similarity in self._all_words.similar(word):
+                    for frontend_id in self._all_words.ids[similar]:
+                        if similarity > best.get(frontend_id, 0.0):
+                            best[frontend_id] = similarity
+            for frontend_id, similarity in best.items():
+                scores[frontend_id] = scores.get(frontend_id, 0.0) + similarity
+        min_score = _MIN_COVERAGE * len(words)
+        return [
+            frontend_id
+            for _, frontend_id in heapq.nsmallest(
+                limit,
+                (
+                    (-score, frontend_id)
+                    for frontend_id, score in scores.items()
+                    if score >= min_score
+                ),
+            )
+        ]
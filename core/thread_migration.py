@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from discord import ForumChannel, ForumTag
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
+
+from config.constants import (
+    thread_migration_chunk_size,
+    thread_migration_fetch_concurrency,
+)
+from core.problem_catalog import ProblemRecord
+from core.problem_threads import ProblemThreadsManager
+from db.database_manager import DatabaseManager
+from db.problem_threads import ProblemThreads
+from db.thread_migration import ThreadMigrationCheckpoint
+from utils.custom_exceptions import ForumChannelNotFound
+
+# Example thread name: "1. Two Sum"
+PROBLEM_NAME_REGEX = re.compile(r"^(\d+)\.\s")
+
+
+class MigrationError(Exception):
+    pass
+
+
+class MigrationProgress:
+    __slots__ = ("scanned", "migrated", "resumed", "completed")
+
+    def __init__(self, scanned: int = 0, migrated: int = 0, resumed: bool = False):
+        self.scanned = scanned
+        self.migrated = migrated
+        self.resumed = resumed
+        self.completed = False
+
+    def __str__(self) -> str:
+        return f"Scanned {self.scanned} LeetCode threads, migrated {self.migrated}."
+
+
+class _Chunk:
+    __slots__ = ("threads", "cursor")
+
+    def __init__(
+        self, threads: List[Tuple[int, int]], cursor: Optional[datetime]
+    ) -> None:
+        # (thread id, problem frontend id) pairs
+        self.threads = threads
+        # Archive timestamp of the last archived thread in the chunk, if any.
+        self.cursor = cursor
+
+
+ProgressCallback = Callable[[MigrationProgress], Awaitable[None]]
+
+
+class ThreadMigrator:
+    """
+    Imports existing LeetCode threads of a forum channel into the database.
+    Archived threads are paged from Discord while earlier chunks are resolved against
+    the problem cache and upserted, and the position in the archive is checkpointed
+    after every chunk so an interrupted migration resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        problem_threads_manager: ProblemThreadsManager,
+        logger: logging.Logger,
+        chunk_size: int = thread_migration_chunk_size,
+        fetch_concurrency: int = thread_migration_fetch_concurrency,
+    ) -> None:
+        self.database_manager = database_manager
+        self.problem_threads_manager = problem_threads_manager
+        self.logger = logger
+        self.chunk_size = chunk_size
+        self.fetch_concurrency = fetch_concurrency
+        self._running: Set[int] = set()
+
+    async def migrate(
+        self,
+        channel: ForumChannel,
+        on_progress: Optional[ProgressCallback] = None,
+        restart: bool = False,
+    ) -> MigrationProgress:
+        """
+        Migrates the channel's threads, resuming an unfinished run unless restart is set.
+        Raises ForumChannelNotFound or MigrationError if the migration cannot start.
+        """
+        if channel.id in self._running:
+            raise MigrationError("A migration for this channel is already running.")
+        self._running.add(channel.id)
+        try:
+            return await self._migrate(channel, on_progress, restart)
+        finally:
+            self._running.discard(channel.id)
+
+    async def _migrate(
+        self,
+        channel: ForumChannel,
+        on_progress: Optional[ProgressCallback],
+        restart: bool,
+    ) -> MigrationProgress:
+        forum_channel = await self.problem_threads_manager.get_forum_channel(
+            channel.guild.id
+        )
+        if forum_channel is None:
+            raise ForumChannelNotFound(
+                "Forum channel not set up in the database. Please set it up first."
+            )
+        leetcode_tag = next(
+            (tag for tag in channel.available_tags if tag.name.lower() == "leetcode"),
+            None,
+        )
+        if not leetcode_tag:
+            raise MigrationError("No tag named LeetCode found!")
+
+        checkpoint = await self.get_checkpoint(channel.id)
+        before = None
+        if checkpoint and not checkpoint.completed and not restart:
+            progress = MigrationProgress(
+                checkpoint.scanned, checkpoint.migrated, resumed=True
+            )
+            if checkpoint.archived_before:
+                # Re-read threads sharing the boundary timestamp; upserts are idempotent.
+                before = checkpoint.archived_before.replace(
+                    tzinfo=timezone.utc
+                ) + timedelta(milliseconds=1)
+            self.logger.info(
+                f"Resuming migration of channel {channel.id} from {before}."
+            )
+        else:
+            progress = MigrationProgress()
+        cursor = before
+
+        queue: asyncio.Queue[Optional[_Chunk]] = asyncio.Queue(maxsize=2)
+        producer = asyncio.create_task(
+            self._produce_chunks(channel, leetcode_tag, before, queue)
+        )
+        try:
+            while (chunk := await queue.get()) is not None:
+                progress.scanned += len(chunk.threads)
+                progress.migrated += await self._flush_chunk(chunk, forum_channel.id)
+                cursor = chunk.cursor or cursor
+                await self._save_checkpoint(channel, progress, cursor)
+                if on_progress:
+                    await on_progress(progress)
+            await producer
+        finally:
+            producer.cancel()
+
+        progress.completed = True
+        await self._save_checkpoint(channel, progress, cursor)
+        self.logger.info(f"Migration of channel {channel.id} completed: {progress}")
+        return progress
+
+    async def _produce_chunks(
+        self,
+        channel: ForumChannel,
+        leetcode_tag: ForumTag,
+        before: Optional[datetime],
+        queue: "asyncio.Queue[Optional[_Chunk]]",
+    ) -> None:
+        """
+        Pages through the channel's threads and queues them in chunks, ending with None.
+        If the consumer fails it cancels this task, which interrupts a blocked put.
+        """
+        try:
+            threads: List[Tuple[int, int]] = []
+
+            def collect(thread) -> None:
+                if leetcode_tag not in thread.applied_tags:
+                    return
+                if match := PROBLEM_NAME_REGEX.match(thread.name):
+                    threads.append((thread.id, int(match.group(1))))
+
+            # Active threads are already in memory and are always re-checked.
+            for thread in channel.threads:
+                collect(thread)
+            if threads:
+                await queue.put(_Chunk(threads, None))
+                threads = []
+
+            last_archived: Optional[datetime] = None
+            async for thread in channel.archived_threads(limit=None, before=before):
+                collect(thread)
+                last_archived = thread.archive_timestamp
+                if len(threads) >= self.chunk_size:
+                    await queue.put(_Chunk(threads, last_archived))
+                    threads = []
+            if threads or last_archived:
+                await queue.put(_Chunk(threads, last_archived))
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    async def _resolve_problems(
+        self, frontend_ids: Set[int]
+    ) -> Dict[int, ProblemRecord]:
+        """Looks problems up in the cache, fetching the few missing ones concurrently."""
+        problem_manager = self.problem_threads_manager.leetcode_problem_manager
+        resolved = {
+            frontend_id: problem
+            for frontend_id in frontend_ids
+            if (problem := problem_manager.all_problem_cache.get(frontend_id))
+        }
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def fetch(frontend_id: int) -> None:
+            async with semaphore:
+                try:
+                    result = await problem_manager.get_problem_with_frontend_id(
+                        frontend_id
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Skipping threads for problem {frontend_id}", exc_info=e
+                    )
+                    return
+            if result and isinstance(problem := result["problem"], ProblemRecord):
+                resolved[frontend_id] = problem
+
+        await asyncio.gather(*(fetch(i) for i in frontend_ids - resolved.keys()))
+        return resolved
+
+    async def _flush_chunk(self, chunk: _Chunk, forum_channel_db_id: int) -> int:
+        problems = await self._resolve_problems(
+            {frontend_id for _, frontend_id in chunk.threads}
+        )
+        problem_threads = {
+            thread_id: ProblemThreads(
+                thread_id=thread_id,
+                problem_db_id=problems[frontend_id].id,
+                forum_channel_db_id=forum_channel_db_id,
+            )
+            for thread_id, frontend_id in chunk.threads
+            if frontend_id in problems
+        }
+        if not problem_threads:
+            return 0
+        return await self.problem_threads_manager.bulk_upsert_thread_to_db(
+            problem_threads
+        )
+
+    async def get_checkpoint(
+        self, channel_id: int
+    ) -> Optional[ThreadMigrationCheckpoint]:
+        async with self.database_manager.session() as db:
+            stmt = select(ThreadMigrationCheckpoint).where(
+                ThreadMigrationCheckpoint.channel_id == channel_id
+            )
+            return (await db.execute(stmt)).scalars().first()
+
+    async def _save_checkpoint(
+        self,
+        channel: ForumChannel,
+        progress: MigrationProgress,
+        cursor: Optional[datetime],
+    ) -> None:
+        values = {
+            "channel_id": channel.id,
+            "guild_id": channel.guild.id,
+            "archived_before": (
+                cursor.astimezone(timezone.utc).replace(tzinfo=None) if cursor else None
+            ),
+            "scanned": progress.scanned,
+            "migrated": progress.migrated,
+            "completed": progress.completed,
+            "updated_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        }
+        insert_stmt = sqlite_upsert(ThreadMigrationCheckpoint).values(**values)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["channel_id"],
+            set_={key: insert_stmt.excluded[key] for key in values},
+        )
+        async with self.database_manager.session() as db:
+            await db.execute(insert_stmt)
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Literal, Optional, Tuple
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
+
+from config.constants import (
+    user_cache_max_size,
+    user_cache_persist,
+    user_cache_stale_ttl,
+    user_cache_ttl,
+)
+from core.leetcode_api import LeetCodeAPI
+from db.database_manager import DatabaseManager
+from db.user_cache import CachedUserPayload
+from utils.ttl_cache import TTLCache
+
+UserPayloadKind = Literal["info", "submissions"]
+
+
+def _to_db_time(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _from_db_time(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class UserProfileManager:
+    """
+    Caches LeetCode user info and submissions for /statistics and leaderboards.
+    Fresh entries are served from memory; stale ones are served immediately while a
+    background refresh replaces them (stale-while-revalidate). With persist set, the
+    entries are also written to the database and reloaded by init_cache; the table is
+    pruned to the entries the caches could still serve.
+    """
+
+    def __init__(
+        self,
+        leetcode_api: LeetCodeAPI,
+        database_manager: DatabaseManager,
+        logger: logging.Logger,
+        max_size: int = user_cache_max_size,
+        ttl: float = user_cache_ttl,
+        stale_ttl: float = user_cache_stale_ttl,
+        persist: bool = user_cache_persist,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.leetcode_api = leetcode_api
+        self.database_manager = database_manager
+        self.logger = logger
+        self.persist = persist
+        self.caches: Dict[UserPayloadKind, TTLCache[str, dict]] = {
+            kind: TTLCache(f"user_{kind}", max_size, ttl, stale_ttl, clock=clock)
+            for kind in ("info", "submissions")
+        }
+        self._clock = clock
+        self._refreshing: Dict[Tuple[UserPayloadKind, str], asyncio.Task] = {}
+
+    async def init_cache(self) -> None:
+        """Loads the persisted entries that are still servable, newest last."""
+        if not self.persist:
+            return
+        for kind, cache in self.caches.items():
+            oldest = self._clock() - cache.ttl - cache.stale_ttl
+            async with self.database_manager.session() as db:
+                await self._prune(db, kind)
+                stmt = (
+                    select(CachedUserPayload)
+                    .where(
+                        CachedUserPayload.kind == kind,
+                        CachedUserPayload.fetched_at >= _to_db_time(oldest),
+                    )
+                    .order_by(CachedUserPayload.fetched_at.desc())
+                    .limit(cache.max_size)
+                )
+                rows = (await db.execute(stmt)).scalars().all()
+            for row in reversed(rows):
+                cache.set(
+                    row.username,
+                    json.loads(row.payload),
+                    stored_at=_from_db_time(row.fetched_at),
+                )
+            self.logger.info(f"Loaded {len(rows)} cached LeetCode user {kind} entries.")
+
+    async def get_user_info(self, username: str) -> dict:
+        return await self._get(
+            "info", username, lambda: self.leetcode_api.user_info(username)
+        )
+
+    def peek_user_info(self, username: str) -> Optional[dict]:
+        """
+        Returns the cached user info without waiting on LeetCode, or None on a miss.
+        A stale entry is returned and refreshed in the background.
+        """
+        return self._peek(
+            "info", username, lambda: self.leetcode_api.user_info(username)
+        )
+
+    async def get_user_submissions(self, username: str) -> dict:
+        return await self._get(
+            "submissions", username, lambda: self.leetcode_api.user_submission(username)
+        )
+
+    async def fetch_user_info(self, username: str) -> dict:
+        """Fetches user info from LeetCode, bypassing but updating the cache."""
+        return await self._load(
+            "info", username.casefold(), lambda: self.leetcode_api.user_info(username)
+        )
+
+    async def fetch_user_submissions(self, username: str) -> dict:
+        """Fetches recent submissions from LeetCode, bypassing but updating the cache."""
+        return await self._load(
+            "submissions",
+            username.casefold(),
+            lambda: self.leetcode_api.user_submission(username),
+        )
+
+    async def _get(
+        self,
+        kind: UserPayloadKind,
+        username: str,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        value = self._peek(kind, username, fetch)
+        if value is None:
+            return await self._load(kind, username.casefold(), fetch)
+        return value
+
+    def _peek(
+        self,
+        kind: UserPayloadKind,
+        username: str,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> Optional[dict]:
+        key = username.casefold()
+        value, fresh = self.caches[kind].lookup(key)
+        if value is not None and not fresh:
+            self._revalidate(kind, key, fetch)
+        return value
+
+    async def _load(
+        self, kind: UserPayloadKind, key: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        # Concurrent loads of a user are coalesced by LeetCodeAPI.
+        value = await fetch()
+        fetched_at = self._clock()
+        self.caches[kind].set(key, value, stored_at=fetched_at)
+        if self.persist:
+            await self._save(kind, key, value, fetched_at)
+        return value
+
+    def _revalidate(
+        self, kind: UserPayloadKind, key: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> None:
+        if (kind, key) in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._load(kind, key, fetch)
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to refresh LeetCode user {kind} for {key}", exc_info=e
+                )
+            finally:
+                del self._refreshing[(kind, key)]
+
+        self._refreshing[(kind, key)] = asyncio.create_task(
+            refresh(), name=f"refresh-user-{kind}-{key}"
+        )
+
+    async def _save(
+        self, kind: UserPayloadKind, key: str, value: dict, fetched_at: float
+    ) -> None:
+        values = {
+            "kind": kind,
+            "username": key,
+            "payload": json.dumps(value),
+            "fetched_at": _to_db_time(fetched_at),
+        }
+        insert_stmt = sqlite_upsert(CachedUserPayload).values(**values)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["kind", "username"],
+            set_={
+                "payload": insert_stmt.excluded.payload,
+                "fetched_at": insert_stmt.excluded.fetched_at,
+            },
+        )
+        try:
+            async with self.database_manager.session() as db:
+                await db.execute(insert_stmt)
+                await self._prune(db, kind)
+        except Exception as e:
+            self.logger.warning(f"Failed to persist LeetCode user {kind}", exc_info=e)
+
+    async def _prune(self, db: AsyncSession, kind: UserPayloadKind) -> None:
+        """
+        Deletes persisted entries that expired, or that fall beyond the cache size
+        (oldest first), so the table stays as bounded as the cache.
+        """
+        cache = self.caches[kind]
+        oldest = self._clock() - cache.ttl - cache.stale_ttl
+        newest = (
+            select(CachedUserPayload.id)
+            .where(CachedUserPayload.kind == kind)
+            .order_by(CachedUserPayload.fetched_at.desc())
+            .limit(cache.max_size)
+        )
+        stmt = delete(CachedUserPayload).where(
+            CachedUserPayload.kind == kind,
+            or_(
+                CachedUserPayload.fetched_at < _to_db_time(oldest),
+                CachedUserPayload.id.not_in(newest),
+            ),
+        )
+        pruned = (await db.execute(stmt)).rowcount
+        if pruned:
+            self.logger.debug(
+                "Pruned %d persisted LeetCode user %s entries.", pruned, kind
+            )
+
+    def cache_stats(self) -> Dict[str, dict]:
+        return {cache.name: cache.stats.to_dict() for cache in self.caches.values()}
@@ -0,0 +1,36 @@
+from datetime import datetime
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class CommandTreeSync(Base):
+    """Hash of the application command payload last synced to Discord."""
+
+    __tablename__ = "command_tree_syncs"
+    __table_args__ = (
+        Index(
+            "ix_command_tree_syncs_application_guild",
+            "application_id",
+            "guild_id",
+            unique=True,
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    application_id: Mapped[int] = mapped_column(nullable=False)
+    # 0 for global commands
+    guild_id: Mapped[int] = mapped_column(nullable=False)
+    tree_hash: Mapped[str] = mapped_column(nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "application_id": self.application_id,
+            "guild_id": self.guild_id,
+            "tree_hash": self.tree_hash,
+            "synced_at": self.synced_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"CommandTreeSync(id={self.id}, application_id={self.application_id}, guild_id={self.guild_id}, tree_hash={self.tree_hash}, synced_at={self.synced_at})"
@@ -1,48 +1,96 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from discord import Client
 from discord.ext.commands import Bot
-from sqlalchemy import Engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
 import logging
 
+from config.constants import db_pool_size, db_max_overflow, db_busy_timeout
+
+
+def create_database_engine(database_url: str, echo: bool = False) -> AsyncEngine:
+    """
+    Creates the async engine for the bot.
+    Plain sqlite URLs are switched to the aiosqlite driver. File databases use WAL
+    so readers are not blocked by the writer, and a busy timeout so concurrent
+    writers wait for the lock instead of failing.
+    """
+    url = make_url(database_url)
+    if url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    if not url.drivername.startswith("sqlite"):
+        return create_async_engine(
+            url,
+            echo=echo,
+            hide_parameters=True,
+            pool_size=db_pool_size,
+            max_overflow=db_max_overflow,
+            pool_pre_ping=True,
+        )
+
+    in_memory = url.database in (None, "", ":memory:")
+    if in_memory:
+        engine = create_async_engine(
+            url, echo=echo, hide_parameters=True, poolclass=StaticPool
+        )
+    else:
+        engine = create_async_engine(
+            url,
+            echo=echo,
+            hide_parameters=True,
+            pool_size=db_pool_size,
+            max_overflow=db_max_overflow,
+            connect_args={"timeout": db_busy_timeout},
+        )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(db_busy_timeout * 1000)}")
+        cursor.close()
+
+    return engine
+
 
 class DatabaseManager:
-    def __init__(self, bot: Bot | Client, engine: Engine, logger: logging.Logger):
+    def __init__(self, bot: Bot | Client, engine: AsyncEngine, logger: logging.Logger):
         self.bot = bot
         self.engine = engine
-        self.session = None
         self.logger = logger
+        self._session_factory = async_sessionmaker(
+            bind=engine, autoflush=True, expire_on_commit=False
+        )
 
-    def __enter__(self):
-        """Returns a database session"""
-        try:
-            Session = sessionmaker(
-                bind=self.engine, autoflush=True, expire_on_commit=False
-            )
-            self.logger.debug("Creating new database session...")
-            self.session = Session()
-            return self.session
-        except Exception as e:
-            self.logger.error("Database connection error", exc_info=e)
-            raise
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
         """
-        Commits or rollback a session
+        Yields a new database session owned by the caller, so concurrent tasks never
+        share one. Commits when the block exits normally, rolls back on error.
         """
-        try:
-            assert self.session
-            self.logger.debug("Closing database session...")
-            if exc_type:
+        self.logger.debug("Creating new database session...")
+        async with self._session_factory() as session:
+            try:
+                yield session
+            except Exception as e:
                 self.logger.error(
-                    f"Exception occurred: {exc_val}. Rolling back session...",
-                    exc_info=exc_val,
+                    f"Exception occurred: {e}. Rolling back session...",
+                    exc_info=e,
                 )
-                self.session.rollback()
+                await session.rollback()
+                raise
             else:
-                self.session.commit()
-            self.session.close()
-        except AssertionError:
-            self.logger.error("Database session was not initialized correctly.")
-            return True
-        finally:
-            return False
+                await session.commit()
+            finally:
+                self.logger.debug("Closing database session...")
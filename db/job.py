@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class JobRecord(Base):
+    __tablename__ = "jobs"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(nullable=False)
+    # Jobs with the same key are deduplicated while one of them is active.
+    key: Mapped[str] = mapped_column(nullable=False, index=True)
+    # Null for global jobs.
+    guild_id: Mapped[int] = mapped_column(nullable=True)
+    status: Mapped[str] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    started_at: Mapped[datetime] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(nullable=True)
+    error: Mapped[str] = mapped_column(nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "key": self.key,
+            "guild_id": self.guild_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"JobRecord(id={self.id}, name={self.name}, key={self.key}, status={self.status})"
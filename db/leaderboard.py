@@ -0,0 +1,70 @@
+from datetime import date, datetime
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class LeetCodeAccount(Base):
+    """Links a guild member to a LeetCode username."""
+
+    __tablename__ = "leetcode_accounts"
+    __table_args__ = (
+        Index("ix_leetcode_accounts_guild_user", "guild_id", "user_id", unique=True),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    guild_id: Mapped[int] = mapped_column(nullable=False)
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    # Case-folded LeetCode username
+    username: Mapped[str] = mapped_column(nullable=False, index=True)
+    linked_at: Mapped[datetime] = mapped_column(nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "guild_id": self.guild_id,
+            "user_id": self.user_id,
+            "username": self.username,
+            "linked_at": self.linked_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"LeetCodeAccount(id={self.id}, guild_id={self.guild_id}, user_id={self.user_id}, username={self.username})"
+
+
+class LeetCodeUserStats(Base):
+    """Solved counts and streaks of a LeetCode user, shared by every guild linking it."""
+
+    __tablename__ = "leetcode_user_stats"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    username: Mapped[str] = mapped_column(nullable=False, unique=True)
+    easy: Mapped[int] = mapped_column(nullable=False, default=0)
+    medium: Mapped[int] = mapped_column(nullable=False, default=0)
+    hard: Mapped[int] = mapped_column(nullable=False, default=0)
+    current_streak: Mapped[int] = mapped_column(nullable=False, default=0)
+    longest_streak: Mapped[int] = mapped_column(nullable=False, default=0)
+    # UTC day of the latest accepted submission
+    last_solved_on: Mapped[date] = mapped_column(nullable=True)
+    # Timestamp of the latest accepted submission already counted in the streak
+    last_submission_at: Mapped[int] = mapped_column(nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False)
+
+    @property
+    def total(self) -> int:
+        return self.easy + self.medium + self.hard
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "username": self.username,
+            "easy": self.easy,
+            "medium": self.medium,
+            "hard": self.hard,
+            "current_streak": self.current_streak,
+            "longest_streak": self.longest_streak,
+            "last_solved_on": self.last_solved_on,
+            "last_submission_at": self.last_submission_at,
+            "updated_at": self.updated_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"LeetCodeUserStats(id={self.id}, username={self.username}, easy={self.easy}, medium={self.medium}, hard={self.hard}, current_streak={self.current_streak})"
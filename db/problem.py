@@ -1,3 +1,6 @@
+import hashlib
+from typing import Iterable
+
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.schema import Column, ForeignKey, Table
 from db.base import Base
@@ -28,6 +31,23 @@ class Problem(Base):
         cascade="all, delete",
     )
     premium: Mapped[bool] = mapped_column(nullable=False, default=False)
+    content_hash: Mapped[str] = mapped_column(nullable=True)
+
+    def compute_content_hash(self, tag_names: Iterable[str]) -> str:
+        """
+        Hash of the problem's content and tag names, used to detect changes on refresh.
+        """
+        fields = (
+            self.problem_id,
+            self.problem_frontend_id,
+            self.title,
+            self.url,
+            self.difficulty,
+            self.description,
+            bool(self.premium),
+            *sorted(tag_names),
+        )
+        return hashlib.sha1("\x1f".join(map(str, fields)).encode()).hexdigest()
 
     def to_dict(self) -> dict:
         return {
@@ -40,6 +60,7 @@ class Problem(Base):
             "description": self.description,
             "tags": [tag.to_dict() for tag in self.tags],
             "premium": self.premium,
+            "content_hash": self.content_hash,
         }
 
     def __repr__(self) -> str:
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from db.problem import Problem
 from db.base import Base
@@ -7,6 +7,14 @@ from db.thread_channel import GuildForumChannel
 
 class ProblemThreads(Base):
     __tablename__ = "problem_threads"
+    __table_args__ = (
+        Index(
+            "ix_problem_threads_channel_problem",
+            "forum_channel_db_id",
+            "problem_db_id",
+            unique=True,
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     problem_db_id: Mapped[int] = mapped_column(
         ForeignKey(Problem.id, ondelete="CASCADE"), nullable=False
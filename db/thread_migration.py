@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class ThreadMigrationCheckpoint(Base):
+    __tablename__ = "thread_migration_checkpoints"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    channel_id: Mapped[int] = mapped_column(nullable=False, unique=True)
+    guild_id: Mapped[int] = mapped_column(nullable=False)
+    # Archive timestamp (UTC) of the last archived thread that was flushed.
+    archived_before: Mapped[datetime] = mapped_column(nullable=True)
+    scanned: Mapped[int] = mapped_column(nullable=False, default=0)
+    migrated: Mapped[int] = mapped_column(nullable=False, default=0)
+    completed: Mapped[bool] = mapped_column(nullable=False, default=False)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "channel_id": self.channel_id,
+            "guild_id": self.guild_id,
+            "archived_before": self.archived_before,
+            "scanned": self.scanned,
+            "migrated": self.migrated,
+            "completed": self.completed,
+            "updated_at": self.updated_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"ThreadMigrationCheckpoint(id={self.id}, channel_id={self.channel_id}, guild_id={self.guild_id}, archived_before={self.archived_before}, scanned={self.scanned}, migrated={self.migrated}, completed={self.completed})"
@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+
+class CachedUserPayload(Base):
+    """Last LeetCode user info/submissions response, kept to warm the cache on restart."""
+
+    __tablename__ = "leetcode_user_cache"
+    __table_args__ = (
+        Index("ix_leetcode_user_cache_kind_username", "kind", "username", unique=True),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # "info" or "submissions"
+    kind: Mapped[str] = mapped_column(nullable=False)
+    # Case-folded LeetCode username
+    username: Mapped[str] = mapped_column(nullable=False)
+    # JSON response body
+    payload: Mapped[str] = mapped_column(nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "username": self.username,
+            "payload": self.payload,
+            "fetched_at": self.fetched_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"CachedUserPayload(id={self.id}, kind={self.kind}, username={self.username}, fetched_at={self.fetched_at})"
@@ -1,18 +1,22 @@
+from utils.startup_profile import startup_profile
 import logging
 import discord
 import signal
 from discord.ext import commands
-from config.constants import command_prefix, MY_GUILD
-from config.secrets import bot_token, DATABASE_URL
+from config.constants import command_prefix, MY_GUILD, problem_snapshot_path
+from config import secrets
 import asyncio
 from core.problem_threads import ProblemThreadsManager
 from db.base import Base
 from core.leetcode_problem import LeetCodeProblemManager
 from core.leetcode_api import LeetCodeAPI
-from db.database_manager import DatabaseManager
-from sqlalchemy import create_engine
+from core.thread_migration import ThreadMigrator
+from core.jobs import JobScheduler
+from core.user_profiles import UserProfileManager
+from core.leaderboard import LeaderboardManager
+from core.command_sync import CommandTreeSyncer
+from db.database_manager import DatabaseManager, create_database_engine
 import os
-from config.secrets import debug
 from config.logger import setup_logger
 
 
@@ -25,39 +29,80 @@ class LeetCodeBot(commands.Bot):
         super().__init__(command_prefix=command_prefix, intents=intents)
         print("Initializing LeetCodeBot...")
         self.logger = logging.getLogger("LeetCodeBot")
-        self.engine = create_engine(DATABASE_URL, echo=debug, hide_parameters=True)
+        # Secrets are read here rather than at import, so loading main stays cheap.
+        self.engine = create_database_engine(secrets.DATABASE_URL, echo=secrets.debug)
         self.database_manager = DatabaseManager(self, self.engine, logger=self.logger)
         self.leetcode_api = LeetCodeAPI(logger=self.logger)
         self.leetcode_problem_manger = LeetCodeProblemManager(
             leetcode_api=self.leetcode_api,
             database_manager=self.database_manager,
             logger=self.logger,
+            snapshot_path=problem_snapshot_path,
         )
         self.problem_threads_manager = ProblemThreadsManager(
             self.database_manager,
             leetcode_problem_manager=self.leetcode_problem_manger,
             logger=self.logger,
         )
+        self.thread_migrator = ThreadMigrator(
+            self.database_manager,
+            self.problem_threads_manager,
+            logger=self.logger,
+        )
+        self.user_profile_manager = UserProfileManager(
+            self.leetcode_api, self.database_manager, logger=self.logger
+        )
+        self.leaderboard_manager = LeaderboardManager(
+            self.user_profile_manager, self.database_manager, logger=self.logger
+        )
+        self.job_scheduler = JobScheduler(self.database_manager, logger=self.logger)
+        self.command_syncer = CommandTreeSyncer(
+            self.tree, self.database_manager, logger=self.logger
+        )
 
     async def setup_hook(self) -> None:
+        startup_profile.mark("login")
+        await self.leetcode_api.start()
         self.logger.info("Loading cogs...")
         for cog in os.listdir("cogs"):
             if cog.endswith(".py") and not cog.startswith("_"):
                 await self.load_extension(f"cogs.{cog[:-3]}")
         self.logger.info("Cogs loaded.")
+        startup_profile.mark("cogs")
         self.logger.info("Initializing caches...")
-        await self.leetcode_problem_manger.init_cache()
-        await self.problem_threads_manager.init_cache()
+        # The caches read separate tables, so they load concurrently.
+        await asyncio.gather(
+            self.leetcode_problem_manger.init_cache(),
+            self.problem_threads_manager.init_cache(),
+            self.user_profile_manager.init_cache(),
+            self.leaderboard_manager.init_cache(),
+        )
         self.logger.info("Caches initialized.")
+        startup_profile.mark("caches")
+        await self.job_scheduler.recover()
+        startup_profile.mark("jobs")
 
     async def close(self) -> None:
         await super().close()
-        self.engine.dispose()
+        await self.job_scheduler.shutdown()
+        await self.leetcode_api.close()
+        await self.engine.dispose()
 
     async def on_ready(self):
+        startup_profile.mark("gateway")
         self.tree.copy_global_to(guild=MY_GUILD)
-        await self.tree.sync(guild=MY_GUILD)
+        # READY fires again on every reconnect; unchanged trees are not re-synced.
+        await self.command_syncer.sync(guild=MY_GUILD)
+        startup_profile.mark("command sync")
         self.logger.info("Logged in as %s!", self.user)
+        startup_profile.report(
+            self.logger, extra={"command sync": self.command_syncer.stats.to_dict()}
+        )
+        # Built in a worker thread after ready, so neither boot nor the gateway waits.
+        asyncio.create_task(
+            self.leetcode_problem_manger.build_search_indexes(),
+            name="build-search-indexes",
+        )
         await self.change_presence(
             status=discord.Status.online,
             activity=discord.Activity(
@@ -68,7 +113,9 @@ class LeetCodeBot(commands.Bot):
 
 
 async def main():
+    startup_profile.mark("imports")
     bot = LeetCodeBot()
+    startup_profile.mark("bot init")
 
     async def shutdown(sig: signal.Signals, loop: asyncio.AbstractEventLoop):
         if sig:
@@ -88,13 +135,15 @@ async def main():
             sig, lambda s=sig: asyncio.create_task(shutdown(s, loop))
         )
 
-    if debug:
+    if secrets.debug:
         setup_logger(log_level=logging.DEBUG)
     else:
         setup_logger(log_level=logging.INFO)
-    Base.metadata.create_all(bind=bot.engine)
+    async with bot.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    startup_profile.mark("database schema")
     try:
-        await bot.start(token=bot_token)
+        await bot.start(token=secrets.bot_token)
     except asyncio.CancelledError:
         bot.logger.info("Bot shutdown initiated...")
     except Exception as e:
@@ -1,10 +1,58 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from config.secrets import DATABASE_URL
 
 engine = create_engine(DATABASE_URL)
 
+# Columns added to existing tables after their creation. create_all() only creates
+# missing tables, so these are applied here if the column does not exist yet.
+COLUMN_MIGRATIONS = [
+    ("problems", "premium", "BOOLEAN NOT NULL DEFAULT 0"),
+    ("problems", "content_hash", "VARCHAR"),
+    ("jobs", "guild_id", "BIGINT"),
+]
+
+# Indexes added to existing tables: (table, index name, columns, unique).
+# Rows that would violate a new unique index are removed first, keeping the oldest.
+INDEX_MIGRATIONS = [
+    (
+        "problem_threads",
+        "ix_problem_threads_channel_problem",
+        ("forum_channel_db_id", "problem_db_id"),
+        True,
+    ),
+]
+
 with engine.connect() as conn:
-    sql = text("ALTER TABLE problems ADD COLUMN premium BOOLEAN NOT NULL DEFAULT 0;")
-    conn.execute(sql)
-    conn.commit()
-    print("Migration successful: Added 'premium' column.")
+    inspector = inspect(conn)
+    for table, column, ddl in COLUMN_MIGRATIONS:
+        existing = {col["name"] for col in inspector.get_columns(table)}
+        if column in existing:
+            print(f"Skipping '{table}.{column}': already exists.")
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl};"))
+        conn.commit()
+        print(f"Migration successful: Added '{table}.{column}' column.")
+
+    for table, name, columns, unique in INDEX_MIGRATIONS:
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        if name in existing:
+            print(f"Skipping index '{name}': already exists.")
+            continue
+        column_list = ", ".join(columns)
+        if unique:
+            removed = conn.execute(
+                text(
+                    f"DELETE FROM {table} WHERE id NOT IN "
+                    f"(SELECT MIN(id) FROM {table} GROUP BY {column_list});"
+                )
+            ).rowcount
+            if removed:
+                print(f"Removed {removed} duplicate rows from '{table}'.")
+        conn.execute(
+            text(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} "
+                f"ON {table} ({column_list});"
+            )
+        )
+        conn.commit()
+        print(f"Migration successful: Added index '{name}' on '{table}'.")
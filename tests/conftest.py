@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock
 import logging
 from db.base import Base
+from db.database_manager import DatabaseManager, create_database_engine
 from db import problem  # Ensure models are loaded for SQLAlchemy's registry
 
 
@@ -15,3 +16,13 @@ def setup_sqlalchemy_mappers():
 @pytest.fixture
 def mock_logger():
     return MagicMock(spec=logging.Logger)
+
+
+@pytest.fixture
+async def sqlite_db_manager(mock_logger, tmp_path):
+    """A DatabaseManager backed by a fresh SQLite database file."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'bot.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield DatabaseManager(MagicMock(), engine, logger=mock_logger)
+    await engine.dispose()
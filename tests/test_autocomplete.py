@@ -0,0 +1,69 @@
+from core.autocomplete import ProblemAutocomplete
+from db.problem import Problem, TopicTags
+
+
+def _problem(frontend_id, title, tags=()):
+    problem = Problem(
+        problem_frontend_id=frontend_id,
+        problem_id=frontend_id * 10,
+        title=title,
+        difficulty=0,
+        url=f"url{frontend_id}",
+        description="desc",
+        premium=False,
+    )
+    problem.tags = [TopicTags(tag_name=name) for name in tags]
+    return problem
+
+
+def _autocomplete():
+    autocomplete = ProblemAutocomplete(limit=3)
+    autocomplete.rebuild(
+        [
+            _problem(1, "Two Sum", ["Array", "Hash Table"]),
+            _problem(15, "3Sum", ["Array", "Two Pointers"]),
+            _problem(150, "Evaluate Reverse Polish Notation", ["Stack"]),
+            _problem(167, "Two Sum II - Input Array Is Sorted", ["Array"]),
+        ]
+    )
+    return autocomplete
+
+
+def test_problem_ids_match_ids_titles_and_title_words():
+    autocomplete = _autocomplete()
+
+    assert autocomplete.problem_ids("15") == [15, 150]
+    assert autocomplete.problem_ids("1") == [1, 15, 150]
+    assert autocomplete.problem_ids("Two S") == [1, 167]
+    assert autocomplete.problem_ids("two sum ii") == [167]
+    assert autocomplete.problem_ids("polish") == [150]
+    assert autocomplete.problem_ids("sorted") == [167]
+    assert autocomplete.problem_ids("zzz") == []
+
+
+def test_tag_names_follow_problems():
+    autocomplete = _autocomplete()
+
+    assert autocomplete.tag_names("") == ["Array", "Hash Table", "Stack"]
+    assert autocomplete.tag_names("ta") == ["Hash Table"]
+    assert autocomplete.tag_names("point") == ["Two Pointers"]
+
+    autocomplete.remove(15)
+    assert autocomplete.tag_names("point") == []
+    assert autocomplete.tag_names("arr") == ["Array"]
+    autocomplete.add(_problem(1, "Two Sum", ["Stack"]))
+    autocomplete.remove(167)
+    assert autocomplete.tag_names("arr") == []
+
+
+def test_answers_are_cached_until_problems_change():
+    autocomplete = _autocomplete()
+    stats = autocomplete.caches["problems"].stats
+
+    assert autocomplete.problem_ids("two") == [1, 167]
+    assert autocomplete.problem_ids("Two ") == [1, 167]
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    autocomplete.add(_problem(2, "Two Pointers Intro"))
+    assert autocomplete.problem_ids("two") == [1, 2, 167]
+    assert (stats.hits, stats.misses) == (1, 2)
@@ -0,0 +1,25 @@
+import pytest
+
+from utils.bitset import IdBitset
+
+
+def test_add_discard_and_membership():
+    bits = IdBitset([3, 8, 1000])
+    bits.add(8)
+
+    assert len(bits) == 3
+    assert 3 in bits and 8 in bits and 1000 in bits
+    assert 4 not in bits and 5000 not in bits and -1 not in bits
+    assert list(bits) == [3, 8, 1000]
+
+    bits.discard(8)
+    bits.discard(8)
+    bits.discard(99999)
+    assert len(bits) == 2
+    assert 8 not in bits
+    assert list(bits) == [3, 1000]
+
+
+def test_rejects_negative_ids():
+    with pytest.raises(ValueError):
+        IdBitset().add(-1)
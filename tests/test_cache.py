@@ -0,0 +1,77 @@
+import pytest
+
+from utils.cache import LookupCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_writes_through_and_counts():
+    cache = LookupCache("test", negative_ttl=60)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return "value"
+
+    assert await cache.get_or_load(1, load) == "value"
+    assert await cache.get_or_load(1, load) == "value"
+    assert len(calls) == 1
+    assert cache[1] == "value" and 1 in cache and len(cache) == 1
+    assert cache.stats.to_dict() == {
+        "hits": 1,
+        "negative_hits": 0,
+        "misses": 1,
+        "loads": 1,
+        "invalidations": 0,
+        "hit_rate": 0.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_negative_entries_expire_and_are_cleared_by_writes():
+    clock = FakeClock()
+    cache = LookupCache("test", negative_ttl=60, clock=clock)
+    results = [None, None, "found"]
+
+    async def load():
+        return results.pop(0)
+
+    assert await cache.get_or_load(7, load) is None
+    assert await cache.get_or_load(7, load) is None
+    assert cache.stats.negative_hits == 1
+    assert 7 not in cache
+
+    clock.now = 61
+    assert await cache.get_or_load(7, load) is None
+    assert cache.stats.loads == 2
+
+    cache.set(7, "written")
+    assert await cache.get_or_load(7, load) == "written"
+
+    cache.invalidate(7)
+    assert await cache.get_or_load(7, load) == "found"
+
+
+@pytest.mark.asyncio
+async def test_expired_negative_entries_are_swept():
+    clock = FakeClock()
+    cache = LookupCache("test", negative_ttl=60, clock=clock)
+
+    async def load():
+        return None
+
+    for key in range(1000):
+        await cache.get_or_load(f"typo{key}", load)
+        clock.now += 1
+
+    # Only the misses of the last negative_ttl seconds are kept.
+    assert len(cache._missing) == 60
+    assert await cache.get_or_load("typo999", load) is None
+    assert cache.stats.negative_hits == 1
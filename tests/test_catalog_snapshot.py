@@ -0,0 +1,62 @@
+from core.catalog_snapshot import CatalogSnapshot, catalog_fingerprint
+from core.problem_catalog import ProblemRecord
+from db.problem import Problem, TopicTags
+
+
+def make_record(frontend_id, title, tags=(), premium=False, content_hash="h"):
+    problem = Problem(
+        id=frontend_id * 10,
+        problem_id=frontend_id * 100,
+        problem_frontend_id=frontend_id,
+        title=title,
+        url=f"https://leetcode.com/problems/p-{frontend_id}/",
+        difficulty=frontend_id % 3,
+        premium=premium,
+        content_hash=content_hash,
+    )
+    problem.tags = [TopicTags(tag_name=name) for name in tags]
+    return ProblemRecord.from_orm(problem)
+
+
+def fingerprint_of(records):
+    return catalog_fingerprint((r.id, r.content_hash) for r in records)
+
+
+def test_snapshot_round_trip(tmp_path, mock_logger):
+    records = [
+        make_record(1, "Two Sum", ["Array", "Hash Table"]),
+        make_record(2, "Ünïcode Tïtle", ["Hash Table"], premium=True),
+        make_record(3, "No Tags", content_hash=None),
+    ]
+    snapshot = CatalogSnapshot(
+        str(tmp_path / "cache" / "catalog.snapshot"), mock_logger
+    )
+    snapshot.save(records)
+
+    loaded = snapshot.load(fingerprint_of(records))
+
+    assert [r.to_dict() for r in loaded] == [r.to_dict() for r in records]
+    assert [r.tags for r in loaded] == [r.tags for r in records]
+
+
+def test_empty_catalog_round_trip(tmp_path, mock_logger):
+    snapshot = CatalogSnapshot(str(tmp_path / "catalog.snapshot"), mock_logger)
+    snapshot.save([])
+    assert snapshot.load(fingerprint_of([])) == []
+
+
+def test_missing_stale_or_corrupt_snapshot_is_ignored(tmp_path, mock_logger):
+    path = tmp_path / "catalog.snapshot"
+    snapshot = CatalogSnapshot(str(path), mock_logger)
+    records = [make_record(1, "Two Sum", ["Array"])]
+    assert snapshot.load(fingerprint_of(records)) is None
+
+    snapshot.save(records)
+    changed = [make_record(1, "Two Sum", ["Array"], content_hash="other")]
+    assert snapshot.load(fingerprint_of(changed)) is None
+
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) // 2])
+    assert snapshot.load(fingerprint_of(records)) is None
+    path.write_bytes(b"not a snapshot" * 20)
+    assert snapshot.load(fingerprint_of(records)) is None
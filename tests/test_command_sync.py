@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+from discord import app_commands
+
+from core.command_sync import CommandTreeSyncer
+
+GUILD = discord.Object(1234)
+
+
+async def ping(interaction: discord.Interaction) -> None:
+    pass
+
+
+async def pong(interaction: discord.Interaction) -> None:
+    pass
+
+
+def make_tree(*names):
+    client = discord.Client(intents=discord.Intents.none())
+    client._connection.application_id = 42
+    tree = app_commands.CommandTree(client)
+    for name in names:
+        tree.add_command(
+            app_commands.Command(name=name, description=name, callback=ping)
+        )
+    tree.copy_global_to(guild=GUILD)
+    tree.sync = AsyncMock(return_value=[])
+    return tree
+
+
+@pytest.mark.asyncio
+async def test_unchanged_tree_is_synced_once(sqlite_db_manager, mock_logger):
+    tree = make_tree("ping", "pong")
+    syncer = CommandTreeSyncer(tree, sqlite_db_manager, mock_logger)
+
+    assert await syncer.sync(guild=GUILD) == []
+    assert await syncer.sync(guild=GUILD) is None
+    assert tree.sync.await_count == 1
+
+    # After a restart the stored hash still matches.
+    restarted = make_tree("pong", "ping")
+    restarted_syncer = CommandTreeSyncer(restarted, sqlite_db_manager, mock_logger)
+    assert restarted_syncer.tree_hash(GUILD) == syncer.tree_hash(GUILD)
+    assert await restarted_syncer.sync(guild=GUILD) is None
+    restarted.sync.assert_not_awaited()
+    assert restarted_syncer.stats.to_dict()["skips"] == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_or_forced_tree_is_synced(sqlite_db_manager, mock_logger):
+    syncer = CommandTreeSyncer(make_tree("ping"), sqlite_db_manager, mock_logger)
+    await syncer.sync(guild=GUILD)
+
+    changed = make_tree("ping")
+    changed.add_command(
+        app_commands.Command(name="pong", description="new", callback=pong),
+        guild=GUILD,
+    )
+    changed_syncer = CommandTreeSyncer(changed, sqlite_db_manager, mock_logger)
+    await changed_syncer.sync(guild=GUILD)
+    changed.sync.assert_awaited_once_with(guild=GUILD)
+    assert changed_syncer.stats.syncs == 1
+
+    await changed_syncer.sync(guild=GUILD)
+    await changed_syncer.sync(guild=GUILD, force=True)
+    assert changed.sync.await_count == 2
+    # Global commands are tracked separately from the guild's.
+    await changed_syncer.sync()
+    assert changed.sync.await_count == 3
@@ -0,0 +1,213 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from cogs.jobs import format_job
+from core.jobs import Job, JobCancelled, JobScheduler
+from db.job import JobRecord
+from models.jobs import JobStatus
+from utils.embed_utils import EMBED_FIELD_VALUE_LIMIT, join_field_lines
+
+
+@pytest.fixture
+async def scheduler(sqlite_db_manager, mock_logger):
+    scheduler = JobScheduler(sqlite_db_manager, mock_logger, max_concurrency=2)
+    await scheduler.recover()
+    yield scheduler
+    await scheduler.shutdown()
+
+
+async def _statuses(scheduler):
+    return {
+        record.id: record.status
+        for record in await scheduler.get_recent_jobs_from_db(limit=100)
+    }
+
+
+@pytest.mark.asyncio
+async def test_jobs_with_the_same_key_are_deduplicated(scheduler):
+    release = asyncio.Event()
+    calls = 0
+
+    async def refresh(job):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "done"
+
+    first, created = scheduler.submit("refresh", refresh)
+    second, joined = scheduler.submit("refresh", refresh)
+    assert created and not joined and second is first
+
+    release.set()
+    assert await first.wait() == "done" and await second.wait() == "done"
+    assert calls == 1
+
+    third, created = scheduler.submit("refresh", refresh)
+    assert created and third.id == first.id + 1
+    await third.wait()
+    assert await _statuses(scheduler) == {
+        first.id: JobStatus.SUCCEEDED.value,
+        third.id: JobStatus.SUCCEEDED.value,
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(scheduler):
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def work(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    jobs = [scheduler.submit(f"job{i}", work)[0] for i in range(5)]
+    # Jobs persist their status before starting, which takes a few loop iterations.
+    async with asyncio.timeout(5):
+        while running < 2:
+            await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    assert peak == 2 and scheduler.queue_depth == 3
+    assert [job.status for job in jobs].count(JobStatus.RUNNING) == 2
+
+    release.set()
+    await asyncio.gather(*(job.wait() for job in jobs))
+    assert peak == 2 and scheduler.queue_depth == 0
+    assert all(job.duration is not None for job in jobs)
+    assert list(scheduler.history)[0].status is JobStatus.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_cancel_and_failure_are_recorded(scheduler):
+    async def forever(job):
+        await asyncio.Event().wait()
+
+    async def broken(job):
+        raise ValueError("boom")
+
+    stuck, _ = scheduler.submit("stuck", forever)
+    failing, _ = scheduler.submit("broken", broken)
+    async with asyncio.timeout(5):
+        while stuck.status is not JobStatus.RUNNING:
+            await asyncio.sleep(0.01)
+
+    assert scheduler.cancel(stuck.id)
+    with pytest.raises(JobCancelled):
+        await stuck.wait()
+    with pytest.raises(ValueError, match="boom"):
+        await failing.wait()
+    assert not scheduler.cancel(stuck.id)
+    assert failing.error == "boom"
+    assert await _statuses(scheduler) == {
+        stuck.id: JobStatus.CANCELLED.value,
+        failing.id: JobStatus.FAILED.value,
+    }
+
+
+@pytest.mark.asyncio
+async def test_guilds_can_only_cancel_their_own_jobs(scheduler):
+    async def forever(job):
+        await asyncio.Event().wait()
+
+    migration, _ = scheduler.submit("migrate", forever, key="migrate:100", guild_id=1)
+    refresh, _ = scheduler.submit("refresh", forever)
+    async with asyncio.timeout(5):
+        while refresh.status is not JobStatus.RUNNING:
+            await asyncio.sleep(0.01)
+
+    assert not scheduler.cancel(migration.id, guild_id=2)
+    assert not scheduler.cancel(refresh.id, guild_id=1)
+    assert scheduler.cancel(migration.id, guild_id=1)
+    # Without a guild, as for the bot owner, any job can be cancelled.
+    assert scheduler.cancel(refresh.id)
+    for job in (migration, refresh):
+        with pytest.raises(JobCancelled):
+            await job.wait()
+    records = {
+        record.id: record for record in await scheduler.get_recent_jobs_from_db()
+    }
+    assert records[migration.id].guild_id == 1
+    assert records[refresh.id].guild_id is None
+
+
+@pytest.mark.asyncio
+async def test_waiter_timeout_does_not_cancel_job(scheduler):
+    release = asyncio.Event()
+
+    async def work(job):
+        await release.wait()
+        return 42
+
+    job, _ = scheduler.submit("slow", work)
+    async with asyncio.timeout(5):
+        while job.status is not JobStatus.RUNNING:
+            await asyncio.sleep(0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(job.wait(), timeout=0.01)
+    assert job.status is JobStatus.RUNNING
+    release.set()
+    assert await job.wait() == 42
+
+
+@pytest.mark.asyncio
+async def test_recover_marks_unfinished_jobs_interrupted(
+    sqlite_db_manager, mock_logger
+):
+    async with sqlite_db_manager.session() as db:
+        for job_id, status in [(1, "succeeded"), (2, "running"), (3, "queued")]:
+            db.add(
+                JobRecord(
+                    id=job_id,
+                    name="refresh",
+                    key="refresh",
+                    status=status,
+                    created_at=datetime(2025, 1, 1),
+                )
+            )
+
+    scheduler = JobScheduler(sqlite_db_manager, mock_logger)
+    assert await scheduler.recover() == 2
+    assert await _statuses(scheduler) == {
+        1: "succeeded",
+        2: "interrupted",
+        3: "interrupted",
+    }
+    job, _ = scheduler.submit("refresh", lambda job: asyncio.sleep(0))
+    assert job.id == 4
+    await job.wait()
+
+
+@pytest.mark.asyncio
+async def test_guilds_see_their_own_and_global_jobs(scheduler):
+    async def forever(job):
+        await asyncio.Event().wait()
+
+    refresh, _ = scheduler.submit("refresh", lambda job: asyncio.sleep(0))
+    await refresh.wait()
+    mine, _ = scheduler.submit("migrate", forever, key="migrate:100", guild_id=1)
+    theirs, _ = scheduler.submit("migrate", forever, key="migrate:200", guild_id=2)
+
+    assert scheduler.active_jobs(1) == [mine]
+    assert scheduler.active_jobs() == [mine, theirs]
+    assert scheduler.recent_jobs(2) == [refresh]
+
+
+def test_job_listing_fits_an_embed_field():
+    failed = Job(1, "refresh", "refresh")
+    failed.status = JobStatus.FAILED
+    failed.error = "Traceback:\n" + "x" * 5000
+    line = format_job(failed)
+    assert len(line) < 200 and "\n" not in line
+
+    jobs = [Job(i, "migrate", f"migrate:{i}") for i in range(2, 100)]
+    value = join_field_lines([line] + [format_job(job) for job in jobs])
+    assert len(value) <= EMBED_FIELD_VALUE_LIMIT
+    shown = value.splitlines()
+    assert shown[-1] == f"… and {99 - (len(shown) - 1)} more"
+    assert join_field_lines([]) == "None"
+    assert join_field_lines(["a", "b"]) == "a\nb"
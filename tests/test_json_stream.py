@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from utils.json_stream import JSONArrayStreamDecoder
+
+
+def _decode_in_chunks(payload: bytes, chunk_size: int) -> list:
+    decoder = JSONArrayStreamDecoder()
+    items = []
+    for i in range(0, len(payload), chunk_size):
+        items.extend(decoder.feed(payload[i : i + chunk_size]))
+    items.extend(decoder.close())
+    return items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 4096])
+def test_decodes_array_across_chunk_boundaries(chunk_size):
+    data = [
+        {"title": "Two Sum", "content": "<p>naïve 数组 [1, 2]</p>"},
+        {"nested": {"list": [1, 2, {"x": "}"}]}},
+        12345,
+        "tail",
+    ]
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    assert _decode_in_chunks(payload, chunk_size) == data
+
+
+def test_empty_array():
+    assert _decode_in_chunks(b" [ ] ", 2) == []
+
+
+def test_incomplete_array_raises():
+    decoder = JSONArrayStreamDecoder()
+    decoder.feed(b'[{"a": 1}, {"b"')
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+def test_rejects_non_array():
+    decoder = JSONArrayStreamDecoder()
+    with pytest.raises(ValueError):
+        decoder.feed(b'{"a": 1}')
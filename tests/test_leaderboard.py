@@ -0,0 +1,221 @@
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import event
+
+from core.leaderboard import (
+    LeaderboardManager,
+    active_streak,
+    apply_accepted_submissions,
+    parse_accepted_timestamps,
+)
+from core.leetcode_api import FetchError, LeetCodeAPI
+from core.user_profiles import UserProfileManager
+from db.leaderboard import LeetCodeUserStats
+from utils.custom_exceptions import LeetCodeUnavailable, LeetCodeUserNotFound
+from utils.resilience import CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 10_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _day(day: int, hour: int = 12) -> int:
+    return int(datetime(2025, 3, day, hour, tzinfo=timezone.utc).timestamp())
+
+
+def _info(easy, medium, hard):
+    return {
+        "profile": {"userAvatar": ""},
+        "submitStats": {
+            "acSubmissionNum": [
+                {"difficulty": "All", "count": easy + medium + hard},
+                {"difficulty": "Easy", "count": easy},
+                {"difficulty": "Medium", "count": medium},
+                {"difficulty": "Hard", "count": hard},
+            ]
+        },
+    }
+
+
+@pytest.fixture
+def api():
+    api = AsyncMock(spec=LeetCodeAPI)
+    api.users = {
+        "alice": _info(10, 5, 1),
+        "bob": _info(3, 20, 2),
+        "carol": _info(1, 0, 0),
+    }
+    api.submissions = {name: [] for name in api.users}
+
+    async def user_info(username):
+        if username not in api.users:
+            raise FetchError(
+                f"Failed to fetch user info with username {username}", status=404
+            )
+        return api.users[username]
+
+    async def user_submission(username):
+        return {"submission": api.submissions[username]}
+
+    api.user_info.side_effect = user_info
+    api.user_submission.side_effect = user_submission
+    return api
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def leaderboard(api, sqlite_db_manager, mock_logger, clock):
+    profiles = UserProfileManager(api, sqlite_db_manager, mock_logger, persist=False)
+    return LeaderboardManager(
+        profiles,
+        sqlite_db_manager,
+        mock_logger,
+        poll_interval=600,
+        poll_tick=60,
+        clock=clock,
+    )
+
+
+def test_streaks_advance_incrementally():
+    stats = LeetCodeUserStats(
+        username="alice", current_streak=0, longest_streak=0, last_submission_at=0
+    )
+    payload = {
+        "submission": [
+            {"timestamp": str(_day(1)), "statusDisplay": "Accepted"},
+            {"timestamp": str(_day(2)), "statusDisplay": "Wrong Answer"},
+            {"timestamp": str(_day(2, 8)), "statusDisplay": "Accepted"},
+            {"timestamp": str(_day(2, 20)), "statusDisplay": "Accepted"},
+            {"timestamp": str(_day(3)), "statusDisplay": "Accepted"},
+        ]
+    }
+    apply_accepted_submissions(stats, parse_accepted_timestamps(payload))
+    assert (stats.current_streak, stats.longest_streak) == (3, 3)
+
+    # Re-reading the same submissions changes nothing; a gap restarts the streak.
+    apply_accepted_submissions(stats, parse_accepted_timestamps(payload) + [_day(6)])
+    assert (stats.current_streak, stats.longest_streak) == (1, 3)
+    assert stats.last_solved_on == date(2025, 3, 6)
+    assert active_streak(stats, date(2025, 3, 7)) == 1
+    assert active_streak(stats, date(2025, 3, 8)) == 0
+
+
+@pytest.mark.asyncio
+async def test_link_ranks_members_per_guild(leaderboard, api):
+    await leaderboard.link(1, 100, "Alice")
+    await leaderboard.link(1, 200, "bob")
+    await leaderboard.link(2, 300, "carol")
+    await leaderboard.link(2, 100, "alice")
+
+    assert [(user, s.username) for user, s in leaderboard.get_leaderboard(1, 10)] == [
+        (200, "bob"),
+        (100, "alice"),
+    ]
+    assert [user for user, _ in leaderboard.get_leaderboard(2, 10)] == [100, 300]
+    assert leaderboard.get_rank(2, 300) == 2
+
+    with pytest.raises(LeetCodeUserNotFound):
+        await leaderboard.link(1, 400, "nobody")
+
+    # Relinking replaces the member's account.
+    await leaderboard.link(1, 200, "carol")
+    assert [s.username for _, s in leaderboard.get_leaderboard(1, 10)] == [
+        "alice",
+        "carol",
+    ]
+    assert leaderboard.guilds_by_username == {"alice": {1, 2}, "carol": {1, 2}}
+
+    assert await leaderboard.unlink(1, 100)
+    assert not await leaderboard.unlink(1, 100)
+    assert [user for user, _ in leaderboard.get_leaderboard(1, 10)] == [200]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        FetchError("Failed to fetch user info: 500", status=500),
+        CircuitOpenError("LeetCode API", 30),
+        TimeoutError(),
+    ],
+)
+async def test_link_reports_outages_as_temporary(leaderboard, api, error):
+    api.user_info.side_effect = error
+
+    with pytest.raises(LeetCodeUnavailable):
+        await leaderboard.link(1, 100, "alice")
+    assert leaderboard.accounts == {}
+
+
+def test_poll_task_uses_the_configured_tick(api, sqlite_db_manager, mock_logger):
+    profiles = UserProfileManager(api, sqlite_db_manager, mock_logger, persist=False)
+    fast = LeaderboardManager(profiles, sqlite_db_manager, mock_logger, poll_tick=5)
+    default = LeaderboardManager(profiles, sqlite_db_manager, mock_logger)
+
+    assert fast.poll_task.seconds == 5
+    assert default.poll_task.seconds == default.poll_tick
+
+
+@pytest.mark.asyncio
+async def test_polls_are_staggered_and_update_rankings(
+    leaderboard, api, sqlite_db_manager, mock_logger, clock
+):
+    await leaderboard.link(1, 100, "alice")
+    await leaderboard.link(1, 200, "bob")
+    await leaderboard.link(1, 300, "carol")
+
+    # A restarted bot spreads the first polls over the interval.
+    restarted = LeaderboardManager(
+        leaderboard.user_profile_manager,
+        sqlite_db_manager,
+        mock_logger,
+        poll_interval=600,
+        poll_tick=60,
+        clock=clock,
+    )
+    await restarted.init_cache()
+    assert [s.username for _, s in restarted.get_leaderboard(1, 10)] == [
+        "bob",
+        "alice",
+        "carol",
+    ]
+    assert restarted.due_usernames() == ["carol"]
+
+    api.users["carol"] = _info(40, 0, 0)
+    api.submissions["carol"] = [{"timestamp": _day(1), "statusDisplay": "Accepted"}]
+    polled = []
+    for _ in range(10):
+        polled += restarted.due_usernames()
+        await restarted.poll_due_users()
+        clock.now += 60
+    assert sorted(polled) == ["alice", "bob", "carol"]
+    assert restarted.get_leaderboard(1, 1)[0][1].username == "carol"
+    assert restarted.stats["carol"].current_streak == 1
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_reads_do_not_query(leaderboard, sqlite_db_manager, api):
+    await leaderboard.link(1, 100, "alice")
+    calls = api.user_info.await_count
+    statements = []
+    event.listen(
+        sqlite_db_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    for _ in range(100):
+        leaderboard.get_leaderboard(1, 10)
+        leaderboard.get_rank(1, 100)
+
+    assert statements == [] and api.user_info.await_count == calls
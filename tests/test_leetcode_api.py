@@ -1,8 +1,12 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from core.leetcode_api import LeetCodeAPI, FetchError
+import aiohttp
+from core.leetcode_api import LeetCodeAPI, FetchError, ProblemDumpNotModified
+from utils.resilience import BreakerState, CircuitOpenError, TokenBucket
 from models.leetcode import ProblemDifficulity
 import logging
+import json
 
 # We will patch db.problem.Problem and db.problem.TopicTags
 # when these are imported into core/leetcode_api.py and core/leetcode_problem.py.
@@ -13,9 +17,23 @@ import logging
 #     return MagicMock(spec=logging.Logger)
 
 
+def _streamed_content(payload: bytes, chunk_size: int) -> MagicMock:
+    async def iter_chunked(_: int):
+        for i in range(0, len(payload), chunk_size):
+            yield payload[i : i + chunk_size]
+
+    content = MagicMock()
+    content.iter_chunked = iter_chunked
+    return content
+
+
 @pytest.fixture
-def leetcode_api(mock_logger):
-    return LeetCodeAPI(logger=mock_logger)
+async def leetcode_api(mock_logger, tmp_path):
+    api = LeetCodeAPI(
+        logger=mock_logger, render_workers=0, cache_dir=str(tmp_path / "cache")
+    )
+    yield api
+    await api.close()
 
 
 def test_parse_problem_desc(leetcode_api):
@@ -181,7 +199,8 @@ async def test_fetch_all_problems_success(
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json.return_value = mock_data
+        mock_response.headers = {}
+        mock_response.content = _streamed_content(json.dumps(mock_data).encode(), 7)
         mock_get.return_value.__aenter__.return_value = mock_response
 
         result = await leetcode_api.fetch_all_problems()
@@ -219,3 +238,222 @@ async def test_user_submission_success(leetcode_api):
 
         submissions = await leetcode_api.user_submission("testuser")
         assert submissions == mock_data
+
+
+@pytest.mark.asyncio
+async def test_session_is_shared_between_requests(leetcode_api):
+    await leetcode_api.start()
+    session = leetcode_api._get_session()
+
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.json.return_value = {}
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        await leetcode_api.user_info("testuser")
+        await leetcode_api.user_submission("testuser")
+
+    assert leetcode_api._get_session() is session
+    assert session.connector is not None
+    assert session.connector.limit == leetcode_api._connection_limit
+    assert session.connector.limit_per_host == leetcode_api._connection_limit_per_host
+
+
+@pytest.mark.asyncio
+async def test_close_releases_session(leetcode_api):
+    await leetcode_api.start()
+    session = leetcode_api._get_session()
+    await leetcode_api.close()
+    assert session.closed
+    assert leetcode_api._session is None
+
+
+@pytest.mark.asyncio
+async def test_iter_all_problems_yields_batches(leetcode_api):
+    mock_data = [
+        {
+            "data": {
+                "question": {
+                    "title": f"Problem {i}",
+                    "questionId": str(i),
+                    "questionFrontendId": str(i),
+                    "url": f"url{i}",
+                    "difficulty": "Hard",
+                    "content": f"<p>desc <code>{i}</code></p>",
+                    "topicTags": [{"name": "Tag"}],
+                }
+            }
+        }
+        for i in range(1, 6)
+    ]
+    mock_data.append({"data": {}})
+
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.content = _streamed_content(json.dumps(mock_data).encode(), 13)
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        batches = [batch async for batch in leetcode_api.iter_all_problems(2)]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    problems = [problem for batch in batches for problem, _ in batch]
+    assert [p.problem_frontend_id for p in problems] == [1, 2, 3, 4, 5]
+    assert problems[2].description == "desc `3`"
+    assert {tag.tag_name for tag in batches[0][0][1]} == {"Tag"}
+
+
+@pytest.mark.asyncio
+async def test_iter_all_problems_fetch_error(leetcode_api):
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = AsyncMock()
+        mock_response.status = 500
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        with pytest.raises(FetchError):
+            async for _ in leetcode_api.iter_all_problems():
+                pass
+
+
+def _dump_response(status: int, payload: bytes = b"", headers=None) -> AsyncMock:
+    response = AsyncMock()
+    response.status = status
+    response.headers = headers or {}
+    response.content = _streamed_content(payload, 5)
+    return response
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [True, False])
+async def test_iter_all_problems_conditional_fetch(mock_logger, tmp_path, compress):
+    api = LeetCodeAPI(
+        logger=mock_logger,
+        render_workers=0,
+        cache_dir=str(tmp_path),
+        compress_cache=compress,
+    )
+    mock_data = [
+        {
+            "data": {
+                "question": {
+                    "title": "Problem 1",
+                    "questionId": "1",
+                    "questionFrontendId": "1",
+                    "url": "url1",
+                    "difficulty": "Easy",
+                    "content": "desc1",
+                    "topicTags": [],
+                }
+            }
+        }
+    ]
+    payload = json.dumps(mock_data).encode()
+
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_get.return_value.__aenter__.return_value = _dump_response(
+            200, payload, {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"}
+        )
+        first = [batch async for batch in api.iter_all_problems()]
+        assert "headers" in mock_get.call_args.kwargs
+        assert "If-None-Match" not in mock_get.call_args.kwargs["headers"]
+
+        mock_get.return_value.__aenter__.return_value = _dump_response(304)
+        with pytest.raises(ProblemDumpNotModified):
+            async for _ in api.iter_all_problems():
+                pass
+        sent_headers = mock_get.call_args.kwargs["headers"]
+        assert sent_headers["If-None-Match"] == '"abc"'
+        assert sent_headers["If-Modified-Since"] == "Mon, 01 Jan 2024"
+
+        forced = [batch async for batch in api.iter_all_problems(force=True)]
+
+    await api.close()
+    assert [p.title for p, _ in first[0]] == ["Problem 1"]
+    assert [p.title for p, _ in forced[0]] == ["Problem 1"]
+
+
+def _response(status: int, data=None) -> AsyncMock:
+    response = AsyncMock()
+    response.status = status
+    response.json.return_value = data
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+@pytest.mark.asyncio
+@patch("core.leetcode_api.asyncio.sleep", new_callable=AsyncMock)
+async def test_get_retries_transient_errors(mock_sleep, leetcode_api):
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_get.side_effect = [
+            _response(503),
+            aiohttp.ClientConnectionError("reset"),
+            _response(200, {"username": "testuser"}),
+        ]
+
+        assert await leetcode_api.user_info("testuser") == {"username": "testuser"}
+
+    assert mock_get.call_count == 3
+    assert mock_sleep.await_count == 2
+    assert mock_get.call_args.kwargs["timeout"].total == 10
+    assert leetcode_api.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+@patch("core.leetcode_api.asyncio.sleep", new_callable=AsyncMock)
+async def test_breaker_opens_and_fails_fast(mock_sleep, leetcode_api):
+    leetcode_api.rate_limiter = TokenBucket(rate=1000, capacity=100)
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_get.side_effect = lambda **_: _response(502)
+        for _ in range(leetcode_api.breaker.failure_threshold):
+            with pytest.raises(FetchError):
+                await leetcode_api.fetch_daily()
+        calls = mock_get.call_count
+        assert calls == leetcode_api.breaker.failure_threshold * 3
+
+        with pytest.raises(CircuitOpenError):
+            await leetcode_api.fetch_problem_by_id(1)
+        assert mock_get.call_count == calls
+
+        mock_get.side_effect = None
+        mock_get.return_value = _response(200)
+        status = await leetcode_api.health_check()
+
+    assert leetcode_api.breaker.state is BreakerState.OPEN
+    assert "LeetCode API is healthy." in status
+    assert "Circuit breaker: open" in status
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(leetcode_api):
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_get.return_value = _response(404)
+
+        with pytest.raises(FetchError):
+            await leetcode_api.user_submission("missing")
+
+    assert mock_get.call_count == 1
+    assert leetcode_api.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced(leetcode_api):
+    async def slow_response(**_):
+        await asyncio.sleep(0.01)
+        return {"username": "testuser"}
+
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        response = _response(200)
+        response.__aenter__.return_value.json.side_effect = slow_response
+        mock_get.return_value = response
+
+        results = await asyncio.gather(
+            *(leetcode_api.user_info(name) for name in ["testuser", "TestUser"] * 5),
+            leetcode_api.user_submission("testuser"),
+        )
+
+    assert mock_get.call_count == 2
+    assert results[:10] == [{"username": "testuser"}] * 10
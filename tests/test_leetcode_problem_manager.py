@@ -1,11 +1,19 @@
+import asyncio
+import json
+import threading
+import os
+from datetime import date
 import pytest
-from unittest.mock import MagicMock, AsyncMock, call, ANY
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import event, select
+from core import leetcode_problem
 from core.leetcode_problem import LeetCodeProblemManager, ProblemNotFound
-from core.leetcode_api import LeetCodeAPI
-from db.database_manager import DatabaseManager
+from core.leetcode_api import FetchError, LeetCodeAPI, ProblemDumpNotModified
+from core.problem_catalog import ProblemRecord
 from db.problem import (
     Problem,
     TopicTags,
+    problem_tags_association,
 )  # Use actual Problem/TopicTags for instantiation
 import logging
 
@@ -16,31 +24,19 @@ def mock_api():
 
 
 @pytest.fixture
-def mock_db_session():
-    session = MagicMock()
-    session.execute.return_value.scalars.return_value.all.return_value = []  # Default empty list for all()
-    session.execute.return_value.scalars.return_value.first.return_value = (
-        None  # Default None for first()
-    )
-    session.query.return_value.filter_by.return_value.first.return_value = (
-        None  # Default None for query().filter_by().first()
-    )
-    session.query.return_value.all.return_value = []  # Default empty list for query().all()
-
-    return session
-
-
-@pytest.fixture
-def mock_db_manager(mock_db_session):
-    manager = MagicMock(spec=DatabaseManager)
-    manager.__enter__.return_value = mock_db_session
-    manager.__exit__.return_value = False  # Don't suppress exceptions
-    return manager
+def manager(mock_api, sqlite_db_manager, mock_logger):
+    return LeetCodeProblemManager(mock_api, sqlite_db_manager, mock_logger)
 
 
-@pytest.fixture
-def manager(mock_api, mock_db_manager, mock_logger):
-    return LeetCodeProblemManager(mock_api, mock_db_manager, mock_logger)
+async def _problem_tag_names(db_manager, problem_id: int) -> set:
+    async with db_manager.session() as db:
+        stmt = (
+            select(TopicTags.tag_name)
+            .join(problem_tags_association)
+            .join(Problem)
+            .where(Problem.problem_id == problem_id)
+        )
+        return set((await db.execute(stmt)).scalars().all())
 
 
 @pytest.mark.asyncio
@@ -54,7 +50,7 @@ async def test_get_daily_problem_in_cache(manager):
         description="desc",
         premium=False,
     )
-    manager.all_problem_cache[100] = mock_problem
+    cached = manager._cache_problem(mock_problem)
 
     api_problem_obj = Problem(
         problem_frontend_id=100,
@@ -71,12 +67,12 @@ async def test_get_daily_problem_in_cache(manager):
     }
 
     result = await manager.get_daily_problem()
-    assert result["problem"] == mock_problem
+    assert result["problem"] is cached
     assert result["problem"].title == "Daily Cached"
 
 
 @pytest.mark.asyncio
-async def test_get_daily_problem_in_db_not_cache(manager, mock_db_session):
+async def test_get_daily_problem_in_db_not_cache(manager):
     api_problem_obj = Problem(
         problem_frontend_id=200,
         title="Daily API",
@@ -103,19 +99,18 @@ async def test_get_daily_problem_in_db_not_cache(manager, mock_db_session):
         premium=False,
     )
 
-    mock_db_session.execute.return_value.scalars.return_value.first.return_value = (
-        db_problem
-    )
+    async with manager.database_manager.session() as db:
+        db.add(db_problem)
 
     result = await manager.get_daily_problem()
 
-    assert result["problem"] == db_problem
+    assert result["problem"].id == db_problem.id
     assert result["problem"].title == "Daily DB"
-    assert manager.all_problem_cache[200] == db_problem
+    assert manager.all_problem_cache[200] is result["problem"]
 
 
 @pytest.mark.asyncio
-async def test_get_daily_problem_fetch_new(manager, mock_db_session):
+async def test_get_daily_problem_fetch_new(manager):
     api_problem_obj = Problem(
         problem_frontend_id=300,
         problem_id=3000,
@@ -133,22 +128,69 @@ async def test_get_daily_problem_fetch_new(manager, mock_db_session):
 
     assert 300 not in manager.all_problem_cache
 
-    mock_db_session.execute.return_value.scalars.return_value.first.return_value = None
+    result = await manager.get_daily_problem()
 
-    mock_db_session.query.return_value.filter_by.return_value.first.return_value = None
+    assert result["problem"].problem_id == api_problem_obj.problem_id
+    assert result["problem"].title == "New Daily"
+    assert {tag.tag_name for tag in result["tags"]} == {"Tag1"}
+    assert 300 in manager.all_problem_cache
+    assert await _problem_tag_names(manager.database_manager, 3000) == {"Tag1"}
 
-    # Mocking the problem added to db.add
-    mock_db_session.add.side_effect = lambda x: setattr(
-        x, "tags", list(tags)
-    )  # Simulate adding tags to problem
 
+@pytest.mark.asyncio
+async def test_get_daily_problem_fetched_once_per_utc_day(manager, monkeypatch):
+    today = date(2025, 1, 2)
+    monkeypatch.setattr(manager, "_utc_today", lambda: today)
+    manager.leetcode_api.fetch_daily.side_effect = lambda: {
+        "problem": _api_problem(today.day, f"Daily {today}"),
+        "tags": set(),
+    }
+
+    first = await manager.get_daily_problem()
+    second = await manager.get_daily_problem()
+    assert second["problem"] is first["problem"]
+    assert manager.leetcode_api.fetch_daily.await_count == 1
+
+    today = date(2025, 1, 3)
+    third = await manager.get_daily_problem()
+    assert third["problem"].title == "Daily 2025-01-03"
+    assert manager.leetcode_api.fetch_daily.await_count == 2
+    assert list(manager.daily_problem_cache) == [today]
+
+
+@pytest.mark.asyncio
+async def test_get_daily_problem_serves_stale_on_error(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_utc_today", lambda: date(2025, 1, 3))
+    manager.leetcode_api.fetch_daily.side_effect = FetchError("down")
+    with pytest.raises(Exception):
+        await manager.get_daily_problem()
+
+    yesterday = ProblemRecord.from_orm(_api_problem(7, "Yesterday"))
+    manager.daily_problem_cache = {date(2025, 1, 2): yesterday}
     result = await manager.get_daily_problem()
+    assert result["problem"] is yesterday
 
-    assert result["problem"] == api_problem_obj
-    assert 300 in manager.all_problem_cache
 
-    mock_db_session.add.assert_any_call(api_problem_obj)
-    mock_db_session.commit.assert_called()
+@pytest.mark.asyncio
+async def test_daily_prefetch_waits_for_rollover(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_utc_today", lambda: date(2025, 1, 3))
+    monkeypatch.setattr(leetcode_problem, "daily_prefetch_retry_delay", 0)
+    yesterday = manager._cache_problem(_api_problem(7, "Yesterday"))
+    manager.daily_problem_cache = {date(2025, 1, 2): yesterday}
+    responses = [_api_problem(7, "Yesterday"), _api_problem(8, "Today")]
+    manager.leetcode_api.fetch_daily.side_effect = lambda: {
+        "problem": responses.pop(0),
+        "tags": set(),
+    }
+
+    await manager.daily_prefetch()
+
+    assert manager.leetcode_api.fetch_daily.await_count == 2
+    assert manager.daily_problem_cache[date(2025, 1, 3)].title == "Today"
+    manager.leetcode_api.fetch_daily.reset_mock()
+    result = await manager.get_daily_problem()
+    assert result["problem"].title == "Today"
+    manager.leetcode_api.fetch_daily.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -162,17 +204,15 @@ async def test_get_problem_found_in_cache(manager):
         description="desc",
         premium=False,
     )
-    manager.all_problem_cache[1] = mock_problem
+    cached = manager._cache_problem(mock_problem)
 
     result = await manager.get_problem_with_frontend_id(1)
-    assert result["problem"] == mock_problem
+    assert result["problem"] is cached
     manager.leetcode_api.fetch_problem_by_id.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_get_problem_fetch_api(manager, mock_db_session):
-    mock_db_session.execute.return_value.scalars.return_value.first.return_value = None
-
+async def test_get_problem_fetch_api(manager):
     api_problem = Problem(
         problem_frontend_id=5,
         problem_id=50,
@@ -188,98 +228,550 @@ async def test_get_problem_fetch_api(manager, mock_db_session):
         "tags": tags,
     }
 
-    mock_db_session.query.return_value.filter_by.return_value.first.return_value = None
-
-    mock_db_session.add.side_effect = lambda x: setattr(x, "tags", list(tags))
-
     result = await manager.get_problem_with_frontend_id(5)
-    assert result["problem"] == api_problem
+    assert result["problem"].problem_id == 50
+    assert result["problem"].title == "API Fetch"
     assert 5 in manager.all_problem_cache
+    assert 5 in manager.free_problem_cache
     manager.leetcode_api.fetch_problem_by_id.assert_awaited_with(5)
-    mock_db_session.add.assert_any_call(api_problem)
-    mock_db_session.commit.assert_called()
+    assert await _problem_tag_names(manager.database_manager, 50) == {"TagA"}
 
 
 @pytest.mark.asyncio
-async def test_refresh_cache_success(manager, mock_db_session):
-    p1 = Problem(
-        problem_frontend_id=1,
-        problem_id=10,
-        title="P1",
-        difficulty=0,
-        url="url1",
-        description="desc1",
-        premium=False,
-        id=100,
+async def test_get_problem_concurrent_calls(manager):
+    """100 overlapping lookups, each using its own session, mixing DB and API hits."""
+    async with manager.database_manager.session() as db:
+        for problem_id in range(1, 31):
+            db.add(_api_problem(problem_id, f"DB{problem_id}"))
+
+    async def fetch_problem_by_id(problem_frontend_id):
+        await asyncio.sleep(0)
+        return {
+            "problem": _api_problem(problem_frontend_id, f"API{problem_frontend_id}"),
+            "tags": {
+                TopicTags(tag_name="Array"),
+                TopicTags(tag_name=f"T{problem_frontend_id % 4}"),
+            },
+        }
+
+    manager.leetcode_api.fetch_problem_by_id.side_effect = fetch_problem_by_id
+    frontend_ids = [i % 60 + 1 for i in range(100)]
+
+    results = await asyncio.gather(
+        *(manager.get_problem_with_frontend_id(i) for i in frontend_ids)
     )
-    p2 = Problem(
-        problem_frontend_id=2,
-        problem_id=20,
-        title="P2",
-        difficulty=1,
-        url="url2",
-        description="desc2",
+
+    for frontend_id, result in zip(frontend_ids, results):
+        prefix = "DB" if frontend_id <= 30 else "API"
+        assert result["problem"].title == f"{prefix}{frontend_id}"
+    assert set(manager.all_problem_cache) == set(range(1, 61))
+    async with manager.database_manager.session() as db:
+        assert len((await db.execute(select(Problem))).scalars().all()) == 60
+        tag_names = (await db.execute(select(TopicTags.tag_name))).scalars().all()
+    assert sorted(tag_names) == ["Array", "T0", "T1", "T2", "T3"]
+    assert await _problem_tag_names(manager.database_manager, 450) == {"Array", "T1"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_coalesced(manager):
+    """Ten callers per uncached problem share one API fetch and one insert."""
+    fetches = []
+
+    async def fetch_problem_by_id(problem_frontend_id):
+        fetches.append(problem_frontend_id)
+        await asyncio.sleep(0.01)
+        return {
+            "problem": _api_problem(problem_frontend_id, f"API{problem_frontend_id}"),
+            "tags": {TopicTags(tag_name="Array")},
+        }
+
+    manager.leetcode_api.fetch_problem_by_id.side_effect = fetch_problem_by_id
+    frontend_ids = [3000 + i % 5 for i in range(50)]
+
+    results = await asyncio.gather(
+        *(manager.get_problem_with_frontend_id(i) for i in frontend_ids)
+    )
+
+    assert sorted(fetches) == [3000, 3001, 3002, 3003, 3004]
+    for frontend_id, result in zip(frontend_ids, results):
+        assert result["problem"] is manager.all_problem_cache[frontend_id]
+    async with manager.database_manager.session() as db:
+        assert len((await db.execute(select(Problem))).scalars().all()) == 5
+
+    async def fetch_daily():
+        return await fetch_problem_by_id(3001)
+
+    manager.leetcode_api.fetch_daily.side_effect = fetch_daily
+    fetches.clear()
+    daily = await asyncio.gather(*(manager.get_daily_problem() for _ in range(10)))
+    assert fetches == [3001]
+    assert {result["problem"].problem_frontend_id for result in daily} == {3001}
+
+
+def _api_problem(problem_id: int, title: str, description: str = "desc") -> Problem:
+    return Problem(
+        problem_frontend_id=problem_id,
+        problem_id=problem_id * 10,
+        title=title,
+        difficulty=problem_id % 3,
+        url=f"url{problem_id}",
+        description=description,
         premium=False,
-        id=101,
     )
-    t1 = TopicTags(tag_name="T1", id=500)
-    t2 = TopicTags(tag_name="T2", id=501)
 
-    api_data = {1: {"problem": p1, "tags": {t1}}, 2: {"problem": p2, "tags": {t2}}}
-    manager.leetcode_api.fetch_all_problems.return_value = api_data
 
-    mock_db_session.query.return_value.all.side_effect = [
-        [p1, p2],  # For db_problems
-        [t1, t2],  # For db_tags
-    ]
-    mock_db_session.execute.return_value.scalars.return_value.all.return_value = [
-        p1,
-        p2,
-    ]
+def _ids(problems):
+    return [problem.problem_frontend_id for problem in problems]
+
+
+async def _chunks(payload: bytes):
+    yield payload
+
+
+def _feed(manager, problems):
+    """Makes iter_all_problems yield fresh copies of (problem, tag names) pairs."""
+
+    async def iter_all_problems(force: bool = False, pending_dumps=None):
+        yield [
+            (
+                _api_problem(p.problem_frontend_id, p.title, p.description),
+                {TopicTags(tag_name=name) for name in tag_names},
+            )
+            for p, tag_names in problems
+        ]
+
+    manager.leetcode_api.iter_all_problems = iter_all_problems
+
+
+@pytest.fixture
+def db_manager_with_writes(sqlite_db_manager):
+    """The sqlite database manager plus a list recording every write statement."""
+    writes = []
+
+    @event.listens_for(sqlite_db_manager.engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.split()[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+            writes.append(statement)
+
+    return sqlite_db_manager, writes
+
+
+@pytest.mark.asyncio
+async def test_refresh_cache_success(mock_api, db_manager_with_writes, mock_logger):
+    db_manager, writes = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    _feed(manager, [(_api_problem(1, "P1"), {"T1"}), (_api_problem(2, "P2"), {"T2"})])
+
+    await manager.refresh_cache()
+
+    assert set(manager.all_problem_cache) == {1, 2}
+    assert manager.all_problem_cache[1].title == "P1"
+    assert {t.tag_name for t in manager.all_problem_cache[2].tags} == {"T2"}
+    assert manager.all_problem_cache[1].content_hash
+    assert writes
+
+
+@pytest.mark.asyncio
+async def test_refresh_cache_unchanged_is_read_only(
+    mock_api, db_manager_with_writes, mock_logger
+):
+    db_manager, writes = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    data = [(_api_problem(1, "P1"), {"T1"}), (_api_problem(2, "P2"), {"T1", "T2"})]
+    _feed(manager, data)
+    await manager.refresh_cache()
+    cached = dict(manager.all_problem_cache)
+    writes.clear()
+
+    await manager.refresh_cache()
+
+    assert writes == []
+    assert manager.all_problem_cache == cached
+
+
+@pytest.mark.asyncio
+async def test_refresh_cache_writes_only_delta(
+    mock_api, db_manager_with_writes, mock_logger
+):
+    db_manager, writes = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "P1"), {"T1"}),
+            (_api_problem(2, "P2"), {"T1", "T2"}),
+            (_api_problem(3, "P3"), {"T2"}),
+        ],
+    )
+    await manager.refresh_cache()
+    unchanged = manager.all_problem_cache[3]
+    assert await manager.get_problem_description(manager.all_problem_cache[1]) == "desc"
+    writes.clear()
+
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "P1", description="new desc"), {"T1"}),
+            (_api_problem(2, "P2"), {"T2", "T3"}),
+            (_api_problem(3, "P3"), {"T2"}),
+            (_api_problem(4, "P4"), {"T3"}),
+        ],
+    )
+    await manager.refresh_cache()
+
+    async with db_manager.session() as db:
+        links = set((await db.execute(select(problem_tags_association))).all())
+        tags = dict((await db.execute(select(TopicTags.id, TopicTags.tag_name))).all())
+        problem_ids = dict(
+            (await db.execute(select(Problem.id, Problem.problem_id))).all()
+        )
+    assert {(problem_ids[p], tags[t]) for p, t in links} == {
+        (10, "T1"),
+        (20, "T2"),
+        (20, "T3"),
+        (30, "T2"),
+        (40, "T3"),
+    }
+    assert (
+        await manager.get_problem_description(manager.all_problem_cache[1])
+        == "new desc"
+    )
+    assert {t.tag_name for t in manager.all_problem_cache[2].tags} == {"T2", "T3"}
+    assert manager.all_problem_cache[3] is unchanged
+    assert 4 in manager.free_problem_cache
+    # One problem upsert, one tag insert, one link delete and one link insert.
+    assert len(writes) == 4
+
+
+@pytest.mark.asyncio
+async def test_refresh_cache_skips_unmodified_dump(
+    mock_api, db_manager_with_writes, mock_logger
+):
+    db_manager, writes = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    _feed(manager, [(_api_problem(1, "P1"), {"T1"})])
+    await manager.refresh_cache()
+    writes.clear()
+    requested_force = []
+
+    async def not_modified(force: bool = False, pending_dumps=None):
+        requested_force.append(force)
+        raise ProblemDumpNotModified()
+        yield  # pragma: no cover
+
+    manager.leetcode_api.iter_all_problems = not_modified
+    await manager.refresh_cache()
+
+    assert requested_force == [False]
+    assert writes == []
+    assert set(manager.all_problem_cache) == {1}
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_retried_without_force(
+    sqlite_db_manager, mock_logger, tmp_path
+):
+    api = LeetCodeAPI(logger=mock_logger, render_workers=0, cache_dir=str(tmp_path))
+    manager = LeetCodeProblemManager(api, sqlite_db_manager, mock_logger)
+    dump = {"etag": '"v1"', "titles": ["P1"]}
+    statuses = []
+
+    def get(headers, url):
+        # Serves the current dump, answering 304 when its ETag is sent back.
+        response = AsyncMock()
+        response.status = 304 if headers.get("If-None-Match") == dump["etag"] else 200
+        response.headers = {"ETag": dump["etag"]}
+        payload = json.dumps(
+            [
+                {
+                    "data": {
+                        "question": {
+                            "title": title,
+                            "questionId": str(i * 10),
+                            "questionFrontendId": str(i),
+                            "url": f"url{i}",
+                            "difficulty": "Easy",
+                            "content": "desc",
+                            "topicTags": [],
+                        }
+                    }
+                }
+                for i, title in enumerate(dump["titles"], 1)
+            ]
+        ).encode()
+        response.content.iter_chunked = lambda _: _chunks(payload)
+        statuses.append(response.status)
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+
+    upsert = manager._bulk_upsert_problems
+    failures = []
+
+    async def flaky_upsert(problems):
+        if failures:
+            raise failures.pop()
+        await upsert(problems)
+
+    manager._bulk_upsert_problems = flaky_upsert
+    with patch("aiohttp.ClientSession.get", side_effect=get):
+        await manager.refresh_cache()
+        dump.update(etag='"v2"', titles=["P1", "P2"])
+        failures.append(RuntimeError("database is locked"))
+        with pytest.raises(Exception):
+            await manager.refresh_cache()
+        assert 2 not in manager.all_problem_cache
+
+        await manager.refresh_cache()
+        assert 2 in manager.all_problem_cache
+        await manager.refresh_cache()
+    await api.close()
+
+    assert statuses == [200, 200, 200, 304]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+@pytest.mark.asyncio
+async def test_get_random_problem_uses_index_without_db(
+    mock_api, db_manager_with_writes, mock_logger
+):
+    db_manager, _ = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    # _api_problem assigns difficulty id % 3: P1 Medium, P2 Hard, P3 Easy.
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "P1"), {"Array"}),
+            (_api_problem(2, "P2"), {"Array", "Graph"}),
+            (_api_problem(3, "P3"), {"Graph"}),
+        ],
+    )
+    await manager.refresh_cache()
+    statements = []
+    event.listen(
+        db_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    for _ in range(20):
+        result = await manager.get_random_problem(None, premium=False, tag="array")
+        assert result["problem"].problem_frontend_id in {1, 2}
+        assert "Array" in {tag.tag_name for tag in result["tags"]}
+    result = await manager.get_random_problem("Hard", premium=False, tag="Array")
+    assert result["problem"].problem_frontend_id == 2
+    assert await manager.get_random_problem("Easy", premium=False, tag="Array") is None
+    assert statements == []
+
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "P1"), {"Array"}),
+            (_api_problem(2, "P2"), {"Graph"}),
+            (_api_problem(3, "P3"), {"Array", "Graph"}),
+        ],
+    )
+    await manager.refresh_cache(force=True)
+    assert await manager.get_random_problem("Hard", premium=False, tag="Array") is None
+    result = await manager.get_random_problem("Easy", premium=False, tag="Array")
+    assert result["problem"].problem_frontend_id == 3
+
+
+@pytest.mark.asyncio
+async def test_search_problems_follows_refresh(
+    mock_api, db_manager_with_writes, mock_logger
+):
+    db_manager, _ = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "Two Sum"), {"Array"}),
+            (_api_problem(2, "Add Two Numbers"), {"Linked List"}),
+        ],
+    )
+    await manager.refresh_cache()
+
+    assert _ids(await manager.search_problems("two")) == [1, 2]
+    assert _ids(await manager.search_problems("linked")) == [2]
+    assert _ids(await manager.autocomplete_problems("2", 5)) == [2]
+    # Misspelled input falls back to search.
+    assert _ids(await manager.autocomplete_problems("two sumn", 5)) == [1, 2]
+    assert await manager.autocomplete_tags("li", 5) == ["Linked List"]
+
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "Two Sum"), {"Array"}),
+            (_api_problem(2, "Add Numbers"), {"Linked List"}),
+        ],
+    )
+    await manager.refresh_cache(force=True)
+    assert _ids(await manager.search_problems("two")) == [1]
+
+    fresh = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    await fresh.init_cache()
+    assert _ids(await fresh.search_problems("add num")) == [2]
 
+
+@pytest.mark.asyncio
+async def test_descriptions_load_on_demand(
+    mock_api, db_manager_with_writes, mock_logger, monkeypatch
+):
+    db_manager, _ = db_manager_with_writes
+    monkeypatch.setattr(leetcode_problem, "problem_desc_cache_size", 1)
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "Two Sum", "sum desc"), {"Array"}),
+            (_api_problem(2, "Add Two Numbers", "add desc"), {"Linked List"}),
+        ],
+    )
+    await manager.refresh_cache()
+    await manager.init_cache()
+    assert len(manager.descriptions) == 0
+
+    queries = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(db_manager.engine.sync_engine, "before_cursor_execute", record)
+    first, second = manager.all_problem_cache[1], manager.all_problem_cache[2]
+    assert await asyncio.gather(
+        manager.get_problem_description(first),
+        manager.get_problem_description(first),
+    ) == ["sum desc", "sum desc"]
+    assert await manager.get_problem_description(first) == "sum desc"
+    assert len(queries) == 1
+    assert await manager.get_problem_description(second) == "add desc"
+    # Only one description is kept, so the first one is loaded again.
+    assert await manager.get_problem_description(first) == "sum desc"
+    assert len(queries) == 3
+    assert manager.cache_stats()["problem_descriptions"]["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_search_indexes_build_off_the_loop(
+    mock_api, sqlite_db_manager, mock_logger, monkeypatch
+):
+    manager = LeetCodeProblemManager(mock_api, sqlite_db_manager, mock_logger)
+    _feed(
+        manager,
+        [
+            (_api_problem(1, "Two Sum"), {"Array"}),
+            (_api_problem(2, "Add Two Numbers"), {"Linked List"}),
+        ],
+    )
+    await manager.refresh_cache()
+    await manager.init_cache()
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def blocking_build(records):
+        builds.append(len(records))
+        started.set()
+        release.wait(5)
+        return build(records)
+
+    build = leetcode_problem._build_text_indexes
+    monkeypatch.setattr(leetcode_problem, "_build_text_indexes", blocking_build)
+
+    first = asyncio.create_task(manager.search_problems("two"))
+    await asyncio.to_thread(started.wait, 5)
+    # The loop keeps running while the thread builds; catalog changes made
+    # meanwhile reach the new indexes.
+    second = asyncio.create_task(manager.autocomplete_problems("3", 5))
+    manager._uncache_problem(2)
+    manager._cache_problem(_api_problem(3, "Two Sum III"))
+    release.set()
+
+    assert _ids(await first) == [1, 3]
+    assert _ids(await second) == [3]
+    assert builds == [2]
+
+
+@pytest.mark.asyncio
+async def test_recaching_unchanged_problem_keeps_description(
+    mock_api, db_manager_with_writes, mock_logger
+):
+    db_manager, _ = db_manager_with_writes
+    manager = LeetCodeProblemManager(mock_api, db_manager, mock_logger)
+    _feed(manager, [(_api_problem(1, "Two Sum", "sum desc"), {"Array"})])
     await manager.refresh_cache()
+    await manager.init_cache()
+    record = manager.all_problem_cache[1]
+    assert await manager.get_problem_description(record) == "sum desc"
+
+    queries = []
+    event.listen(
+        db_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: queries.append(args[2]),
+    )
+    await manager.get_problem_from_db(problem_frontend_id=1)
+    record = manager.all_problem_cache[1]
+    assert await manager.get_problem_description(record) == "sum desc"
+    # The problem row and its tags; the description is still cached.
+    assert len(queries) == 2
 
-    assert 1 in manager.all_problem_cache
-    assert 2 in manager.all_problem_cache
-    assert manager.all_problem_cache[1] == p1
-    mock_db_session.execute.assert_has_calls(
+    _feed(manager, [(_api_problem(1, "Two Sum", "new desc"), {"Array"})])
+    await manager.refresh_cache(force=True)
+    record = manager.all_problem_cache[1]
+    assert await manager.get_problem_description(record) == "new desc"
+
+
+@pytest.mark.asyncio
+async def test_init_cache_boots_from_fresh_snapshot(
+    mock_api, sqlite_db_manager, mock_logger, tmp_path, monkeypatch
+):
+    snapshot_path = str(tmp_path / "catalog.snapshot")
+    manager = LeetCodeProblemManager(
+        mock_api, sqlite_db_manager, mock_logger, snapshot_path=snapshot_path
+    )
+    _feed(
+        manager,
         [
-            call(
-                ANY,
-                [
-                    {
-                        "problem_frontend_id": 1,
-                        "problem_id": 10,
-                        "title": "P1",
-                        "url": "url1",
-                        "difficulty": 0,
-                        "description": "desc1",
-                        "premium": False,
-                        "id": 100,
-                        "tags": [],
-                    },
-                    {
-                        "problem_frontend_id": 2,
-                        "problem_id": 20,
-                        "title": "P2",
-                        "url": "url2",
-                        "difficulty": 1,
-                        "description": "desc2",
-                        "premium": False,
-                        "id": 101,
-                        "tags": [],
-                    },
-                ],
-            ),
-            call(ANY, [{"tag_name": "T1", "id": 500}, {"tag_name": "T2", "id": 501}]),
-            call(ANY),  # delete associations
-            call(
-                ANY,
-                [
-                    {"problem_id": 100, "tag_id": 500},
-                    {"problem_id": 101, "tag_id": 501},
-                ],
-            ),  # insert associations
+            (_api_problem(1, "Two Sum"), {"Array", "Hash Table"}),
+            (_api_problem(2, "Add Two Numbers"), {"Linked List"}),
         ],
-        any_order=True,
     )
+    await manager.refresh_cache()
+
+    booted = LeetCodeProblemManager(
+        mock_api, sqlite_db_manager, mock_logger, snapshot_path=snapshot_path
+    )
+    orm_load = AsyncMock(wraps=booted.get_problems_from_db)
+    monkeypatch.setattr(booted, "get_problems_from_db", orm_load)
+    await booted.init_cache()
+    orm_load.assert_not_called()
+    assert {k: r.to_dict() for k, r in booted.all_problem_cache.items()} == {
+        k: r.to_dict() for k, r in manager.all_problem_cache.items()
+    }
+    assert [p.problem_frontend_id for p in await booted.search_problems("two")] == [
+        1,
+        2,
+    ]
+
+    # A problem added outside a refresh makes the snapshot stale.
+    manager.leetcode_api.fetch_problem_by_id.return_value = {
+        "problem": _api_problem(3, "Three Sum"),
+        "tags": {TopicTags(tag_name="Array")},
+    }
+    await manager.get_problem_with_frontend_id(3)
+    rebooted = LeetCodeProblemManager(
+        mock_api, sqlite_db_manager, mock_logger, snapshot_path=snapshot_path
+    )
+    await rebooted.init_cache()
+    assert set(rebooted.all_problem_cache) == {1, 2, 3}
+    # The database load rewrote the snapshot.
+    again = LeetCodeProblemManager(
+        mock_api, sqlite_db_manager, mock_logger, snapshot_path=snapshot_path
+    )
+    orm_load = AsyncMock(wraps=again.get_problems_from_db)
+    monkeypatch.setattr(again, "get_problems_from_db", orm_load)
+    await again.init_cache()
+    orm_load.assert_not_called()
+    assert set(again.all_problem_cache) == {1, 2, 3}
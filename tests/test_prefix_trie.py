@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from utils.prefix_trie import PrefixTrie
+
+
+def test_complete_returns_smallest_items_in_order():
+    trie = PrefixTrie(limit=3)
+    for key, item in [
+        ("two sum", 1),
+        ("sum", 1),
+        ("3sum", 15),
+        ("two", 167),
+        ("tw", 9),
+    ]:
+        trie.add(key, item)
+
+    assert trie.complete("") == [1, 9, 15]
+    assert trie.complete("t") == [1, 9, 167]
+    assert trie.complete("two") == [1, 167]
+    assert trie.complete("two s") == [1]
+    assert trie.complete("su") == [1]
+    assert trie.complete("twos") == []
+    assert trie.complete("x") == []
+
+
+def test_remove_restores_items_beyond_the_limit():
+    trie = PrefixTrie(limit=2)
+    for item in range(5):
+        trie.add(f"key{item}", item)
+    trie.add("other", 0)
+
+    trie.remove("key0", 0)
+    assert trie.complete("key") == [1, 2]
+    assert trie.complete("") == [0, 1]
+    trie.remove("other", 0)
+    trie.remove("other", 0)
+    assert trie.complete("") == [1, 2]
+    assert trie.complete("o") == []
+
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    trie = PrefixTrie(limit=5)
+    entries = set()
+    for _ in range(2000):
+        key = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 6)))
+        item = rng.randrange(50)
+        if (key, item) in entries and rng.random() < 0.5:
+            trie.remove(key, item)
+            entries.discard((key, item))
+        else:
+            trie.add(key, item)
+            entries.add((key, item))
+
+    for prefix in ["", "a", "b", "ab", "a b", "ba", "bbb", "aaaa"]:
+        expected = sorted({item for key, item in entries if key.startswith(prefix)})
+        assert trie.complete(prefix) == expected[:5]
+
+
+def test_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        PrefixTrie(limit=0)
@@ -0,0 +1,62 @@
+import pytest
+
+from core.problem_catalog import TAGS, ProblemCatalog, ProblemRecord
+from db.problem import Problem, TopicTags
+
+
+def make_problem(frontend_id, premium=False, tags=()):
+    problem = Problem(
+        id=frontend_id,
+        problem_id=frontend_id,
+        problem_frontend_id=frontend_id,
+        title=f"Problem {frontend_id}",
+        url=f"https://leetcode.com/problems/problem-{frontend_id}/",
+        difficulty=1,
+        premium=premium,
+    )
+    problem.tags = [TopicTags(tag_name=name) for name in tags]
+    return problem
+
+
+def test_record_copies_orm_fields_and_is_read_only():
+    record = ProblemRecord.from_orm(make_problem(1, tags=["Array", "Hash Table"]))
+
+    assert record.title == "Problem 1"
+    assert record.premium is False
+    assert {tag.tag_name for tag in record.tags} == {"Array", "Hash Table"}
+    assert record.to_dict()["tags"] == sorted(["Array", "Hash Table"], key=TAGS.intern)
+    with pytest.raises(AttributeError):
+        record.title = "Changed"
+    with pytest.raises(AttributeError):
+        next(iter(record.tags)).tag_name = "Changed"
+
+
+def test_tag_names_are_interned_once():
+    first = ProblemRecord.from_orm(make_problem(1, tags=["Array"]))
+    second = ProblemRecord.from_orm(make_problem(2, tags=["Array"]))
+
+    assert first.tag_ids == second.tag_ids
+    assert next(iter(first.tags)) is next(iter(second.tags))
+
+
+def test_free_view_tracks_premium_problems():
+    catalog = ProblemCatalog()
+    catalog.replace_all(
+        ProblemRecord.from_orm(make_problem(i, premium=i % 2 == 0)) for i in range(1, 5)
+    )
+
+    assert len(catalog) == 4
+    assert sorted(catalog.free) == [1, 3]
+    assert 2 not in catalog.free
+
+    catalog.put(ProblemRecord.from_orm(make_problem(2)))
+    assert sorted(catalog.free) == [1, 2, 3]
+    assert len(catalog.free) == 3
+
+    catalog.remove(3)
+    catalog.remove(4)
+    assert len(catalog) == 2
+    assert sorted(catalog.free) == [1, 2]
+    assert catalog.get(3) is None
+    assert catalog.get_by_db_id(2).problem_frontend_id == 2
+    assert catalog.get_by_db_id(3) is None
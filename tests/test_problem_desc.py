@@ -0,0 +1,70 @@
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from core.problem_desc import ProblemDescRenderer, render_problem_desc
+
+
+def _bs4_reference(content: str, max_len: int) -> str:
+    """The BeautifulSoup implementation the tokenizer replaced."""
+    if not content:
+        return "No description available."
+    soup = BeautifulSoup(content, "html.parser")
+    for tag in soup.find_all("sup"):
+        tag.string = f"^{tag.get_text()}"
+    for tag in soup.find_all("code"):
+        tag.string = f"`{tag.get_text()}`"
+    for tag in soup.find_all("em"):
+        tag.string = f"*{tag.get_text()}*"
+    for tag in soup.find_all("strong"):
+        tag.string = f"**{tag.get_text()}**"
+    text_only = soup.get_text()
+    problem_md = re.sub(r"\n\s*\n", "\n\n", text_only.strip())[:max_len]
+    if len(text_only.strip()) > max_len:
+        problem_md += "..."
+    return problem_md
+
+
+SAMPLES = [
+    "",
+    "<p>Given an array of integers <code>nums</code>&nbsp;and an integer <code>target</code>.</p>",
+    '<p><strong class="example">Example 1:</strong></p>\n<pre>\n<strong>Input:</strong> nums = [2,7,11,15]\n</pre>\n\n\n<p>&nbsp;</p>',
+    "<ul>\n\t<li><code>2 &lt;= nums.length &lt;= 10<sup>4</sup></code></li>\n\t<li><code>-10<sup>9</sup> &lt;= nums[i] &lt;= 10<sup>9</sup></code></li>\n</ul>",
+    "<strong><em>nested</em> <code>x</code></strong> <em><strong>inner</strong></em>",
+    "<code><strong>bold in code</strong><sup>2</sup></code><sup><sup>double</sup></sup>",
+    "<p>unclosed <em>emphasis <code>and code</p> tail",
+    "<code/><br/><img src='a.png'>text</br><!-- hidden --><script>var x = 1;</script>",
+    "&#39;quoted&#39; &#x2264; &le; &ge; &unknown; &#150; &#39abc",
+]
+
+
+@pytest.mark.parametrize("content", SAMPLES)
+@pytest.mark.parametrize("max_len", [10, 800])
+def test_matches_beautifulsoup_output(content, max_len):
+    assert render_problem_desc(content, max_len) == _bs4_reference(content, max_len)
+
+
+def test_truncates_with_ellipsis():
+    assert render_problem_desc("<p>abcdefghij</p>", 5) == "abcde..."
+    assert render_problem_desc("<p>abcde</p>", 5) == "abcde"
+
+
+@pytest.mark.asyncio
+async def test_render_many_with_process_pool():
+    renderer = ProblemDescRenderer(max_len=800, max_workers=2, chunk_size=3)
+    renderer.start_pool()
+    try:
+        rendered = await renderer.render_many(SAMPLES)
+    finally:
+        renderer.shutdown_pool()
+    assert rendered == [_bs4_reference(content, 800) for content in SAMPLES]
+
+
+@pytest.mark.asyncio
+async def test_render_many_without_pool():
+    renderer = ProblemDescRenderer(max_len=800, max_workers=0)
+    renderer.start_pool()
+    assert await renderer.render_many(SAMPLES) == [
+        _bs4_reference(content, 800) for content in SAMPLES
+    ]
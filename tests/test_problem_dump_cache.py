@@ -0,0 +1,40 @@
+import asyncio
+import os
+
+import pytest
+
+from core.problem_dump_cache import ProblemDumpCache
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [True, False])
+async def test_dump_round_trips_through_worker_threads(mock_logger, tmp_path, compress):
+    cache = ProblemDumpCache(str(tmp_path), mock_logger, compress=compress)
+    payload = os.urandom(300_000)
+    writer = cache.open_writer()
+    for i in range(0, len(payload), 65536):
+        await writer.write(payload[i : i + 65536])
+    await writer.finish(etag='"abc"', last_modified=None)
+    assert not cache.has_dump()
+
+    await writer.commit()
+
+    assert cache.conditional_headers() == {"If-None-Match": '"abc"'}
+    chunks = [chunk async for chunk in cache.iter_chunks(65536)]
+    assert b"".join(chunks) == payload
+
+
+@pytest.mark.asyncio
+async def test_abort_waits_for_a_cancelled_write(mock_logger, tmp_path):
+    cache = ProblemDumpCache(str(tmp_path), mock_logger)
+    writer = cache.open_writer()
+    write = asyncio.create_task(writer.write(os.urandom(4_000_000)))
+    await asyncio.sleep(0)
+    write.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await write
+
+    await writer.abort()
+
+    assert os.listdir(tmp_path) == []
+    assert not cache.has_dump()
@@ -0,0 +1,75 @@
+from collections import Counter
+
+from core.problem_index import ProblemSamplingIndex
+from db.problem import Problem, TopicTags
+
+
+def _problem(frontend_id, difficulty=0, premium=False, tags=()):
+    problem = Problem(
+        problem_frontend_id=frontend_id,
+        problem_id=frontend_id * 10,
+        title=f"P{frontend_id}",
+        difficulty=difficulty,
+        url=f"url{frontend_id}",
+        description="desc",
+        premium=premium,
+    )
+    problem.tags = [TopicTags(tag_name=name) for name in tags]
+    return problem
+
+
+def test_sample_respects_filters():
+    index = ProblemSamplingIndex()
+    index.rebuild(
+        [
+            _problem(1, difficulty=0, tags=["Array"]),
+            _problem(2, difficulty=1, tags=["Array", "Graph"]),
+            _problem(3, difficulty=2, premium=True, tags=["Graph"]),
+            _problem(4, difficulty=2),
+        ]
+    )
+
+    assert index.count(difficulty=None, premium=True) == 4
+    assert index.count(difficulty=None, premium=False) == 3
+    assert index.sample(difficulty=2, premium=False) == 4
+    assert index.sample(difficulty=0, premium=False, tag="array") == 1
+    assert index.sample(difficulty=None, premium=False, tag="Graph") == 2
+    assert index.count(difficulty=None, premium=True, tag="GRAPH") == 2
+    assert index.sample(difficulty=1, premium=True, tag="Tree") is None
+
+
+def test_sample_is_uniform_across_buckets():
+    index = ProblemSamplingIndex()
+    index.rebuild([_problem(i, difficulty=i % 3) for i in range(1, 7)])
+
+    counts = Counter(index.sample(difficulty=None, premium=False) for _ in range(6000))
+
+    assert set(counts) == set(range(1, 7))
+    assert min(counts.values()) > 800
+
+
+def test_add_replaces_and_remove_drops_entries():
+    index = ProblemSamplingIndex()
+    index.rebuild([_problem(1, tags=["Array"]), _problem(2, tags=["Array"])])
+
+    index.add(_problem(1, difficulty=2, premium=True, tags=["Graph"]))
+    assert index.count(difficulty=0, premium=True, tag="Array") == 1
+    assert index.sample(difficulty=None, premium=False, tag="Graph") is None
+    assert index.sample(difficulty=None, premium=True, tag="Graph") == 1
+
+    index.remove(2)
+    index.remove(2)
+    assert index.count(difficulty=None, premium=True) == 1
+    assert index.sample(difficulty=0, premium=True, tag="Array") is None
+    assert len(index) == 1
+
+
+def test_sample_skips_excluded_ids():
+    index = ProblemSamplingIndex()
+    index.rebuild([_problem(i) for i in range(1, 101)])
+
+    seen = {
+        index.sample(None, premium=False, exclude=lambda i: i != 42) for _ in range(50)
+    }
+    assert seen == {42}
+    assert index.sample(None, premium=False, exclude=lambda i: True) is None
@@ -0,0 +1,234 @@
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+
+from core.leetcode_api import LeetCodeAPI
+from core.leetcode_problem import LeetCodeProblemManager
+from core.problem_threads import ProblemThreadsManager
+from db.problem import Problem
+from db.problem_threads import ProblemThreads
+
+
+@pytest.fixture
+async def threads_manager(sqlite_db_manager, mock_logger):
+    problem_manager = LeetCodeProblemManager(
+        AsyncMock(spec=LeetCodeAPI), sqlite_db_manager, mock_logger
+    )
+    async with sqlite_db_manager.session() as db:
+        for frontend_id in range(1, 4):
+            db.add(
+                Problem(
+                    problem_frontend_id=frontend_id,
+                    problem_id=frontend_id * 10,
+                    title=f"P{frontend_id}",
+                    difficulty=0,
+                    url=f"url{frontend_id}",
+                    description="desc",
+                    premium=False,
+                )
+            )
+    await problem_manager.init_cache()
+    manager = ProblemThreadsManager(sqlite_db_manager, problem_manager, mock_logger)
+    await manager.add_forum_channel_to_db(guild_id=1, channel_id=100)
+    await manager.add_forum_channel_to_db(guild_id=2, channel_id=200)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_threaded_problem_ids_follow_thread_changes(threads_manager):
+    problem_cache = threads_manager.leetcode_problem_manager.all_problem_cache
+    await threads_manager.create_thread_in_db(1, guild_id=1, thread_id=1001)
+    await threads_manager.create_thread_in_db(2, guild_id=1, thread_id=1002)
+    await threads_manager.create_thread_in_db(2, guild_id=2, thread_id=2002)
+
+    guild_one = await threads_manager.get_threaded_problem_ids(1)
+    assert set(guild_one) == {problem_cache[1].id, problem_cache[2].id}
+    assert set(await threads_manager.get_threaded_problem_ids(2)) == {
+        problem_cache[2].id
+    }
+    assert len(await threads_manager.get_threaded_problem_ids(3)) == 0
+
+    await threads_manager.delete_thread_from_db(1002)
+    assert set(await threads_manager.get_threaded_problem_ids(1)) == {
+        problem_cache[1].id
+    }
+
+    threads_manager.problem_threads.clear()
+    await threads_manager.init_cache()
+    assert set(await threads_manager.get_threaded_problem_ids(1)) == {
+        problem_cache[1].id
+    }
+
+
+@pytest.mark.asyncio
+async def test_random_unseen_skips_threaded_problems(threads_manager):
+    await threads_manager.create_thread_in_db(1, guild_id=1, thread_id=1001)
+    await threads_manager.create_thread_in_db(3, guild_id=1, thread_id=1003)
+    threaded = await threads_manager.get_threaded_problem_ids(1)
+    problem_manager = threads_manager.leetcode_problem_manager
+
+    for _ in range(20):
+        result = await problem_manager.get_random_problem(
+            None, premium=False, exclude_problem_db_ids=threaded
+        )
+        assert result["problem"].problem_frontend_id == 2
+
+    await threads_manager.create_thread_in_db(2, guild_id=1, thread_id=1002)
+    assert (
+        await problem_manager.get_random_problem(
+            None, premium=False, exclude_problem_db_ids=threaded
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_thread_by_problem_id_uses_composite_index(threads_manager):
+    await threads_manager.create_thread_in_db(1, guild_id=1, thread_id=1001)
+    await threads_manager.create_thread_in_db(1, guild_id=2, thread_id=2001)
+    statements = []
+    event.listen(
+        threads_manager.database_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    assert (await threads_manager.get_thread_by_problem_id(1, 1)).thread_id == 1001
+    assert (await threads_manager.get_thread_by_problem_id(1, 2)).thread_id == 2001
+    assert await threads_manager.get_thread_by_problem_id(2, 1) is None
+    assert statements == []
+
+    await threads_manager.delete_thread_from_db(1001)
+    assert await threads_manager.get_thread_by_problem_id(1, 1) is None
+    assert (await threads_manager.get_thread_by_problem_id(1, 2)).thread_id == 2001
+
+
+@pytest.mark.asyncio
+async def test_problem_frontend_id_by_thread_id_uses_catalog(threads_manager):
+    await threads_manager.create_thread_in_db(2, guild_id=1, thread_id=1002)
+    statements = []
+    event.listen(
+        threads_manager.database_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    assert await threads_manager.get_problem_frontend_id_by_thread_id(1002) == 2
+    assert await threads_manager.get_problem_frontend_id_by_thread_id(1002) == 2
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_keeps_one_thread_per_problem(threads_manager):
+    await threads_manager.create_thread_in_db(1, guild_id=1, thread_id=1001)
+    migrated = {}
+    for frontend_id, thread_id in [(1, 900), (2, 901), (2, 950), (3, 902)]:
+        migrated[thread_id] = await threads_manager.create_thread_instance(
+            frontend_id, guild_id=1, thread_id=thread_id
+        )
+
+    await threads_manager.bulk_upsert_thread_to_db(migrated)
+
+    assert set(threads_manager.problem_threads) == {1001, 950, 902}
+    assert (await threads_manager.get_thread_by_problem_id(1, 1)).thread_id == 1001
+    assert (await threads_manager.get_thread_by_problem_id(2, 1)).thread_id == 950
+    async with threads_manager.database_manager.session() as db:
+        rows = (await db.execute(select(ProblemThreads.thread_id))).scalars().all()
+    assert sorted(rows) == [902, 950, 1001]
+
+
+@pytest.mark.asyncio
+async def test_problem_can_only_have_one_thread_per_forum(threads_manager):
+    await threads_manager.create_thread_in_db(1, guild_id=1, thread_id=1001)
+    problem_thread = threads_manager.problem_threads[1001]
+
+    with pytest.raises(IntegrityError):
+        async with threads_manager.database_manager.session() as db:
+            db.add(
+                ProblemThreads(
+                    thread_id=1002,
+                    problem_db_id=problem_thread.problem_db_id,
+                    forum_channel_db_id=problem_thread.forum_channel_db_id,
+                )
+            )
+
+
+@pytest.mark.asyncio
+async def test_lookups_cache_misses_and_hits(threads_manager):
+    statements = []
+    event.listen(
+        threads_manager.database_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    for _ in range(3):
+        assert await threads_manager.get_thread_by_thread_id(4242) is None
+        assert await threads_manager.get_forum_channel(99) is None
+    assert len(statements) == 2
+    stats = threads_manager.cache_stats()
+    assert stats["problem_threads"]["negative_hits"] == 2
+    assert stats["forum_channels"]["misses"] == 1
+
+    await threads_manager.create_thread_in_db(1, guild_id=1, thread_id=4242)
+    await threads_manager.add_forum_channel_to_db(guild_id=99, channel_id=990)
+    statements.clear()
+    assert (await threads_manager.get_thread_by_thread_id(4242)).thread_id == 4242
+    assert (await threads_manager.get_forum_channel(99)).channel_id == 990
+    assert statements == []
+
+    await threads_manager.delete_thread_from_db(4242)
+    assert await threads_manager.get_thread_by_thread_id(4242) is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_only_touches_migrated_guild(threads_manager):
+    await threads_manager.create_thread_in_db(1, guild_id=2, thread_id=2001)
+    await threads_manager.create_thread_in_db(2, guild_id=2, thread_id=2002)
+    await threads_manager.create_thread_in_db(3, guild_id=1, thread_id=1003)
+    other_guild = {
+        thread_id: threads_manager.problem_threads[thread_id]
+        for thread_id in (2001, 2002)
+    }
+    forum_channels = dict(threads_manager.forum_channels.items())
+    migrated = {
+        # 1003 moves from problem 3 to problem 1; 1004 is new.
+        1003: await threads_manager.create_thread_instance(1, 1, 1003),
+        1004: await threads_manager.create_thread_instance(2, 1, 1004),
+    }
+    statements = []
+    event.listen(
+        threads_manager.database_manager.engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    await threads_manager.bulk_upsert_thread_to_db(migrated)
+
+    assert len(statements) == 1 and statements[0].startswith("INSERT")
+    for thread_id, problem_thread in other_guild.items():
+        assert threads_manager.problem_threads[thread_id] is problem_thread
+    assert dict(threads_manager.forum_channels.items()) == forum_channels
+    problem_ids = {
+        frontend_id: problem.id
+        for frontend_id, problem in threads_manager.leetcode_problem_manager.all_problem_cache.items()
+    }
+    assert (await threads_manager.get_thread_by_problem_id(1, 1)).thread_id == 1003
+    assert (await threads_manager.get_thread_by_problem_id(2, 1)).thread_id == 1004
+    assert await threads_manager.get_thread_by_problem_id(3, 1) is None
+    assert set(await threads_manager.get_threaded_problem_ids(1)) == {
+        problem_ids[1],
+        problem_ids[2],
+    }
+    assert threads_manager.problem_threads[1004].id is not None
+
+    cached = {
+        thread_id: problem_thread.to_dict()
+        for thread_id, problem_thread in threads_manager.problem_threads.items()
+    }
+    await threads_manager.init_cache()
+    assert {
+        thread_id: problem_thread.to_dict()
+        for thread_id, problem_thread in threads_manager.problem_threads.items()
+    } == cached
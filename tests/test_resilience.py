@@ -0,0 +1,78 @@
+import asyncio
+import random
+
+import pytest
+
+from utils.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucket,
+    jittered_backoff,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_bursts_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        await bucket.acquire()
+    assert clock.now == 0
+    assert not bucket.try_acquire()
+
+    await bucket.acquire()
+    assert clock.now == pytest.approx(0.5)
+    await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+    assert clock.now == pytest.approx(2.5)
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "upstream", failure_threshold=2, reset_timeout=30, clock=clock
+    )
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state is BreakerState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(CircuitOpenError, match="retrying in 30s"):
+        breaker.before_call()
+
+    clock.now = 30
+    assert breaker.state is BreakerState.HALF_OPEN
+    breaker.before_call()
+    # Only one probe at a time.
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+
+    clock.now = 60
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED and breaker.failures == 0
+    assert breaker.describe() == "closed, 0 consecutive failures"
+
+
+def test_jittered_backoff_is_capped():
+    delays = jittered_backoff(base=1, cap=4, rng=random.Random(0))
+    samples = [next(delays) for _ in range(6)]
+    for attempt, delay in enumerate(samples):
+        assert 0 <= delay <= min(4, 2**attempt)
@@ -0,0 +1,86 @@
+from core.search_index import ProblemSearchIndex, normalize, slug_from_url
+from db.problem import Problem, TopicTags
+
+
+def _problem(frontend_id, title, tags=()):
+    slug = normalize(title).replace(" ", "-")
+    problem = Problem(
+        problem_frontend_id=frontend_id,
+        problem_id=frontend_id * 10,
+        title=title,
+        difficulty=0,
+        url=f"https://leetcode.com/problems/{slug}/",
+        description="desc",
+        premium=False,
+    )
+    problem.tags = [TopicTags(tag_name=name) for name in tags]
+    return problem
+
+
+PROBLEMS = [
+    _problem(1, "Two Sum", ["Array", "Hash Table"]),
+    _problem(2, "Add Two Numbers", ["Linked List", "Math"]),
+    _problem(15, "3Sum", ["Array", "Two Pointers"]),
+    _problem(42, "Trapping Rain Water", ["Array", "Dynamic Programming"]),
+    _problem(150, "Evaluate Reverse Polish Notation", ["Stack"]),
+    _problem(167, "Two Sum II - Input Array Is Sorted", ["Array"]),
+]
+
+
+def _index():
+    index = ProblemSearchIndex()
+    index.rebuild(PROBLEMS)
+    return index
+
+
+def test_slug_from_url():
+    assert slug_from_url("https://leetcode.com/problems/two-sum/") == "two-sum"
+    assert slug_from_url("https://leetcode.com/problems/two-sum/description") == (
+        "two-sum"
+    )
+    assert slug_from_url("url1") == ""
+
+
+def test_search_ranks_exact_matches_first():
+    index = _index()
+
+    assert index.search("15")[:2] == [15, 150]
+    assert index.search("two-sum") == [1, 167]
+    assert index.search("Two Sum") == [1, 167]
+    assert index.search("two sum ii")[0] == 167
+
+
+def test_search_matches_word_prefixes_and_tags():
+    index = _index()
+
+    assert index.search("rain wat") == [42]
+    assert index.search("polish") == [150]
+    assert index.search("dynamic prog") == [42]
+    assert index.search("linked") == [2]
+    assert set(index.search("array", limit=10)) == {1, 15, 42, 167}
+    # Title words outrank tags.
+    assert index.search("array", limit=2) == [167, 1]
+
+
+def test_search_tolerates_typos():
+    index = _index()
+
+    assert index.search("traping rian water")[0] == 42
+    assert index.search("evalute polish")[0] == 150
+    assert index.search("zzzz") == []
+    assert index.search("  ") == []
+
+
+def test_add_replaces_and_remove_drops_entries():
+    index = _index()
+
+    index.add(_problem(42, "Container With Most Water", ["Greedy"]))
+    assert index.search("trapping") == []
+    assert index.search("container") == [42]
+    assert index.search("greedy") == [42]
+
+    index.remove(42)
+    index.remove(42)
+    assert index.search("container") == []
+    assert index.search("water") == []
+    assert len(index) == len(PROBLEMS) - 1
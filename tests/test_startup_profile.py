@@ -0,0 +1,51 @@
+import builtins
+import os
+import subprocess
+import sys
+
+from utils.startup_profile import StartupProfile
+
+
+def test_marks_record_consecutive_phases(mock_logger):
+    profile = StartupProfile()
+    profile.mark("imports")
+    profile.mark("caches")
+
+    assert [phase for phase, _ in profile.phases] == ["imports", "caches"]
+    assert all(seconds >= 0 for _, seconds in profile.phases)
+    profile.report(mock_logger)
+    profile.report(mock_logger)
+    assert mock_logger.info.call_count == 1
+
+
+def test_import_timer_attributes_new_imports_to_packages(tmp_path, monkeypatch):
+    (tmp_path / "profiled_pkg").mkdir()
+    (tmp_path / "profiled_pkg" / "__init__.py").write_text("import profiled_dep\n")
+    (tmp_path / "profiled_dep.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    original = builtins.__import__
+    profile = StartupProfile()
+
+    profile.start_import_timer()
+    try:
+        import profiled_pkg  # noqa: F401
+    finally:
+        profile.stop_import_timer()
+        sys.modules.pop("profiled_pkg", None)
+        sys.modules.pop("profiled_dep", None)
+
+    assert builtins.__import__ is original
+    assert set(profile.imports) == {"profiled_pkg", "profiled_dep"}
+
+
+def test_importing_main_does_not_read_secrets():
+    env = {
+        k: v for k, v in os.environ.items() if k not in ("BOT_TOKEN", "DATABASE_URL")
+    }
+    code = (
+        "import main, config.secrets as s; "
+        "assert not s._env_loaded; "
+        "assert not {'bot_token', 'DATABASE_URL', 'debug'} & set(vars(s))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], env=env, cwd=root, check=True)
@@ -0,0 +1,216 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.leetcode_api import LeetCodeAPI
+from core.leetcode_problem import LeetCodeProblemManager
+from core.problem_catalog import ProblemRecord
+from core.problem_threads import ProblemThreadsManager
+from core.thread_migration import MigrationError, ThreadMigrator
+from db.problem import Problem
+from utils.custom_exceptions import ForumChannelNotFound
+
+LEETCODE_TAG = SimpleNamespace(name="LeetCode")
+OTHER_TAG = SimpleNamespace(name="Chat")
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _thread(thread_id, name, tag=LEETCODE_TAG, archived_minutes=0):
+    return SimpleNamespace(
+        id=thread_id,
+        name=name,
+        applied_tags=[tag],
+        archive_timestamp=EPOCH + timedelta(minutes=archived_minutes),
+    )
+
+
+class FakeForumChannel:
+    """Just enough of discord.ForumChannel for the migrator."""
+
+    def __init__(self, active, archived, fail_after=None):
+        self.id = 100
+        self.guild = SimpleNamespace(id=1)
+        self.available_tags = [OTHER_TAG, LEETCODE_TAG]
+        self.threads = active
+        # Discord returns archived threads newest first.
+        self.archived = sorted(
+            archived, key=lambda t: t.archive_timestamp, reverse=True
+        )
+        self.fail_after = fail_after
+        self.requested_before = []
+
+    async def archived_threads(self, limit=None, before=None):
+        self.requested_before.append(before)
+        for served, thread in enumerate(
+            t for t in self.archived if before is None or t.archive_timestamp < before
+        ):
+            if served == self.fail_after:
+                raise RuntimeError("Discord went away")
+            await asyncio.sleep(0)
+            yield thread
+
+
+@pytest.fixture
+async def migrator(sqlite_db_manager, mock_logger):
+    api = AsyncMock(spec=LeetCodeAPI)
+    problem_manager = LeetCodeProblemManager(api, sqlite_db_manager, mock_logger)
+    async with sqlite_db_manager.session() as db:
+        for frontend_id in range(1, 11):
+            db.add(
+                Problem(
+                    problem_frontend_id=frontend_id,
+                    problem_id=frontend_id * 10,
+                    title=f"P{frontend_id}",
+                    difficulty=0,
+                    url=f"url{frontend_id}",
+                    description="desc",
+                    premium=False,
+                )
+            )
+    await problem_manager.init_cache()
+    threads_manager = ProblemThreadsManager(
+        sqlite_db_manager, problem_manager, mock_logger
+    )
+    await threads_manager.add_forum_channel_to_db(guild_id=1, channel_id=100)
+    return ThreadMigrator(sqlite_db_manager, threads_manager, mock_logger, chunk_size=3)
+
+
+def _archived(count):
+    return [
+        _thread(5000 + i, f"{i}. Problem {i}", archived_minutes=i)
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_migrate_flushes_chunks_and_reports_progress(migrator):
+    channel = FakeForumChannel(
+        active=[
+            _thread(4001, "1. Two Sum"),
+            _thread(4002, "Not a problem"),
+            _thread(4003, "2. Chat", tag=OTHER_TAG),
+        ],
+        archived=_archived(7),
+    )
+    reports = []
+
+    async def on_progress(progress):
+        reports.append((progress.scanned, progress.migrated))
+
+    progress = await migrator.migrate(channel, on_progress=on_progress)
+
+    assert (progress.scanned, progress.migrated) == (8, 7)
+    assert progress.completed and not progress.resumed
+    # One chunk for the active threads, then archived threads in chunks of three.
+    assert reports == [(1, 1), (4, 4), (7, 7), (8, 7)]
+    threads = migrator.problem_threads_manager
+    # Problem 1 already got the active thread, so its archived duplicate is dropped.
+    assert (await threads.get_thread_by_problem_id(1, 1)).thread_id == 4001
+    assert (await threads.get_thread_by_problem_id(7, 1)).thread_id == 5007
+    checkpoint = await migrator.get_checkpoint(channel.id)
+    assert checkpoint.completed and checkpoint.migrated == 7
+    assert checkpoint.archived_before == datetime(2025, 1, 1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_migrate_resumes_from_checkpoint(migrator):
+    archived = _archived(8)
+    channel = FakeForumChannel(active=[], archived=archived, fail_after=4)
+
+    with pytest.raises(RuntimeError):
+        await migrator.migrate(channel)
+
+    checkpoint = await migrator.get_checkpoint(channel.id)
+    assert not checkpoint.completed
+    assert (checkpoint.scanned, checkpoint.migrated) == (3, 3)
+    assert checkpoint.archived_before == datetime(2025, 1, 1, 0, 6)
+
+    channel = FakeForumChannel(active=[], archived=archived)
+    progress = await migrator.migrate(channel)
+
+    assert progress.resumed and progress.completed
+    # Only the boundary thread is read twice.
+    assert channel.requested_before == [EPOCH + timedelta(minutes=6, milliseconds=1)]
+    assert progress.scanned == 3 + 6
+    assert set(migrator.problem_threads_manager.problem_threads) == {
+        thread.id for thread in archived
+    }
+
+    channel = FakeForumChannel(active=[], archived=archived)
+    progress = await migrator.migrate(channel, restart=False)
+    assert not progress.resumed and channel.requested_before == [None]
+
+
+@pytest.mark.asyncio
+async def test_restart_ignores_unfinished_checkpoint(migrator):
+    archived = _archived(6)
+    with pytest.raises(RuntimeError):
+        await migrator.migrate(FakeForumChannel([], archived, fail_after=3))
+
+    channel = FakeForumChannel(active=[], archived=archived)
+    progress = await migrator.migrate(channel, restart=True)
+
+    assert not progress.resumed
+    assert channel.requested_before == [None]
+    assert (progress.scanned, progress.migrated) == (6, 6)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_migrations_of_a_channel_are_rejected(migrator):
+    channel = FakeForumChannel(active=[], archived=_archived(9))
+
+    first = asyncio.create_task(migrator.migrate(channel))
+    await asyncio.sleep(0)
+    with pytest.raises(MigrationError):
+        await migrator.migrate(channel)
+    assert (await first).migrated == 9
+
+
+@pytest.mark.asyncio
+async def test_uncached_problems_are_fetched_and_unknown_skipped(migrator):
+    problem_manager = migrator.problem_threads_manager.leetcode_problem_manager
+    extra = Problem(
+        problem_frontend_id=42,
+        problem_id=420,
+        title="P42",
+        difficulty=0,
+        url="url42",
+        description="desc",
+        premium=False,
+        tags=[],
+    )
+    async with migrator.database_manager.session() as db:
+        db.add(extra)
+
+    async def fetch(frontend_id):
+        if frontend_id == 42:
+            return {"problem": ProblemRecord.from_orm(extra), "tags": frozenset()}
+        raise Exception("not found")
+
+    problem_manager.get_problem_with_frontend_id = AsyncMock(side_effect=fetch)
+    channel = FakeForumChannel(
+        active=[_thread(4042, "42. Trap"), _thread(4099, "99. Missing")],
+        archived=[],
+    )
+
+    progress = await migrator.migrate(channel)
+
+    assert (progress.scanned, progress.migrated) == (2, 1)
+    threads = migrator.problem_threads_manager
+    assert (await threads.get_thread_by_thread_id(4042)).problem_db_id == extra.id
+    assert await threads.get_thread_by_thread_id(4099) is None
+
+
+@pytest.mark.asyncio
+async def test_migration_requires_forum_channel_and_tag(migrator):
+    channel = FakeForumChannel(active=[], archived=[])
+    channel.available_tags = [OTHER_TAG]
+    with pytest.raises(MigrationError):
+        await migrator.migrate(channel)
+
+    channel.guild = SimpleNamespace(id=3)
+    with pytest.raises(ForumChannelNotFound):
+        await migrator.migrate(channel)
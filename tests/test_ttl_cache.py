@@ -0,0 +1,45 @@
+import pytest
+
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_go_fresh_stale_then_expire():
+    clock = FakeClock()
+    cache = TTLCache("users", max_size=10, ttl=60, stale_ttl=300, clock=clock)
+    cache.set("alice", {"rank": 1})
+
+    assert cache.lookup("alice") == ({"rank": 1}, True)
+    clock.now += 61
+    assert cache.lookup("alice") == ({"rank": 1}, False)
+    clock.now += 300
+    assert cache.lookup("alice") == (None, False)
+    assert "alice" not in cache
+    assert cache.stats.to_dict() == {
+        "hits": 1,
+        "stale_hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "hit_rate": pytest.approx(2 / 3, abs=1e-4),
+    }
+
+
+def test_least_recently_used_entry_is_evicted():
+    clock = FakeClock()
+    cache = TTLCache("users", max_size=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.lookup("a")
+    cache.set("c", 3)
+
+    assert list(cache) == ["a", "c"]
+    assert cache.stats.evictions == 1
+    cache.set("a", 4, stored_at=clock.now - 61)
+    assert cache.lookup("a") == (None, False)
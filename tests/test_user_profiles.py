@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from sqlalchemy import select
+
+from core.leetcode_api import LeetCodeAPI
+from core.user_profiles import UserProfileManager
+from db.user_cache import CachedUserPayload
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def api():
+    api = AsyncMock(spec=LeetCodeAPI)
+    versions = iter(range(1, 100))
+
+    async def user_info(username):
+        return {"username": username, "version": next(versions)}
+
+    api.user_info.side_effect = user_info
+    return api
+
+
+def _manager(api, db_manager, logger, clock, **kwargs):
+    return UserProfileManager(
+        api, db_manager, logger, ttl=60, stale_ttl=600, clock=clock, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_lookups_are_served_from_memory(
+    api, sqlite_db_manager, mock_logger
+):
+    clock = FakeClock()
+    manager = _manager(api, sqlite_db_manager, mock_logger, clock)
+
+    first = await manager.get_user_info("Alice")
+    assert manager.peek_user_info("alice") == first
+    assert await manager.get_user_info("ALICE") == first
+    assert api.user_info.await_count == 1
+    assert manager.peek_user_info("bob") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating(
+    api, sqlite_db_manager, mock_logger
+):
+    clock = FakeClock()
+    manager = _manager(api, sqlite_db_manager, mock_logger, clock)
+    await manager.get_user_info("alice")
+
+    clock.now += 120
+    stale = await asyncio.gather(*(manager.get_user_info("alice") for _ in range(5)))
+    assert all(info["version"] == 1 for info in stale)
+    await asyncio.gather(*manager._refreshing.values())
+
+    assert api.user_info.await_count == 2
+    assert (await manager.get_user_info("alice"))["version"] == 2
+    assert manager.cache_stats()["user_info"]["stale_hits"] == 5
+
+    clock.now += 1000
+    assert (await manager.get_user_info("alice"))["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_a_restart_when_persisted(
+    api, sqlite_db_manager, mock_logger
+):
+    clock = FakeClock()
+    manager = _manager(api, sqlite_db_manager, mock_logger, clock)
+    await manager.get_user_info("alice")
+    clock.now += 30
+    await manager.get_user_info("bob")
+
+    restarted = _manager(api, sqlite_db_manager, mock_logger, clock)
+    await restarted.init_cache()
+    assert restarted.peek_user_info("alice")["version"] == 1
+    assert restarted.peek_user_info("bob")["version"] == 2
+
+    clock.now += 650
+    expired = _manager(api, sqlite_db_manager, mock_logger, clock)
+    await expired.init_cache()
+    assert expired.peek_user_info("alice") is None
+    assert "bob" in expired.caches["info"]
+
+    volatile = _manager(api, sqlite_db_manager, mock_logger, clock, persist=False)
+    await volatile.init_cache()
+    assert len(volatile.caches["info"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_persisted_entries_are_pruned(api, sqlite_db_manager, mock_logger):
+    clock = FakeClock()
+    manager = _manager(api, sqlite_db_manager, mock_logger, clock, max_size=2)
+
+    async def persisted():
+        async with sqlite_db_manager.session() as db:
+            stmt = select(CachedUserPayload.username).order_by(
+                CachedUserPayload.fetched_at
+            )
+            return list((await db.execute(stmt)).scalars().all())
+
+    for username in ("alice", "bob", "carol"):
+        await manager.get_user_info(username)
+        clock.now += 1
+    assert await persisted() == ["bob", "carol"]
+
+    clock.now += 700
+    restarted = _manager(api, sqlite_db_manager, mock_logger, clock, max_size=2)
+    await restarted.init_cache()
+    assert await persisted() == []
@@ -0,0 +1,49 @@
+from typing import Iterable, Iterator
+
+
+class IdBitset:
+    """
+    Compact set of small non-negative integer ids, one bit per id.
+    Database ids are dense, so a few thousand problems fit in a few hundred bytes.
+    """
+
+    __slots__ = ("_bits", "_count")
+
+    def __init__(self, ids: Iterable[int] = ()) -> None:
+        self._bits = bytearray()
+        self._count = 0
+        for id_ in ids:
+            self.add(id_)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, id_: object) -> bool:
+        if not isinstance(id_, int) or id_ < 0:
+            return False
+        byte, bit = divmod(id_, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] >> bit & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        for byte, value in enumerate(self._bits):
+            while value:
+                low = value & -value
+                yield byte * 8 + low.bit_length() - 1
+                value ^= low
+
+    def add(self, id_: int) -> None:
+        if id_ < 0:
+            raise ValueError(f"Ids must be non-negative, got {id_}")
+        byte, bit = divmod(id_, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        if not self._bits[byte] >> bit & 1:
+            self._bits[byte] |= 1 << bit
+            self._count += 1
+
+    def discard(self, id_: int) -> None:
+        if id_ not in self:
+            return
+        byte, bit = divmod(id_, 8)
+        self._bits[byte] &= ~(1 << bit) & 0xFF
+        self._count -= 1
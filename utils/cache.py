@@ -0,0 +1,145 @@
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    ItemsView,
+    Iterator,
+    Optional,
+    TypeVar,
+    ValuesView,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats:
+    __slots__ = ("hits", "negative_hits", "misses", "loads", "invalidations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class LookupCache(Generic[K, V]):
+    """
+    In-memory cache in front of database lookups.
+    get_or_load stores whatever the loader finds (write-through on read) and remembers
+    keys the loader did not find for negative_ttl seconds, so repeated lookups of
+    missing rows do not hit the database. Writers keep it coherent with set/invalidate.
+    Expired negative entries are swept as new ones are added.
+    Iteration and len() only cover positive entries.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        negative_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: Dict[K, V] = {}
+        # key -> expiry; every entry has the same ttl, so insertion order is expiry order
+        self._missing: Dict[K, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    def __getitem__(self, key: K) -> V:
+        return self._entries[key]
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Plain lookup of a positive entry; does not touch the stats."""
+        return self._entries.get(key, default)
+
+    def values(self) -> ValuesView[V]:
+        return self._entries.values()
+
+    def items(self) -> ItemsView[K, V]:
+        return self._entries.items()
+
+    def _is_known_missing(self, key: K) -> bool:
+        expires_at = self._missing.get(key)
+        if expires_at is None:
+            return False
+        if self._clock() < expires_at:
+            return True
+        del self._missing[key]
+        return False
+
+    async def get_or_load(
+        self, key: K, loader: Callable[[], Awaitable[Optional[V]]]
+    ) -> Optional[V]:
+        if (value := self._entries.get(key)) is not None:
+            self.stats.hits += 1
+            return value
+        if self._is_known_missing(key):
+            self.stats.negative_hits += 1
+            return None
+        self.stats.misses += 1
+        value = await loader()
+        self.stats.loads += 1
+        if value is None:
+            if self.negative_ttl > 0:
+                self._remember_missing(key)
+        else:
+            self.set(key, value)
+        return value
+
+    def _remember_missing(self, key: K) -> None:
+        now = self._clock()
+        # Expired entries form a prefix, so sweeping stops at the first live one.
+        while self._missing:
+            oldest = next(iter(self._missing))
+            if self._missing[oldest] > now:
+                break
+            del self._missing[oldest]
+        self._missing.pop(key, None)
+        self._missing[key] = now + self.negative_ttl
+
+    def set(self, key: K, value: V) -> None:
+        self._missing.pop(key, None)
+        self._entries[key] = value
+
+    def invalidate(self, key: K) -> Optional[V]:
+        """Drops the entry and any negative entry for key, returning the old value."""
+        self.stats.invalidations += 1
+        self._missing.pop(key, None)
+        return self._entries.pop(key, None)
+
+    def replace_all(self, entries: Dict[K, V]) -> None:
+        self._entries = dict(entries)
+        self._missing.clear()
+
+    def clear(self) -> None:
+        self.replace_all({})
@@ -1,2 +1,10 @@
 class ForumChannelNotFound(Exception):
     pass
+
+
+class LeetCodeUserNotFound(Exception):
+    pass
+
+
+class LeetCodeUnavailable(Exception):
+    """LeetCode could not be reached, or failed to answer; worth retrying later."""
@@ -1,10 +1,10 @@
 from discord import Client, Embed
-from typing import Set
+from typing import AbstractSet, Sequence
 from discord.ext import commands
 from utils.embed_utils import create_themed_embed
 from models.leetcode import ProblemDifficulity
 import discord
-from db.problem import Problem, TopicTags
+from core.problem_catalog import ProblemRecord, TagRecord
 # from main import logger
 
 
@@ -76,13 +76,16 @@ def get_embed_color(difficulty_db_repr: int) -> discord.Color:
         return discord.Color.blue()  # Default to blue if unknown
 
 
-def get_problem_desc_picture(self, problem: Problem) -> str:
+def get_problem_desc_picture(self, problem: ProblemRecord) -> str:
     # TODO: Returns the example pictures of the problems.
     return ""
 
 
 def get_problem_desc_embed(
-    problem: Problem, problem_tags: Set[TopicTags], bot: commands.Bot | Client
+    problem: ProblemRecord,
+    problem_tags: AbstractSet[TagRecord],
+    description: str,
+    bot: commands.Bot | Client,
 ) -> Embed:
     """
     Get the description embed for a given problem.
@@ -90,7 +93,7 @@ def get_problem_desc_embed(
     embed = create_themed_embed(
         title=f"{problem.problem_frontend_id}. {problem.title}",
         client=bot,
-        description=problem.description,
+        description=description,
     )
     embed.url = problem.url
     difficulty_str = get_difficulty_str_repr(problem.difficulty)
@@ -102,3 +105,22 @@ def get_problem_desc_embed(
     )
     embed.color = get_embed_color(problem.difficulty)
     return embed
+
+
+def get_problem_search_embed(
+    query: str, problems: Sequence[ProblemRecord], bot: commands.Bot | Client
+) -> Embed:
+    """
+    Get the embed listing problem search results, best match first.
+    """
+    lines = [
+        f"**{problem.problem_frontend_id}.** [{problem.title}]({problem.url}) "
+        f"({get_difficulty_str_repr(problem.difficulty)})"
+        + (" (Premium)" if problem.premium else "")
+        for problem in problems
+    ]
+    return create_themed_embed(
+        title=f"Search results for {query}"[:256],
+        client=bot,
+        description="\n".join(lines),
+    )
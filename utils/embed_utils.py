@@ -1,10 +1,37 @@
-from typing import Union
+from typing import Sequence, Union
 from discord import Embed, Client
 import datetime
 import calendar
 from config.constants import THEME_COLOR, DEV_ID, default_footer
 
 
+EMBED_FIELD_VALUE_LIMIT = 1024
+
+
+def join_field_lines(lines: Sequence[str], limit: int = EMBED_FIELD_VALUE_LIMIT) -> str:
+    """
+    Joins lines into an embed field value of at most limit characters, ending with
+    "… and N more" when not all of them fit.
+    """
+    if not lines:
+        return "None"
+    shown = []
+    used = 0
+    for i, line in enumerate(lines):
+        line = line if len(line) <= limit else line[: limit - 1] + "…"
+        # Room is kept for the note about the lines after this one.
+        remaining = len(lines) - i - 1
+        note = len(f"\n… and {remaining} more") if remaining else 0
+        cost = len(line) + (1 if shown else 0)
+        if used + cost + note > limit:
+            break
+        shown.append(line)
+        used += cost
+    if len(shown) < len(lines):
+        shown.append(f"… and {len(lines) - len(shown)} more")
+    return "\n".join(shown)
+
+
 def create_themed_embed(
     title: str, description: str = "", client: Union[Client, None] = None
 ) -> Embed:
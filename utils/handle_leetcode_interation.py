@@ -1,11 +1,13 @@
 import functools
+import logging
 from discord import Interaction, Thread
 from discord.channel import ThreadWithMessage
 from models.leetcode import ThreadCreationEnum
 from utils.custom_exceptions import ForumChannelNotFound
 from core.leetcode_api import FetchError
-from db.problem import Problem
-from main import logger
+from core.problem_catalog import ProblemRecord
+
+logger = logging.getLogger("LeetCodeBot")
 
 
 def handle_leetcode_interaction(is_daily: bool = False):
@@ -41,6 +43,14 @@ def handle_leetcode_interaction(is_daily: bool = False):
                             await interaction.followup.send(
                                 f"Problem with ID {problem_id} not found."
                             )
+                        elif (
+                            kwargs.get("tag")
+                            or kwargs.get("difficulty")
+                            or kwargs.get("unseen")
+                        ):
+                            await interaction.followup.send(
+                                "No problem matches the given filters."
+                            )
                         else:
                             await interaction.followup.send("Problem not found.")
                     return
@@ -57,7 +67,7 @@ def handle_leetcode_interaction(is_daily: bool = False):
                 )
 
                 problem_obj = problem["problem"]
-                assert isinstance(problem_obj, Problem)
+                assert isinstance(problem_obj, ProblemRecord)
 
                 # Construct Success Message
                 if is_daily:
@@ -76,6 +86,8 @@ def handle_leetcode_interaction(is_daily: bool = False):
                     difficulty = kwargs.get("difficulty")
                     if difficulty:
                         extra_info = f" with difficulty {difficulty}"
+                    if tag := kwargs.get("tag"):
+                        extra_info += f" tagged {tag}"
 
                     if thread_creation_enum == ThreadCreationEnum.CREATE:
                         assert isinstance(thread, ThreadWithMessage)
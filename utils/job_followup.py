@@ -0,0 +1,38 @@
+import asyncio
+from typing import Any, Callable
+
+import discord
+
+from config.constants import job_followup_timeout
+from core.jobs import Job, JobCancelled
+
+
+async def follow_job(
+    interaction: discord.Interaction,
+    job: Job,
+    created: bool,
+    on_success: Callable[[Any], str],
+) -> None:
+    """
+    Reports a background job on a deferred interaction and follows up with its outcome.
+    Followups expire after 15 minutes, so longer jobs are left to /jobs.
+    """
+    if created:
+        status = f"Started job #{job.id} ({job.name})."
+    else:
+        status = (
+            f"Job #{job.id} ({job.name}) is already {job.status.value}, waiting for it."
+        )
+    await interaction.followup.send(status)
+    try:
+        result = await asyncio.wait_for(job.wait(), timeout=job_followup_timeout)
+    except asyncio.TimeoutError:
+        await interaction.followup.send(
+            f"Job #{job.id} ({job.name}) is still running, check /jobs for its status."
+        )
+    except JobCancelled as e:
+        await interaction.followup.send(str(e))
+    except Exception as e:
+        await interaction.followup.send(f"Job #{job.id} ({job.name}) failed: {e}")
+    else:
+        await interaction.followup.send(on_success(result))
@@ -0,0 +1,76 @@
+import codecs
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamDecoder:
+    """
+    Incrementally decodes the elements of a top-level JSON array.
+    Feed it raw bytes as they arrive and it returns every element that has been
+    fully received so far, so the whole document never has to sit in memory.
+    """
+
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def _skip_whitespace(self, pos: int) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in " \t\n\r":
+            pos += 1
+        return pos
+
+    def _drain(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        pos = self._skip_whitespace(0)
+        if not self._started:
+            if pos >= len(self._buffer):
+                self._buffer = ""
+                return items
+            if self._buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            self._started = True
+            pos += 1
+
+        while not self._finished:
+            pos = self._skip_whitespace(pos)
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == ",":
+                pos += 1
+                continue
+            if self._buffer[pos] == "]":
+                self._finished = True
+                pos += 1
+                break
+            try:
+                item, end = self._json_decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # The element is not complete yet, wait for more bytes.
+            if end >= len(self._buffer) and not final:
+                # A scalar at the end of the buffer may still be growing.
+                break
+            items.append(item)
+            pos = end
+
+        self._buffer = self._buffer[pos:]
+        return items
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Adds a chunk of bytes and returns the newly completed array elements."""
+        if self._finished:
+            return []
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Flushes the remaining input, raising ValueError if the array is incomplete."""
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._drain(final=True) if not self._finished else []
+        if not self._finished:
+            raise ValueError("Incomplete JSON array")
+        return items
@@ -0,0 +1,116 @@
+import heapq
+from bisect import insort
+from typing import Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "items", "top")
+
+    def __init__(self) -> None:
+        # first character of the edge -> (edge label, child)
+        self.children: Dict[str, Tuple[str, "_Node[T]"]] = {}
+        # items whose key ends at this node
+        self.items: Set[T] = set()
+        # the smallest items under this node, sorted
+        self.top: List[T] = []
+
+
+class PrefixTrie(Generic[T]):
+    """
+    Radix trie mapping string keys to items, answering "the smallest `limit` items
+    with a key starting with this prefix".
+    Every node keeps its subtree's answer precomputed, so a lookup only walks the
+    prefix. An item may be stored under several keys and is returned once.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self._root: _Node[T] = _Node()
+
+    def clear(self) -> None:
+        self._root = _Node()
+
+    def add(self, key: str, item: T) -> None:
+        node = self._root
+        path = [node]
+        i = 0
+        while i < len(key):
+            edge = node.children.get(key[i])
+            if edge is None:
+                child: _Node[T] = _Node()
+                node.children[key[i]] = (key[i:], child)
+                path.append(child)
+                node = child
+                break
+            label, child = edge
+            common = 0
+            while (
+                common < len(label)
+                and i + common < len(key)
+                and label[common] == key[i + common]
+            ):
+                common += 1
+            if common < len(label):
+                # Split the edge; the new middle node covers the same subtree.
+                middle: _Node[T] = _Node()
+                middle.children[label[common]] = (label[common:], child)
+                middle.top = list(child.top)
+                node.children[key[i]] = (label[:common], middle)
+                child = middle
+            path.append(child)
+            node = child
+            i += common
+        node.items.add(item)
+        for path_node in path:
+            top = path_node.top
+            if item in top or (len(top) >= self.limit and not item < top[-1]):
+                continue
+            insort(top, item)
+            del top[self.limit :]
+
+    def remove(self, key: str, item: T) -> None:
+        node = self._root
+        # (parent, first edge character, node) from the root down
+        path: List[Tuple[Optional[_Node[T]], str, _Node[T]]] = [(None, "", node)]
+        i = 0
+        while i < len(key):
+            edge = node.children.get(key[i])
+            if edge is None or not key.startswith(edge[0], i):
+                return
+            path.append((node, key[i], edge[1]))
+            i += len(edge[0])
+            node = edge[1]
+        if item not in node.items:
+            return
+        node.items.discard(item)
+        for parent, first, path_node in reversed(path):
+            if parent is not None and not path_node.items and not path_node.children:
+                del parent.children[first]
+                continue
+            if item in path_node.top:
+                candidates = set(path_node.items)
+                for _, child in path_node.children.values():
+                    candidates.update(child.top)
+                path_node.top = heapq.nsmallest(self.limit, candidates)
+
+    def complete(self, prefix: str) -> List[T]:
+        """The smallest `limit` items with a key starting with prefix, in order."""
+        node = self._root
+        i = 0
+        while i < len(prefix):
+            edge = node.children.get(prefix[i])
+            if edge is None:
+                return []
+            label, child = edge
+            if prefix.startswith(label, i):
+                i += len(label)
+                node = child
+            elif label.startswith(prefix[i:]):
+                return list(child.top)
+            else:
+                return []
+        return list(node.top)
@@ -0,0 +1,149 @@
+import asyncio
+import random
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Iterator, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__(
+            f"{name} is unavailable, retrying in {max(retry_after, 0):.0f}s."
+        )
+
+
+class TokenBucket:
+    """
+    Rate limiter allowing `rate` acquisitions per second on average, with bursts of
+    up to `capacity`. Waiters are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        # The lock queues waiters so a burst of callers cannot starve an earlier one.
+        async with self._lock:
+            while not self.try_acquire():
+                await self._sleep((1 - self._tokens) / self.rate)
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream after failure_threshold consecutive failures.
+    While open, calls fail fast with CircuitOpenError. After reset_timeout seconds a
+    single probe call is let through (half-open): success closes the breaker, failure
+    opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self._state is BreakerState.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = BreakerState.HALF_OPEN
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        return self._opened_at + self.reset_timeout - self._clock()
+
+    def before_call(self) -> None:
+        """Raises CircuitOpenError unless a call may go through now."""
+        state = self.state
+        if state is BreakerState.OPEN or (
+            state is BreakerState.HALF_OPEN and self._probing
+        ):
+            raise CircuitOpenError(self.name, self.retry_after)
+        if state is BreakerState.HALF_OPEN:
+            self._probing = True
+
+    def record_success(self) -> None:
+        self._state = BreakerState.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if (
+            self._state is BreakerState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self._state = BreakerState.OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Ends a call without an outcome (e.g. it was cancelled), freeing the probe slot."""
+        self._probing = False
+
+    def describe(self) -> str:
+        state = self.state
+        if state is BreakerState.OPEN:
+            return f"open, retrying in {max(self.retry_after, 0):.0f}s"
+        return f"{state.value}, {self.failures} consecutive failures"
+
+
+def jittered_backoff(
+    base: float, cap: float, rng: Optional[random.Random] = None
+) -> Iterator[float]:
+    """Yields "full jitter" delays: uniform in [0, min(cap, base * 2**attempt)]."""
+    uniform = (rng or random).uniform
+    attempt = 0
+    while True:
+        yield uniform(0, min(cap, base * 2**attempt))
+        attempt += 1
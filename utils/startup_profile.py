@@ -0,0 +1,113 @@
+import builtins
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+class StartupProfile:
+    """
+    Timings from process start to ready: consecutive startup phases, and with the
+    import timer on, the time spent importing each top-level package (own time,
+    excluding the packages it imports in turn).
+    """
+
+    __slots__ = (
+        "started",
+        "phases",
+        "imports",
+        "reported",
+        "_last",
+        "_stack",
+        "_thread",
+        "_original_import",
+    )
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Counter[str] = Counter()
+        self.reported = False
+        self._last = self.started
+        # time spent in nested imports, one entry per import in progress
+        self._stack: List[float] = []
+        self._thread = threading.get_ident()
+        self._original_import: Optional[object] = None
+
+    def mark(self, phase: str) -> None:
+        """Ends a phase that started at the previous mark (or at process start)."""
+        if self.reported:
+            return  # phases after ready, e.g. on reconnect, are not startup
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def start_import_timer(self) -> None:
+        if self._original_import is not None:
+            return
+        self._original_import = original = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules or threading.get_ident() != self._thread:
+                return original(name, globals, locals, fromlist, level)
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.imports[name.partition(".")[0]] += elapsed - self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+
+        builtins.__import__ = timed_import
+
+    def stop_import_timer(self) -> None:
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def report(
+        self,
+        logger: logging.Logger,
+        top: int = 10,
+        extra: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        """Logs the phases, extra metrics and the slowest imported packages, once."""
+        if self.reported:
+            return
+        self.reported = True
+        self.stop_import_timer()
+        logger.info(
+            "Ready %.2fs after start: %s",
+            self.elapsed(),
+            ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in self.phases),
+        )
+        for name, metrics in (extra or {}).items():
+            logger.info(
+                "Startup %s: %s",
+                name,
+                ", ".join(f"{key} {value}" for key, value in metrics.items()),
+            )
+        if self.imports:
+            logger.info(
+                "Import time by package: %s",
+                ", ".join(
+                    f"{package} {seconds:.3f}s"
+                    for package, seconds in self.imports.most_common(top)
+                ),
+            )
+
+
+startup_profile = StartupProfile()
+# Imports can only be timed from here on, so the switch is read from the process
+# environment directly rather than from .env.
+if os.getenv("PROFILE_STARTUP", "False").lower() == "true":
+    startup_profile.start_import_timer()
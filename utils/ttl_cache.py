@@ -0,0 +1,103 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCacheStats:
+    __slots__ = ("hits", "stale_hits", "misses", "evictions")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache whose entries are fresh for `ttl` seconds and may then be served
+    stale for another `stale_ttl` seconds while the caller revalidates them.
+    Older entries are dropped on access; the least recently used entry is evicted
+    once max_size is reached.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        ttl: float,
+        stale_ttl: float = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = TTLCacheStats()
+        self._clock = clock
+        # key -> (value, stored_at), least recently used first
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    def lookup(self, key: K) -> Tuple[Optional[V], bool]:
+        """
+        Returns (value, fresh). value is None on a miss; fresh is False when the value
+        is past its ttl and should be revalidated.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None, False
+        value, stored_at = entry
+        age = self._clock() - stored_at
+        if age >= self.ttl + self.stale_ttl:
+            del self._entries[key]
+            self.stats.misses += 1
+            return None, False
+        self._entries.move_to_end(key)
+        if age < self.ttl:
+            self.stats.hits += 1
+            return value, True
+        self.stats.stale_hits += 1
+        return value, False
+
+    def set(self, key: K, value: V, stored_at: Optional[float] = None) -> None:
+        self._entries[key] = (value, self._clock() if stored_at is None else stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()